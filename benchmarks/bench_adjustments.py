@@ -0,0 +1,67 @@
+"""Adjustment layers: per-tile evaluation, live slider edits and memoized results."""
+import pytest
+from conftest import make_layers, report, synthetic_image
+from core.adjustments import ADJUSTMENTS, AdjustmentLayer, tile_results
+from core.compositor import Compositor
+from core.document import Layer
+
+# Parameters away from the identity, so every kind does its full work
+PARAMS = {
+    "levels": {"black": 16, "white": 240, "gamma": 1.4},
+    "curves": {"shadows": 48, "highlights": 210},
+    "brightness_contrast": {"brightness": 20, "contrast": 30},
+    "hue_saturation": {"hue": 40, "saturation": -30, "lightness": 10},
+    "exposure": {"exposure": 0.7, "gamma": 1.2},
+}
+
+
+@pytest.mark.parametrize("kind", list(ADJUSTMENTS))
+def test_adjust_tile(benchmark, kind):
+    """Adjust one 256x256 premultiplied tile."""
+    import cv2
+    tile = cv2.cvtColor(synthetic_image(256, 256, 4, seed=1), cv2.COLOR_RGBA2mRGBA)
+    layer = AdjustmentLayer(kind, PARAMS[kind])
+    benchmark(layer.apply, tile)
+    report(benchmark, pixels=256 * 256)
+
+
+@pytest.mark.parametrize("count", [10, 100, 500])
+def test_slider_frame(benchmark, qapp, main_window, count):
+    """One slider step of an active adjustment over count layers, up to the repaint."""
+    manager = main_window.layer_manager
+    manager.add_layers(make_layers(count))
+    layer = manager.add_adjustment("levels")
+    viewport = main_window.canvas.viewport()
+    viewport.repaint()
+    step = [0]
+
+    def drag():
+        step[0] += 1
+        manager.set_adjustment_params(layer, {"gamma": 1.0 + step[0] % 100 / 100})
+        viewport.repaint()
+
+    benchmark(drag)
+    report(benchmark, items=1, unit="frames")
+
+
+@pytest.mark.parametrize("memoized", [False, True], ids=["cold", "memoized"])
+def test_export_above_adjustment(benchmark, memoized):
+    """Export after a change above an adjustment layer, with or without its results kept."""
+    top = Layer(synthetic_image(1024, 768, 4, seed=4), opacity=0.8)
+    layers = [Layer(synthetic_image(4096, 3072, 3, seed=1)),
+              Layer(synthetic_image(2048, 2048, 4, seed=2), opacity=0.8),
+              AdjustmentLayer("hue_saturation", PARAMS["hue_saturation"]),
+              top]
+    size = Compositor.native_size((layer.size for layer in layers if not layer.is_adjustment),
+                                  (800, 600))
+    tile_results.clear()
+    Compositor.composite(layers, (800, 600), size)
+
+    def setup():
+        top.opacity = 1.7 - top.opacity  # Alternates between 0.8 and 0.9
+        if not memoized:
+            tile_results.clear()
+
+    benchmark.pedantic(Compositor.composite, (layers, (800, 600), size), setup=setup,
+                       rounds=3, iterations=1)
+    report(benchmark, pixels=size[0] * size[1])
@@ -0,0 +1,43 @@
+"""Blend modes and tiled compositing throughput."""
+import pytest
+from conftest import report, synthetic_image
+from core.blending import BLEND_MODES, blend_tiles
+from core.compositor import Compositor
+from core.document import Layer
+
+MODES = list(BLEND_MODES)
+
+
+def premultiplied_pair(width, height):
+    """A premultiplied backdrop and source with varied alpha."""
+    import cv2
+    backdrop = cv2.cvtColor(synthetic_image(width, height, 4, seed=1), cv2.COLOR_RGBA2mRGBA)
+    source = cv2.cvtColor(synthetic_image(width, height, 4, seed=2), cv2.COLOR_RGBA2mRGBA)
+    return backdrop, source
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_blend_tile(benchmark, mode):
+    """Blend one 256x256 premultiplied tile pair at 70% opacity."""
+    backdrop, source = premultiplied_pair(256, 256)
+    benchmark(blend_tiles, backdrop, source, mode, 0.7)
+    report(benchmark, pixels=256 * 256)
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_blend_image(benchmark, mode):
+    """Blend a 2048x2048 premultiplied pair in one batch."""
+    backdrop, source = premultiplied_pair(2048, 2048)
+    benchmark(blend_tiles, backdrop, source, mode, 0.7)
+    report(benchmark, pixels=2048 * 2048)
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_composite_stack(benchmark, mode):
+    """Composite a 4096x3072 base and two blended layers tile by tile on the pool."""
+    layers = [Layer(synthetic_image(4096, 3072, 3, seed=1)),
+              Layer(synthetic_image(2048, 2048, 4, seed=2), opacity=0.8, blend_mode=mode),
+              Layer(synthetic_image(4096, 1024, 3, seed=3), blend_mode=mode)]
+    size = Compositor.native_size((layer.size for layer in layers), (800, 600))
+    benchmark.pedantic(Compositor.composite, (layers, (800, 600), size), rounds=3, iterations=1)
+    report(benchmark, pixels=size[0] * size[1])
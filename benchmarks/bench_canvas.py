@@ -0,0 +1,91 @@
+"""Canvas compositing, background painting and pan/zoom frames."""
+import pytest
+from PyQt5.QtGui import QImage, QPainter, QPixmapCache
+from conftest import report, set_zoom, synthetic_image
+from core.document import Layer
+
+ZOOMS = [0.1, 0.5, 1.0, 5.0]
+
+
+@pytest.mark.parametrize("zoom", ZOOMS)
+def test_draw_background(benchmark, main_window, zoom):
+    """drawBackground over the whole viewport, bypassing the background cache."""
+    canvas = main_window.canvas
+    set_zoom(canvas, zoom)
+    viewport = canvas.viewport()
+    image = QImage(viewport.size(), QImage.Format_ARGB32_Premultiplied)
+    exposed = canvas.mapToScene(viewport.rect()).boundingRect()
+
+    def draw():
+        painter = QPainter(image)
+        painter.setTransform(canvas.viewportTransform())
+        canvas.drawBackground(painter, exposed)
+        painter.end()
+
+    benchmark(draw)
+    report(benchmark, pixels=viewport.width() * viewport.height())
+
+
+@pytest.fixture
+def populated_window(main_window):
+    """Main window with three large layers, one of them translucent."""
+    main_window.layer_manager.add_layers([
+        Layer(synthetic_image(4096, 3072, 3, seed=1)),
+        Layer(synthetic_image(2048, 2048, 4, seed=2), opacity=0.8),
+        Layer(synthetic_image(3000, 1000, 3, seed=3)),
+    ])
+    return main_window
+
+
+@pytest.mark.parametrize("zoom", ZOOMS)
+def test_pan_frame(benchmark, qapp, populated_window, zoom):
+    """One 5px pan step and the repaint it causes."""
+    canvas = populated_window.canvas
+    set_zoom(canvas, zoom)
+    canvas.viewport().repaint()
+    scrollbar = canvas.horizontalScrollBar()
+    step = [5]
+
+    def pan():
+        if not scrollbar.minimum() < scrollbar.value() + step[0] < scrollbar.maximum():
+            step[0] = -step[0]
+        scrollbar.setValue(scrollbar.value() + step[0])
+        canvas.viewport().repaint()
+
+    canvas.reset_paint_stats()
+    benchmark(pan)
+    stats = canvas.paint_stats()
+    benchmark.extra_info["painted_pixels_per_frame"] = stats['total_painted_pixels'] / max(1, stats['frames'])
+    report(benchmark, items=1, unit="frames")
+
+
+@pytest.mark.parametrize("zoom", ZOOMS)
+def test_zoom_frame(benchmark, qapp, populated_window, zoom):
+    """A zoom step in and out around a scale, each followed by a full repaint."""
+    canvas = populated_window.canvas
+    set_zoom(canvas, zoom)
+    canvas.viewport().repaint()
+
+    def zoom_step():
+        canvas.scale(1.15, 1.15)
+        canvas.viewport().repaint()
+        canvas.scale(1 / 1.15, 1 / 1.15)
+        canvas.viewport().repaint()
+
+    benchmark(zoom_step)
+    report(benchmark, items=2, unit="frames")
+
+
+@pytest.mark.parametrize("zoom", ZOOMS)
+def test_composite_frame(benchmark, qapp, populated_window, zoom):
+    """A full repaint with an empty tile cache, so every visible tile is composited."""
+    canvas = populated_window.canvas
+    set_zoom(canvas, zoom)
+    viewport = canvas.viewport()
+
+    def frame():
+        QPixmapCache.clear()
+        viewport.repaint()
+
+    benchmark(frame)
+    report(benchmark, pixels=viewport.width() * viewport.height())
@@ -0,0 +1,125 @@
+"""Filters: per-tile cost, live preview frames, filter chains and tiled full-resolution runs."""
+import time
+import numpy as np
+import pytest
+from PyQt5.QtCore import QEventLoop, QTimer
+from PyQt5.QtGui import QPixmapCache
+from conftest import report, set_zoom, synthetic_image
+from core.document import Layer
+from core.filter_runner import FilterRunner
+from core.filters import FILTERS, default_params, filter_region
+from core.graph import FilteredLayer, build_graph, node_outputs
+
+
+@pytest.mark.parametrize("kind", list(FILTERS))
+def test_filter_tile(benchmark, kind):
+    """Filter one interior 256x256 tile of a layer, margin included."""
+    layer = Layer(synthetic_image(1024, 1024, 3, seed=1))
+    params = default_params(kind)
+    benchmark(filter_region, layer, kind, params, 256, 256, 256, 256)
+    report(benchmark, pixels=256 * 256)
+
+
+@pytest.mark.parametrize("proxy", [False, True], ids=["settled", "proxy"])
+@pytest.mark.parametrize("kind", ["gaussian_blur", "bilateral"])
+@pytest.mark.parametrize("zoom", [0.5, 1.0])
+def test_preview_frame(benchmark, qapp, main_window, kind, proxy, zoom):
+    """One slider step of a filter preview on a 4096x3072 active layer, up to the repaint."""
+    layer = Layer(synthetic_image(4096, 3072, 3, seed=1))
+    main_window.layer_manager.add_layers([layer])
+    canvas = main_window.canvas
+    set_zoom(canvas, zoom)
+    viewport = canvas.viewport()
+    params = default_params(kind)
+    step = [0]
+
+    def frame():
+        step[0] += 1
+        params["radius"] = 2 + step[0] % 8
+        canvas.set_preview(FilteredLayer(layer, [(kind, params)], proxy))
+        QPixmapCache.clear()
+        viewport.repaint()
+
+    benchmark(frame)
+    report(benchmark, items=1, unit="frames")
+
+
+def test_edit_under_preview(benchmark, qapp, main_window):
+    """Replace the pixels of a 2048x1536 layer while its filter preview is shown, up to the repaint."""
+    layer = Layer(synthetic_image(2048, 1536, 3, seed=1))
+    manager = main_window.layer_manager
+    manager.add_layers([layer])
+    canvas = main_window.canvas
+    set_zoom(canvas, 0.5)
+    viewport = canvas.viewport()
+    steps = [("gaussian_blur", default_params("gaussian_blur"))]
+    canvas.set_preview(FilteredLayer(layer, steps))
+    original = viewport.grab().toImage()
+    edits = []
+
+    def edit():
+        edits.append(np.full_like(layer.pixels, 10 * (len(edits) + 1)))
+        manager.replace_pixels(layer, edits[-1])
+        return viewport.grab().toImage()
+
+    edited = benchmark.pedantic(edit, rounds=3, iterations=1)
+    assert edited != original
+    # Nothing of the previous pixels is left: a fresh preview draws the same
+    QPixmapCache.clear()
+    node_outputs.clear()
+    canvas.set_preview(FilteredLayer(layer, steps))
+    assert viewport.grab().toImage() == edited
+    for _ in edits:
+        manager.undo()
+    assert viewport.grab().toImage() == original
+    report(benchmark, items=1, unit="frames")
+
+
+@pytest.mark.parametrize("memoized", [False, True], ids=["cold", "memoized"])
+def test_tweak_last_filter(benchmark, memoized):
+    """One step of the last filter of a three-filter chain over a 2048x1536 pyramid level.
+
+    Cold clears the node outputs first, so the whole chain runs again
+    from the layer's pixels; memoized reuses the first two filters.
+    """
+    layer = Layer(synthetic_image(4096, 3072, 3, seed=1))
+    steps = [("bilateral", default_params("bilateral")),
+             ("gaussian_blur", default_params("gaussian_blur")),
+             ("sharpen", default_params("sharpen"))]
+    build_graph(layer, steps).region(0, 0, 2048, 1536, level=1)
+    step = [0]
+
+    def tweak():
+        step[0] += 1
+        if not memoized:
+            node_outputs.clear()
+        steps[-1] = ("sharpen", dict(steps[-1][1], amount=1.0 + step[0] * 0.01))
+        build_graph(layer, steps).region(0, 0, 2048, 1536, level=1)
+
+    benchmark(tweak)
+    report(benchmark, pixels=2048 * 1536)
+
+
+def test_apply_filter(benchmark, qapp):
+    """Blur a 4096x3072 layer on the worker pool; a 10 ms GUI timer measures stalls."""
+    layer = Layer(synthetic_image(4096, 3072, 3, seed=1))
+    runner = FilterRunner()
+    loop = QEventLoop()
+    runner.finished.connect(lambda snapshot, pixels: loop.quit())
+    timer = QTimer()
+    timer.setInterval(10)
+    ticks = []
+    timer.timeout.connect(lambda: ticks.append(time.perf_counter()))
+
+    def apply():
+        ticks.append(time.perf_counter())
+        runner.start(layer.snapshot(), [("gaussian_blur", {"radius": 8.0})])
+        loop.exec_()
+        ticks.append(time.perf_counter())
+
+    timer.start()
+    benchmark.pedantic(apply, rounds=3, iterations=1)
+    timer.stop()
+    benchmark.extra_info["longest_gui_stall_ms"] = max(
+        later - earlier for earlier, later in zip(ticks, ticks[1:])) * 1000
+    report(benchmark, pixels=layer.width * layer.height)
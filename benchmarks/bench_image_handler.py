@@ -0,0 +1,51 @@
+"""Decoding, compositing and saving through ImageHandler."""
+import pytest
+from conftest import make_layers, report, synthetic_image, write_synthetic_image
+from core.document import Layer
+from core.image_handler import ImageHandler
+
+SIZES = [(512, 512), (2048, 2048), (4096, 3072)]
+FORMATS = [("png", 3), ("png", 4), ("jpg", 3), ("bmp", 3)]
+
+
+@pytest.mark.parametrize("fmt,channels", FORMATS, ids=lambda value: str(value))
+@pytest.mark.parametrize("size", SIZES, ids=lambda size: f"{size[0]}x{size[1]}")
+def test_load_pixels(benchmark, image_dir, fmt, channels, size):
+    """Decode to a BGR(A) array, as the import workers do."""
+    path = write_synthetic_image(image_dir / f"load-{size[0]}x{size[1]}-{channels}.{fmt}", *size, channels)
+    pixels = benchmark(ImageHandler.load_pixels, path)
+    assert pixels.shape[:2] == (size[1], size[0])
+    report(benchmark, pixels=size[0] * size[1])
+
+
+@pytest.mark.parametrize("fmt,channels", FORMATS, ids=lambda value: str(value))
+@pytest.mark.parametrize("size", SIZES[:2], ids=lambda size: f"{size[0]}x{size[1]}")
+def test_load_image(benchmark, qapp, image_dir, fmt, channels, size):
+    """Decode to a QPixmap."""
+    path = write_synthetic_image(image_dir / f"pixmap-{size[0]}x{size[1]}-{channels}.{fmt}", *size, channels)
+    pixmap = benchmark(ImageHandler.load_image, path)
+    assert not pixmap.isNull()
+    report(benchmark, pixels=size[0] * size[1])
+
+
+@pytest.mark.parametrize("fmt", ["png", "jpg", "bmp"])
+@pytest.mark.parametrize("size", [(1024, 768), (4096, 3072)], ids=lambda size: f"{size[0]}x{size[1]}")
+def test_save_image(benchmark, tmp_path, fmt, size):
+    """Composite three layers (one with alpha) at native size and encode."""
+    layers = [Layer(synthetic_image(*size, 3, seed=1)),
+              Layer(synthetic_image(size[0] // 2, size[1] // 2, 4, seed=2), opacity=0.7),
+              Layer(synthetic_image(size[0] // 3, size[1], 3, seed=3))]
+    path = str(tmp_path / f"out.{fmt}")
+    assert benchmark.pedantic(ImageHandler.save_image, (layers, (800, 600), path, fmt),
+                              rounds=3, iterations=1)
+    report(benchmark, pixels=size[0] * size[1])
+
+
+@pytest.mark.parametrize("count", [10, 100])
+def test_save_image_many_layers(benchmark, tmp_path, count):
+    """Compositing cost per layer, on small layers."""
+    layers = make_layers(count, 256, 256, 4)
+    path = str(tmp_path / "out.png")
+    assert benchmark.pedantic(ImageHandler.save_image, (layers, (800, 600), path, "png"),
+                              rounds=3, iterations=1)
+    report(benchmark, items=count, unit="layers")
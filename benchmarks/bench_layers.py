@@ -0,0 +1,138 @@
+"""Layer stack operations against the layer count, and batch imports."""
+import pytest
+from conftest import make_layers, report, synthetic_image, write_synthetic_image
+from core.document import Layer
+from core.history import PixelEditCommand
+
+COUNTS = [10, 100, 500]
+
+
+@pytest.fixture
+def stacked_window(main_window, request):
+    """Main window holding request.param small layers."""
+    main_window.layer_manager.add_layers(make_layers(request.param))
+    main_window.layer_manager.history.clear()
+    return main_window
+
+
+@pytest.mark.parametrize("stacked_window", COUNTS, indirect=True)
+def test_update_canvas(benchmark, stacked_window):
+    """Point the composite item at the stack and repaint it; one item whatever the layer count."""
+    manager = stacked_window.layer_manager
+    benchmark(manager._update_canvas)
+    report(benchmark, items=len(manager.document), unit="layers")
+
+
+@pytest.mark.parametrize("stacked_window", COUNTS, indirect=True)
+def test_toggle_visibility(benchmark, qapp, stacked_window):
+    """Toggle latency of the middle layer, through history, up to the repaint."""
+    manager = stacked_window.layer_manager
+    row = len(manager.document) // 2
+    viewport = stacked_window.canvas.viewport()
+
+    def toggle():
+        manager._handle_visibility_toggled(row)
+        qapp.processEvents()
+        viewport.repaint()
+
+    benchmark(toggle)
+    report(benchmark, items=1, unit="toggles")
+
+
+@pytest.mark.parametrize("active", [True, False], ids=["active", "no-active"])
+@pytest.mark.parametrize("stacked_window", COUNTS, indirect=True)
+def test_edit_layer(benchmark, qapp, stacked_window, active):
+    """Rewrite the middle layer's pixels and repaint, with or without it being the active layer."""
+    manager = stacked_window.layer_manager
+    row = len(manager.document) // 2
+    layer = manager.model.layer_at(row)
+    if active:
+        manager.list_view.setCurrentIndex(manager.model.index(row))
+    else:
+        manager.list_view.setCurrentIndex(manager.model.index(-1))
+    assert (manager.active_layer is layer) == active
+    tiles = [layer.read_tiles([(0, 0)]), {(0, 0): 255 - layer.read_tiles([(0, 0)])[(0, 0)]}]
+    viewport = stacked_window.canvas.viewport()
+    step = [0]
+
+    def edit():
+        step[0] ^= 1
+        manager.write_layer_tiles(layer, tiles[step[0]])
+        viewport.repaint()
+
+    benchmark(edit)
+    report(benchmark, items=1, unit="edits")
+
+
+@pytest.mark.parametrize("size", [(1024, 768), (4096, 3072)], ids=["1024x768", "4096x3072"])
+def test_undo_pixel_edit(benchmark, qapp, main_window, size):
+    """Undo and redo a 100x100 pixel edit through history; the cost should not grow with the layer."""
+    manager = main_window.layer_manager
+    layer = Layer(synthetic_image(*size, 4, seed=1))
+    manager.add_layers([layer])
+    for level in range(layer.level_count()):
+        layer.region(0, 0, 1, 1, level=level)  # Build the whole pyramid up front
+    manager.history.execute(PixelEditCommand.from_region(
+        manager, layer, 300, 300, synthetic_image(100, 100, 4, seed=2)))
+
+    def undo_redo():
+        manager.undo()
+        manager.redo()
+        qapp.processEvents()
+
+    benchmark(undo_redo)
+    report(benchmark, items=2, unit="steps")
+
+
+@pytest.mark.parametrize("stacked_window", COUNTS, indirect=True)
+def test_move_layer(benchmark, qapp, stacked_window):
+    """Move the bottom layer to the top and back."""
+    manager = stacked_window.layer_manager
+    top = len(manager.document) - 1
+
+    def move():
+        manager._handle_layer_moved(top, 0)
+        manager._handle_layer_moved(0, top)
+        qapp.processEvents()
+
+    benchmark(move)
+    report(benchmark, items=2, unit="moves")
+
+
+@pytest.mark.parametrize("count", COUNTS)
+def test_add_layers(benchmark, qapp, main_window, count):
+    """Add a batch of layers to an empty stack in one step."""
+    manager = main_window.layer_manager
+    layers = make_layers(count)
+
+    def setup():
+        manager.load_layers([])
+        qapp.processEvents()
+        return (list(layers),), {}
+
+    def add(batch):
+        manager.add_layers(batch)
+        qapp.processEvents()
+
+    benchmark.pedantic(add, setup=setup, rounds=5, iterations=1)
+    report(benchmark, items=count, unit="layers")
+
+
+@pytest.mark.parametrize("count", COUNTS)
+def test_import_files(benchmark, qapp, main_window, image_dir, count):
+    """End-to-end import of count PNG files, from file list to layers on the canvas."""
+    paths = [write_synthetic_image(image_dir / f"import-{index}.png", 320, 240, 3, seed=index)
+             for index in range(count)]
+
+    def setup():
+        main_window.layer_manager.load_layers([])
+        qapp.processEvents()
+
+    def import_files():
+        main_window._add_files(paths)
+        while main_window.image_loader is not None:
+            qapp.processEvents()
+
+    benchmark.pedantic(import_files, setup=setup, rounds=3, iterations=1)
+    assert len(main_window.layer_manager.document) == count
+    report(benchmark, pixels=count * 320 * 240)
@@ -0,0 +1,174 @@
+"""Saving and reopening layered projects through core.project."""
+import os
+import zipfile
+import numpy as np
+import pytest
+from conftest import report, synthetic_image
+from core.adjustments import AdjustmentLayer
+from core.autosave import Checkpoint
+from core.document import Layer
+from core.project import ProjectFile
+
+SIZES = [(1024, 768), (4096, 3072)]
+
+
+def make_stack(width, height):
+    """A raster background, a curves adjustment and a small hidden layer with alpha."""
+    return [Layer(synthetic_image(width, height, 3, seed=1), name="Background"),
+            AdjustmentLayer("curves", {"midtones": 150}, opacity=0.5),
+            Layer(synthetic_image(width // 4, height // 4, 4, seed=2), name="Top",
+                  offset=(10, -5), visible=False)]
+
+
+def pyramid(layer):
+    """Every pyramid level of a layer as an array."""
+    return [np.array(layer.region(0, 0, *layer.level_size(level), level=level))
+            for level in range(layer.level_count())]
+
+
+def assert_same_stack(loaded, layers):
+    """Same properties and the same pixels at every pyramid level."""
+    assert [layer.id for layer in loaded] == [layer.id for layer in layers]
+    for loaded_layer, layer in zip(loaded, layers):
+        assert (loaded_layer.name, loaded_layer.opacity, tuple(loaded_layer.offset),
+                loaded_layer.visible) == (layer.name, layer.opacity, tuple(layer.offset), layer.visible)
+        assert loaded_layer.is_adjustment == layer.is_adjustment
+        if layer.is_adjustment:
+            assert (loaded_layer.kind, loaded_layer.params) == (layer.kind, layer.params)
+            continue
+        for loaded_level, level in zip(pyramid(loaded_layer), pyramid(layer), strict=True):
+            assert np.array_equal(loaded_level, level)
+
+
+@pytest.mark.parametrize("size", SIZES, ids=lambda size: f"{size[0]}x{size[1]}")
+def test_save_project(benchmark, tmp_path, size):
+    """Write a whole project, every pyramid level of every layer."""
+    layers = make_stack(*size)
+    path = str(tmp_path / "full.unif")
+    assert benchmark.pedantic(lambda: ProjectFile(path).save(layers), rounds=3, iterations=1)
+    assert not os.path.exists(f"{path}.tmp")
+    loaded, thumbnails = ProjectFile(path).load()
+    assert_same_stack(loaded, layers)
+    assert set(thumbnails) == {layer.id for layer in layers if not layer.is_adjustment}
+    report(benchmark, pixels=size[0] * size[1])
+
+
+@pytest.mark.parametrize("size", SIZES, ids=lambda size: f"{size[0]}x{size[1]}")
+def test_save_project_incremental(benchmark, tmp_path, size):
+    """Save again after editing the small layer: only that layer is appended."""
+    path = str(tmp_path / "incremental.unif")
+    ProjectFile(path).save(make_stack(*size))
+    project = ProjectFile(path)
+    layers, _ = project.load()
+    top = layers[2]
+    seeds = iter(range(10, 1000))
+
+    def edit():
+        top.set_pixels(synthetic_image(top.width, top.height, 4, seed=next(seeds)))
+        return (), {}
+
+    def save():
+        saved_size = os.path.getsize(path)
+        assert project.save(layers)
+        return os.path.getsize(path) - saved_size
+
+    growth = benchmark.pedantic(save, setup=edit, rounds=3, iterations=1)
+    # The background, twelve times the bytes of the edited layer, was not written again
+    assert 0 < growth < sum(level.nbytes for level in pyramid(layers[0])) / 4
+    assert_same_stack(ProjectFile(path).load()[0], layers)
+
+    # New backgrounds pile up stale revisions until the file is rewritten.
+    # The tiles of the loaded one are kept, as the undo history would read them.
+    background = layers[0]
+    loaded_level = background.buffer
+    loaded_pixels = loaded_level.to_array()
+    for seed in range(20, 30):
+        background.set_pixels(synthetic_image(background.width, background.height, 3, seed=seed))
+        saved_size = os.path.getsize(path)
+        project.save(layers)
+        if os.path.getsize(path) < saved_size:
+            break
+    else:
+        pytest.fail("Stale revisions were never compacted")
+    assert not os.path.exists(f"{path}.tmp")
+    assert_same_stack(ProjectFile(path).load()[0], layers)
+    with zipfile.ZipFile(path) as archive:
+        assert any(name.startswith(f"{loaded_level.prefix}/") for name in archive.namelist())
+    assert np.array_equal(loaded_level.to_array(), loaded_pixels)
+
+    # Saving elsewhere writes a complete copy
+    copy_path = str(tmp_path / "copy.unif")
+    project.save(layers, copy_path)
+    assert_same_stack(ProjectFile(copy_path).load()[0], layers)
+    report(benchmark, pixels=top.width * top.height)
+
+
+def test_open_interrupted_save(benchmark, tmp_path):
+    """Open projects whose last save was cut short: the previous save is read back."""
+    path = str(tmp_path / "interrupted.unif")
+    layers = make_stack(1024, 768)
+    project = ProjectFile(path)
+    project.save(layers)
+    with open(path, "rb") as file:
+        saved = file.read()
+    expected = [pyramid(layer) for layer in layers if not layer.is_adjustment]
+    layers[2].set_pixels(synthetic_image(layers[2].width, layers[2].height, 4, seed=3))
+    project.save(layers)
+    with open(path, "rb") as file:
+        appended = file.read()
+    # The previous save is left intact in front of the appended one
+    assert appended[:len(saved)] == saved
+
+    def assert_previous_save(cut_path):
+        loaded, _ = ProjectFile(cut_path).load()
+        rasters = [layer for layer in loaded if not layer.is_adjustment]
+        for layer, levels in zip(rasters, expected, strict=True):
+            for level, expected_level in zip(pyramid(layer), levels, strict=True):
+                assert np.array_equal(level, expected_level)
+
+    step = (len(appended) - len(saved)) // 8
+    for index, cut in enumerate([len(saved) + step * index for index in range(1, 8)]):
+        cut_path = str(tmp_path / f"cut-{index}.unif")
+        with open(cut_path, "wb") as file:
+            file.write(appended[:cut])
+        assert_previous_save(cut_path)
+
+    # Cut inside the final end record, the farthest from the previous one
+    cut_path = str(tmp_path / "cut.unif")
+    with open(cut_path, "wb") as file:
+        file.write(appended[:-1])
+    benchmark.pedantic(assert_previous_save, (cut_path,), rounds=3, iterations=1)
+    report(benchmark, items=1, unit="opens")
+
+    # Saving a recovered project rewrites it whole, dropping the partial save
+    project = ProjectFile(cut_path)
+    loaded, _ = project.load()
+    loaded[2].set_pixels(synthetic_image(loaded[2].width, loaded[2].height, 4, seed=4))
+    project.save(loaded)
+    with zipfile.ZipFile(cut_path) as archive:
+        assert archive.testzip() is None
+    assert_same_stack(ProjectFile(cut_path).load()[0], loaded)
+
+
+@pytest.mark.parametrize("size", SIZES, ids=lambda size: f"{size[0]}x{size[1]}")
+def test_checkpoint_opened_project(benchmark, tmp_path, size):
+    """First checkpoint after opening a project: it refers to the project's tiles."""
+    path = str(tmp_path / "opened.unif")
+    ProjectFile(path).save(make_stack(*size))
+    project = ProjectFile(path)
+    layers, _ = project.load()
+
+    checkpoint = Checkpoint(str(tmp_path / "recovery"))
+    checkpoint.seed(project)
+    assert benchmark.pedantic(checkpoint.write, (layers,), rounds=1, iterations=1)
+    assert os.listdir(checkpoint.directory) == ["recovery.json"]
+
+    # Only the layer edited since is copied, and recovery reads both kinds back
+    layers[2].set_pixels(synthetic_image(layers[2].width, layers[2].height, 4, seed=5))
+    layers[0].name = "Renamed"
+    assert checkpoint.write(layers)
+    assert len(os.listdir(checkpoint.directory)) == 2
+    recovered, thumbnails, _ = Checkpoint(checkpoint.directory).load()
+    assert_same_stack(recovered, layers)
+    assert set(thumbnails) == {layers[0].id, layers[2].id}
+    report(benchmark, pixels=size[0] * size[1])
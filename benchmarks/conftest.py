@@ -0,0 +1,123 @@
+"""Shared fixtures for the headless benchmark suite.
+
+Run from the repository root with:
+
+    pytest benchmarks
+
+Everything runs under the offscreen Qt platform on synthetic images made
+at runtime. Each benchmark records its throughput and the process peak
+RSS in extra_info (kept in --benchmark-json output) and both are printed
+in a table after the run.
+"""
+import os
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+import cv2
+import numpy as np
+import pytest
+from PyQt5.QtWidgets import QApplication
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+_results = []  # (benchmark name, throughput text, peak RSS MB)
+
+
+def synthetic_image(width, height, channels=3, seed=0):
+    """Smooth gradients plus noise, so encoders see photo-like content."""
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    planes = [
+        128 + 100 * np.sin(x / (17 + 7 * c) + y / (23 + 5 * c) + c)
+        for c in range(3)
+    ]
+    image = np.stack(planes, axis=-1) + rng.normal(0, 12, (height, width, 3))
+    image = np.clip(image, 0, 255).astype(np.uint8)
+    if channels == 4:
+        alpha = np.clip(255 * (1.2 - np.hypot(x / width - 0.5, y / height - 0.5) * 2), 0, 255)
+        image = np.dstack([image, alpha.astype(np.uint8)])
+    return image
+
+
+def write_synthetic_image(path, width, height, channels=3, seed=0):
+    """Encode a synthetic image to path and return the path."""
+    cv2.imwrite(str(path), synthetic_image(width, height, channels, seed))
+    return str(path)
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, in megabytes."""
+    if resource is None:
+        return float("nan")
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def report(benchmark, pixels=None, items=None, unit="items"):
+    """Store throughput (megapixels or items per second) and peak RSS."""
+    if benchmark.stats is None:  # --benchmark-disable
+        return
+    mean = benchmark.stats.stats.mean
+    throughput = ""
+    if pixels is not None and mean > 0:
+        benchmark.extra_info["mpix_per_s"] = pixels / mean / 1e6
+        throughput = f"{pixels / mean / 1e6:9.1f} MP/s"
+    elif items is not None and mean > 0:
+        benchmark.extra_info[f"{unit}_per_s"] = items / mean
+        throughput = f"{items / mean:9.1f} {unit}/s"
+    benchmark.extra_info["peak_rss_mb"] = peak_rss_mb()
+    _results.append((benchmark.name, throughput, benchmark.extra_info["peak_rss_mb"]))
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not _results:
+        return
+    terminalreporter.section("throughput and peak RSS")
+    width = max(len(name) for name, _, _ in _results)
+    for name, throughput, rss in _results:
+        terminalreporter.write_line(f"{name:<{width}}  {throughput:>18}  peak RSS {rss:8.1f} MB")
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture(scope="session")
+def image_dir(tmp_path_factory):
+    return tmp_path_factory.mktemp("images")
+
+
+@pytest.fixture
+def main_window(qapp, tmp_path, monkeypatch):
+    """A shown MainWindow with autosave pointed at a temporary directory."""
+    monkeypatch.setenv("UNIFICATOR_AUTOSAVE_DIR", str(tmp_path / "recovery"))
+    from main_window import MainWindow
+    window = MainWindow()
+    window.resize(1124, 623)
+    window.show()
+    qapp.processEvents()
+    yield window
+    window.close()
+    window.deleteLater()
+    qapp.processEvents()
+
+
+def make_layers(count, width=64, height=64, channels=3):
+    """count small layers with distinct synthetic pixels."""
+    from core.document import Layer
+    base = synthetic_image(width, height, channels)
+    return [Layer(np.roll(base, index, axis=1)) for index in range(count)]
+
+
+def set_zoom(canvas, zoom):
+    """Show the canvas centred at a fixed view scale."""
+    canvas.resetTransform()
+    canvas.scale(zoom, zoom)
+    canvas.current_scale = zoom
+    canvas.centerOn(0, 0)
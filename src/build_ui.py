@@ -0,0 +1,42 @@
+# Compiles interface.ui into ui_interface.py, which the main window is
+# built from at startup (parsing the .ui file at runtime is much slower).
+#
+#     python build_ui.py           regenerate ui_interface.py
+#     python build_ui.py --check   exit with status 1 if it is out of date
+#
+# Run the check before committing a change to interface.ui, or in CI.
+import io
+import os
+import sys
+from PyQt5 import uic
+
+SOURCE_DIR = os.path.dirname(os.path.abspath(__file__))
+UI_PATH = os.path.join(SOURCE_DIR, 'interface.ui')
+MODULE_PATH = os.path.join(SOURCE_DIR, 'ui_interface.py')
+
+
+def compile_ui():
+    """Return the module pyuic5 generates from interface.ui."""
+    output = io.StringIO()
+    uic.compileUi(os.path.relpath(UI_PATH), output, resource_suffix='_rcc')
+    return output.getvalue()
+
+
+def is_current():
+    """Whether ui_interface.py is what interface.ui compiles to."""
+    with open(MODULE_PATH) as module_file:
+        return _code(module_file.read()) == _code(compile_ui())
+
+
+def _code(source):
+    # The header comment names the pyuic5 version; only the code matters
+    return [line for line in source.splitlines() if not line.startswith('#')]
+
+
+if __name__ == '__main__':
+    if '--check' in sys.argv[1:]:
+        if not is_current():
+            sys.exit("ui_interface.py is out of date with interface.ui; run python build_ui.py")
+    else:
+        with open(MODULE_PATH, 'w') as module_file:
+            module_file.write(compile_ui())
@@ -0,0 +1,203 @@
+import copy
+import math
+import threading
+import uuid
+from collections import OrderedDict, namedtuple
+from .blending import DEFAULT_BLEND_MODE
+from .lazy_import import cv2, np
+
+# One slider of an adjustment: values run from minimum to maximum in steps of step
+Parameter = namedtuple("Parameter", "name label minimum maximum default step")
+
+# Adjustment kinds, in panel order, with their display names and parameters
+ADJUSTMENTS = {
+    "levels": ("Levels", (
+        Parameter("black", "Input Black", 0, 254, 0, 1),
+        Parameter("white", "Input White", 1, 255, 255, 1),
+        Parameter("gamma", "Gamma", 0.1, 5.0, 1.0, 0.01),
+        Parameter("output_black", "Output Black", 0, 255, 0, 1),
+        Parameter("output_white", "Output White", 0, 255, 255, 1),
+    )),
+    "curves": ("Curves", (
+        Parameter("shadows", "Shadows", 0, 255, 64, 1),
+        Parameter("midtones", "Midtones", 0, 255, 128, 1),
+        Parameter("highlights", "Highlights", 0, 255, 192, 1),
+    )),
+    "brightness_contrast": ("Brightness/Contrast", (
+        Parameter("brightness", "Brightness", -100, 100, 0, 1),
+        Parameter("contrast", "Contrast", -100, 100, 0, 1),
+    )),
+    "hue_saturation": ("Hue/Saturation", (
+        Parameter("hue", "Hue", -180, 180, 0, 1),
+        Parameter("saturation", "Saturation", -100, 100, 0, 1),
+        Parameter("lightness", "Lightness", -100, 100, 0, 1),
+    )),
+    "exposure": ("Exposure", (
+        Parameter("exposure", "Exposure", -5.0, 5.0, 0.0, 0.01),
+        Parameter("offset", "Offset", -0.5, 0.5, 0.0, 0.01),
+        Parameter("gamma", "Gamma", 0.1, 5.0, 1.0, 0.01),
+    )),
+}
+
+
+def default_params(kind):
+    """Parameter values of a new adjustment of the given kind."""
+    return {parameter.name: parameter.default for parameter in ADJUSTMENTS[kind][1]}
+
+
+def _levels(x, black, white, gamma, output_black, output_white):
+    t = np.clip((x * 255.0 - black) / max(1.0, white - black), 0.0, 1.0) ** (1.0 / gamma)
+    return (output_black + t * (output_white - output_black)) / 255.0
+
+
+def _curves(x, shadows, midtones, highlights):
+    # Output levels at the quarter tones, joined by straight segments
+    return np.interp(x * 255.0, [0, 64, 128, 192, 255],
+                     [0, shadows, midtones, highlights, 255]) / 255.0
+
+
+def _brightness_contrast(x, brightness, contrast):
+    slope = math.tan((min(contrast, 99.0) / 100.0 + 1.0) * math.pi / 4.0)
+    return (x - 0.5) * slope + 0.5 + brightness / 200.0
+
+
+def _exposure(x, exposure, offset, gamma):
+    return np.clip(x * 2.0 ** exposure + offset, 0.0, 1.0) ** (1.0 / gamma)
+
+
+_CURVES = {  # Tone curves over [0, 1] shared by the colour channels, by kind
+    "levels": _levels,
+    "curves": _curves,
+    "brightness_contrast": _brightness_contrast,
+    "exposure": _exposure,
+}
+
+
+def _hue_saturation(bgr, hue, saturation, lightness):
+    """Shift the hue and scale the saturation and lightness of float BGR in [0, 1]."""
+    # Float HLS keeps hue in degrees and is exact, unlike the 8-bit conversion
+    hls = cv2.cvtColor(bgr, cv2.COLOR_BGR2HLS)
+    hls[..., 0] += hue
+    hls[..., 0] %= 360.0
+    if lightness >= 0:
+        hls[..., 1] += (1.0 - hls[..., 1]) * (lightness / 100.0)
+    else:
+        hls[..., 1] *= 1.0 + lightness / 100.0
+    hls[..., 2] *= 1.0 + saturation / 100.0
+    np.clip(hls[..., 2], 0.0, 1.0, out=hls[..., 2])
+    return cv2.cvtColor(hls, cv2.COLOR_HLS2BGR)
+
+
+class AdjustmentLayer:
+    """A layer that recolours the composite of the layers below it.
+
+    It holds no pixels: when the compositor reaches it in the stack, the
+    tile composited so far is run through the adjustment (a lookup table
+    of a tone curve, or float HLS for Hue/Saturation) and mixed back by
+    opacity, so the layers below are never modified. Blend modes do not
+    apply, the adjusted tile always replaces its input.
+
+    version stands in for the pixel version of raster layers. It is the
+    kind and parameters themselves, so an undo that restores earlier
+    parameters hits every cache that was filled with them.
+    """
+
+    is_adjustment = True
+    nbytes = 0  # No pixels to keep alive for undo
+
+    def __init__(self, kind, params=None, name="", opacity=1.0, visible=True, layer_id=None,
+                 blend_mode=DEFAULT_BLEND_MODE):
+        self.id = layer_id or uuid.uuid4().hex
+        self.kind = kind  # Key of ADJUSTMENTS
+        self.name = name or ADJUSTMENTS[kind][0]
+        self.opacity = opacity
+        self.blend_mode = blend_mode  # Kept for a uniform stack, not used
+        self.offset = (0, 0)
+        self.visible = visible
+        self.params = dict(default_params(kind), **(params or {}))
+        self.tile_cache = None
+        self._lut = (None, None)  # (version, table) of the last table built
+
+    @property
+    def version(self):
+        return self.kind, tuple(sorted(self.params.items()))
+
+    def set_params(self, params):
+        """Replace some parameter values."""
+        self.params = dict(self.params, **params)
+
+    def spill(self, tile_cache):
+        """Nothing to spill; present so the document treats all layers alike."""
+
+    def snapshot(self):
+        """Shallow copy sharing the parameters, for use on other threads."""
+        return copy.copy(self)
+
+    def lut(self):
+        """The cv2.LUT table of a tone curve kind, built once per version."""
+        version, table = self._lut
+        if version != self.version:
+            curve = _CURVES[self.kind](np.arange(256, dtype=np.float64) / 255.0, **self.params)
+            table = np.clip(np.rint(curve * 255.0), 0, 255).astype(np.uint8)
+            # Colour channels share the curve, alpha passes through
+            table = np.stack([table] * 3 + [np.arange(256, dtype=np.uint8)], axis=-1).reshape(256, 1, 4)
+            self._lut = (self.version, table)
+        return table
+
+    def apply(self, pixels):
+        """Adjust a premultiplied BGRA uint8 tile; return a new tile."""
+        straight = cv2.cvtColor(pixels, cv2.COLOR_mRGBA2RGBA)
+        if self.kind == "hue_saturation":
+            bgr = cv2.cvtColor(straight, cv2.COLOR_BGRA2BGR).astype(np.float32) / 255.0
+            bgr = _hue_saturation(bgr, **self.params)
+            adjusted = cv2.cvtColor(cv2.convertScaleAbs(bgr, alpha=255.0), cv2.COLOR_BGR2BGRA)
+            adjusted[..., 3] = straight[..., 3]
+        else:
+            adjusted = cv2.LUT(straight, self.lut())
+        adjusted = cv2.cvtColor(adjusted, cv2.COLOR_RGBA2mRGBA)
+        if self.opacity < 1.0:
+            adjusted = cv2.addWeighted(pixels, 1.0 - self.opacity, adjusted, self.opacity, 0.0)
+        return adjusted
+
+
+class TileResults:
+    """LRU of computed tiles, bounded by limit_mb.
+
+    Keys name the input of the computation and the computation itself.
+    For adjusted tiles that is the stack_state of the layers below the
+    adjustment and the output rect, and the adjustment's version and
+    opacity, so a result is reused for as long as neither changes, and
+    tiles are only ever adjusted when they are composited. core.graph
+    keeps its node outputs in one too.
+    """
+
+    def __init__(self, limit_mb=128):
+        self.limit = int(limit_mb * 1024 * 1024)
+        self._tiles = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            tile = self._tiles.get(key)
+            if tile is not None:
+                self._tiles.move_to_end(key)
+            return tile
+
+    def put(self, key, tile):
+        with self._lock:
+            if key in self._tiles:
+                return
+            self._tiles[key] = tile
+            self._bytes += tile.nbytes
+            while self._bytes > self.limit and len(self._tiles) > 1:
+                _, evicted = self._tiles.popitem(last=False)
+                self._bytes -= evicted.nbytes
+
+    def clear(self):
+        with self._lock:
+            self._tiles.clear()
+            self._bytes = 0
+
+
+tile_results = TileResults()  # Shared by the canvas and exports
@@ -0,0 +1,264 @@
+import json
+import os
+import shutil
+import uuid
+import zipfile
+from PyQt5.QtCore import QLockFile, QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+from .blending import DEFAULT_BLEND_MODE
+from .lazy_import import cv2
+from .project import ProjectFile, PROJECT_EXTENSION
+from .profiler import traced
+
+MANIFEST_NAME = "recovery.json"
+LOCK_SUFFIX = ".lock"  # Lock file of a checkpoint, beside its directory
+
+
+class Checkpoint:
+    """Crash-recovery copy of the layer stack in a directory.
+
+    Each layer is kept in its own single-layer project file and the stack
+    order and layer properties in a small manifest. write() only writes
+    files for layers whose pixels changed since the previous checkpoint.
+    Every file is written under a temporary name and renamed into place,
+    and the manifest is replaced last, so a crash at any point leaves the
+    previous checkpoint intact. Layers of a project just opened or saved
+    are not copied at all: after seed() the manifest refers to their tiles
+    in the project file until their pixels change.
+
+    Each session checkpoints into its own subdirectory of a recovery root
+    and holds a QLockFile beside it until it exits, so several instances
+    never share a checkpoint, and a checkpoint whose lock went stale was
+    left by a session that did not close normally.
+    """
+
+    def __init__(self, directory, lock=None):
+        self.directory = directory
+        self.lock = lock  # Held QLockFile claiming the checkpoint, if any
+        self._files = {}  # layer id -> (pixel version, manifest source fields)
+        self._seeds = {}  # layer id -> (pixel version, source fields) in a project file
+        self._last_manifest = None
+
+    @classmethod
+    def create(cls, root):
+        """A checkpoint for a new session, in its own locked subdirectory of root."""
+        os.makedirs(root, exist_ok=True)
+        directory = os.path.join(root, uuid.uuid4().hex)
+        lock = QLockFile(directory + LOCK_SUFFIX)
+        lock.setStaleLockTime(0)  # Only a dead owner makes it stale, however long the session
+        return cls(directory, lock if lock.tryLock(0) else None)
+
+    @classmethod
+    def orphans(cls, root):
+        """Checkpoints of sessions under root that did not close normally, newest first.
+
+        Their locks are stale, and are taken over: the returned checkpoints
+        hold them until discarded or released. Checkpoints of running
+        sessions are left alone, and orphans with nothing saved are
+        deleted on the way.
+        """
+        try:
+            entries = os.listdir(root)
+        except OSError:
+            return []
+        # A released checkpoint has no lock file, a session that crashed
+        # before its first checkpoint has no directory
+        names = {entry[:-len(LOCK_SUFFIX)] if entry.endswith(LOCK_SUFFIX) else entry
+                 for entry in entries if entry.endswith(LOCK_SUFFIX)
+                 or os.path.isdir(os.path.join(root, entry))}
+        found = []
+        for name in names:
+            directory = os.path.join(root, name)
+            lock = QLockFile(directory + LOCK_SUFFIX)
+            lock.setStaleLockTime(0)
+            if not lock.tryLock(0):
+                continue  # Held by a running session
+            checkpoint = cls(directory, lock)
+            if checkpoint.exists():
+                found.append(checkpoint)
+            else:
+                checkpoint.discard()
+        return sorted(found, key=lambda checkpoint: os.path.getmtime(checkpoint.manifest_path),
+                      reverse=True)
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.directory, MANIFEST_NAME)
+
+    def exists(self):
+        return os.path.exists(self.manifest_path)
+
+    def seed(self, project):
+        """Refer to the layers of a core.project.ProjectFile just opened or saved.
+
+        Until their pixels change, the layers stored in the project are
+        checkpointed as references to their tiles there, so the first
+        checkpoint after opening a large project writes no pixels.
+        """
+        path = os.path.abspath(project.path)
+        self._seeds = {layer_id: (version, {"project": path, "entry": entry})
+                       for layer_id, (version, entry) in project.stored_layers().items()}
+
+    @traced("autosave")
+    def write(self, layers, properties=None):
+        """Checkpoint bottom-to-top layer snapshots; return True if anything was written."""
+        os.makedirs(self.directory, exist_ok=True)
+        files, entries = {}, []
+        for layer in layers:
+            for stored in (self._files.get(layer.id), self._seeds.get(layer.id)):
+                if stored is not None and stored[0] == layer.version:
+                    source = stored[1]
+                    break
+            else:
+                source = {"file": f"{layer.id}.{uuid.uuid4().hex[:8]}.{PROJECT_EXTENSION}"}
+                ProjectFile(os.path.join(self.directory, source["file"])).save([layer])
+            files[layer.id] = (layer.version, source)
+            entries.append(dict(source, id=layer.id, name=layer.name,
+                                opacity=layer.opacity, offset=list(layer.offset),
+                                visible=layer.visible, blend_mode=layer.blend_mode))
+
+        manifest = {"layers": entries, "properties": properties or {}}
+        if manifest == self._last_manifest:
+            return False
+        temp_path = f"{self.manifest_path}.tmp"
+        with open(temp_path, "w") as manifest_file:
+            json.dump(manifest, manifest_file, indent=1)
+        os.replace(temp_path, self.manifest_path)
+
+        # Files of replaced or removed layers are no longer referenced. On
+        # POSIX a layer still reading one (kept for undo) keeps it readable.
+        referenced = {source["file"] for _, source in files.values() if "file" in source}
+        for _, source in self._files.values():
+            if "file" in source and source["file"] not in referenced:
+                self._remove(source["file"])
+        self._files = files
+        self._last_manifest = manifest
+        return True
+
+    def load(self):
+        """Read the checkpoint back; return (layers, thumbnails, properties).
+
+        Layers are loaded lazily from their files, as for ProjectFile.load.
+        """
+        with open(self.manifest_path) as manifest_file:
+            manifest = json.load(manifest_file)
+        layers, thumbnails, files = [], {}, {}
+        # Layers referring to a project are read through one handle on it
+        referred, from_projects = {}, {}
+        for entry in manifest["layers"]:
+            if "project" in entry:
+                referred.setdefault(entry["project"], []).append(entry["entry"])
+        for path, project_entries in referred.items():
+            project_layers, project_thumbnails = ProjectFile(path).load_entries(project_entries)
+            from_projects.update((layer.id, layer) for layer in project_layers)
+            thumbnails.update(project_thumbnails)
+
+        for entry in manifest["layers"]:
+            if "project" in entry:
+                source = {"project": entry["project"], "entry": entry["entry"]}
+                layer, layer_thumbnails = from_projects[entry["id"]], {}
+            else:
+                source = {"file": entry["file"]}
+                (layer,), layer_thumbnails = ProjectFile(os.path.join(self.directory, entry["file"])).load()
+            layer.name = entry["name"]
+            layer.opacity = entry["opacity"]
+            layer.offset = tuple(entry["offset"])
+            layer.visible = entry["visible"]
+            layer.blend_mode = entry.get("blend_mode", DEFAULT_BLEND_MODE)
+            layers.append(layer)
+            thumbnails.update(layer_thumbnails)
+            files[layer.id] = (layer.version, source)
+        self._files = files
+        self._last_manifest = manifest
+        return layers, thumbnails, manifest.get("properties", {})
+
+    def discard(self):
+        """Delete the checkpoint and release its lock."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self._files = {}
+        self._seeds = {}
+        self._last_manifest = None
+        self.release()
+
+    def release(self):
+        """Release the lock but keep the files, so the checkpoint is offered again later."""
+        if self.lock is not None:
+            self.lock.unlock()
+            self.lock = None
+
+    def _remove(self, name):
+        try:
+            os.remove(os.path.join(self.directory, name))
+        except OSError:
+            pass
+
+
+class _AutosaveSignals(QObject):
+    """Signals emitted by an autosave task (QRunnable cannot emit them itself)."""
+
+    done = pyqtSignal(bool)  # success
+
+
+class _AutosaveTask(QRunnable):
+    """Writes one checkpoint on a worker thread."""
+
+    def __init__(self, checkpoint, layers, properties):
+        super().__init__()
+        self.checkpoint = checkpoint
+        self.layers = layers
+        self.properties = properties
+        self.signals = _AutosaveSignals()
+
+    def run(self):
+        try:
+            self.checkpoint.write(self.layers, self.properties)
+            success = True
+        except (cv2.error, MemoryError, ValueError, OSError, zipfile.BadZipFile):
+            success = False
+        self.signals.done.emit(success)
+
+
+class Autosaver(QObject):
+    """Periodically writes a Checkpoint off the GUI thread.
+
+    collect is called on the GUI thread and returns (layer snapshots,
+    properties); taking snapshots copies no pixels, so a tick costs the GUI
+    thread almost nothing. A tick is skipped while the previous checkpoint
+    is still being written.
+    """
+
+    checkpointSaved = pyqtSignal(bool)  # success
+
+    def __init__(self, checkpoint, collect, interval_s=60, parent=None):
+        super().__init__(parent)
+        self.checkpoint = checkpoint
+        self.collect = collect
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(1)
+        self.timer = QTimer(self)
+        self.timer.setInterval(int(interval_s * 1000))
+        self.timer.timeout.connect(self.save_now)
+        self._task = None
+
+    def start(self):
+        """Start periodic checkpoints, unless the interval is zero."""
+        if self.timer.interval() > 0:
+            self.timer.start()
+
+    def stop(self):
+        """Stop the timer and wait for a checkpoint in progress."""
+        self.timer.stop()
+        self.thread_pool.waitForDone()
+
+    def save_now(self):
+        """Queue a checkpoint of the current state."""
+        if self._task is not None:
+            return
+        layers, properties = self.collect()
+        self._task = _AutosaveTask(self.checkpoint, layers, properties)
+        self._task.setAutoDelete(False)
+        self._task.signals.done.connect(self._handle_done)
+        self.thread_pool.start(self._task)
+
+    def _handle_done(self, success):
+        self._task = None
+        self.checkpointSaved.emit(success)
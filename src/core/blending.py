@@ -0,0 +1,113 @@
+from .lazy_import import cv2, np
+
+# Blend mode ids, in menu order, with their display names
+BLEND_MODES = {
+    "normal": "Normal",
+    "multiply": "Multiply",
+    "screen": "Screen",
+    "overlay": "Overlay",
+    "soft_light": "Soft Light",
+    "difference": "Difference",
+    "add": "Add",
+    "lighten": "Lighten",
+    "darken": "Darken",
+}
+DEFAULT_BLEND_MODE = "normal"
+
+
+def _multiply(cb, ab, cs, as_):
+    return cs * cb + cs * (1.0 - ab) + cb * (1.0 - as_)
+
+
+def _screen(cb, ab, cs, as_):
+    return cs + cb - cs * cb
+
+
+def _lighten(cb, ab, cs, as_):
+    return cs + cb - np.minimum(cs * ab, cb * as_)
+
+
+def _darken(cb, ab, cs, as_):
+    return cs + cb - np.maximum(cs * ab, cb * as_)
+
+
+def _difference(cb, ab, cs, as_):
+    return cs + cb - 2.0 * np.minimum(cs * ab, cb * as_)
+
+
+def _add(cb, ab, cs, as_):
+    return cs * (1.0 - ab) + cb * (1.0 - as_) + np.minimum(ab * as_, cs * ab + cb * as_)
+
+
+def _overlay(cb, ab, cs, as_):
+    both = ab * as_
+    mixed = np.where(2.0 * cb <= ab, 2.0 * cs * cb,
+                     both - 2.0 * (ab - cb) * (as_ - cs))
+    return cs * (1.0 - ab) + cb * (1.0 - as_) + mixed
+
+
+def _soft_light(cb, ab, cs, as_):
+    # The W3C formula needs straight colours; transparent pixels contribute nothing
+    b = np.divide(cb, ab, out=np.zeros_like(cb), where=ab > 0)
+    s = np.divide(cs, as_, out=np.zeros_like(cs), where=as_ > 0)
+    d = np.where(b <= 0.25, ((16.0 * b - 12.0) * b + 4.0) * b, np.sqrt(b))
+    mixed = np.where(s <= 0.5, b - (1.0 - 2.0 * s) * b * (1.0 - b),
+                     b + (2.0 * s - 1.0) * (d - b))
+    return cs * (1.0 - ab) + cb * (1.0 - as_) + ab * as_ * mixed
+
+
+_COLOR_FUNCTIONS = {  # Colour formulas of the modes other than normal
+    "multiply": _multiply,
+    "screen": _screen,
+    "overlay": _overlay,
+    "soft_light": _soft_light,
+    "difference": _difference,
+    "add": _add,
+    "lighten": _lighten,
+    "darken": _darken,
+}
+
+
+def blend(backdrop, source, mode=DEFAULT_BLEND_MODE):
+    """Blend source onto backdrop in place, both premultiplied float in [0, 1].
+
+    The arrays are channel-planar float32, shaped (4, ...) with B, G, R
+    and alpha planes, so every plane is contiguous and a whole tile is
+    blended in one batch of vectorised operations. Colours follow the
+    W3C compositing formulas for separable blend modes, which keep
+    premultiplied colour within alpha; alpha is always source-over.
+    """
+    if mode == DEFAULT_BLEND_MODE:
+        # Source-over is the same formula for colour and alpha, done in place
+        backdrop *= 1.0 - source[3]
+        backdrop += source
+        return backdrop
+    cb, ab = backdrop[:3], backdrop[3:]
+    cs, as_ = source[:3], source[3:]
+    color = _COLOR_FUNCTIONS[mode](cb, ab, cs, as_)
+    alpha = as_ + ab * (1.0 - as_)
+    backdrop[:3] = color
+    backdrop[3:] = alpha
+    return backdrop
+
+
+def blend_tiles(backdrop, source, mode=DEFAULT_BLEND_MODE, opacity=1.0):
+    """Blend two premultiplied uint8 BGRA tiles and return the uint8 result."""
+    result = to_float(backdrop)
+    blend(result, to_float(source, opacity), mode)
+    return to_uint8(result)
+
+
+def to_float(pixels, scale=1.0):
+    """(H, W, 4) uint8 pixels as (4, H, W) float32 in [0, 1], optionally scaled."""
+    height, width = pixels.shape[:2]
+    planes = np.empty((4, height, width), dtype=np.float32)
+    for plane, channel in zip(planes, cv2.split(pixels)):
+        np.multiply(channel, np.float32(scale / 255.0), out=plane)
+    return planes
+
+
+def to_uint8(planes):
+    """(4, H, W) float planes in [0, 1] as (H, W, 4) uint8, saturating rounding error."""
+    return cv2.merge(list(cv2.convertScaleAbs(planes.reshape(4, -1), alpha=255.0)
+                          .reshape(planes.shape)))
@@ -0,0 +1,312 @@
+import math
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from .adjustments import tile_results
+from .blending import DEFAULT_BLEND_MODE, blend, to_float, to_uint8
+from .lazy_import import cv2, np
+from .tiles import tile_grid, tile_rect
+
+class Compositor:
+    """Flattens a layer stack tile by tile, with per-layer blend modes.
+
+    Layers are fitted and centred in the output the way the canvas fits
+    them into its preview rect. Each output tile is composited on its own
+    from the pyramid level of each layer that best matches the output
+    scale, as 8-bit premultiplied BGRA, so the canvas renders just the
+    tiles it shows and exports render every tile on a thread pool (NumPy
+    and cv2 release the GIL). Works on NumPy buffers only and never
+    touches the GUI, so it can run on worker threads.
+    """
+
+    _pool = None
+    _pool_lock = threading.Lock()
+
+    @staticmethod
+    def native_size(layer_sizes, canvas_size):
+        """Smallest canvas-shaped size that shows every layer at full resolution.
+
+        layer_sizes is an iterable of (width, height), canvas_size a
+        (width, height) tuple. Adjustment layers have no size of their
+        own and are left out by the callers.
+        """
+        canvas_w, canvas_h = canvas_size
+        factor = 1.0
+        for w, h in layer_sizes:
+            factor = max(factor, w / canvas_w, h / canvas_h)
+        return int(math.ceil(canvas_w * factor)), int(math.ceil(canvas_h * factor))
+
+    @staticmethod
+    def composite(layers, canvas_size, output_size):
+        """Composite layers bottom-to-top into one straight-alpha BGRA image.
+
+        layers is an iterable of core.document.Layer (or anything with
+        opacity, offset, blend_mode and pyramid access) and
+        core.adjustments.AdjustmentLayer. Offsets are in canvas units and
+        are scaled to the output size.
+        """
+        layers = list(layers)
+        out_w, out_h = output_size
+        result = np.empty((out_h, out_w, 4), dtype=np.uint8)  # Premultiplied
+        cols, rows = tile_grid(out_w, out_h)
+        rects = [tile_rect(col, row, out_w, out_h) for row in range(rows) for col in range(cols)]
+        tiles = Compositor.composite_tiles(layers, canvas_size, output_size, rects)
+        for (x, y, w, h), tile in zip(rects, tiles):
+            result[y:y + h, x:x + w] = tile
+
+        # The (un)premultiply conversions only treat the last channel as alpha,
+        # so they work on BGRA just as well as on RGBA.
+        return cv2.cvtColor(result, cv2.COLOR_mRGBA2RGBA)
+
+    @staticmethod
+    def composite_tiles(layers, canvas_size, output_size, rects):
+        """Composite several (x, y, w, h) output rects in parallel, in order."""
+        layers = list(layers)
+        return Compositor.map_tiles(
+            lambda rect: Compositor.composite_tile(layers, canvas_size, output_size, rect), rects)
+
+    @staticmethod
+    def map_tiles(render, rects):
+        """Return [render(rect) for rect in rects], rendered on the shared pool."""
+        if len(rects) == 1:
+            return [render(rects[0])]
+        return list(Compositor._executor().map(render, rects))
+
+    @staticmethod
+    def composite_tile(layers, canvas_size, output_size, rect):
+        """Composite one (x, y, w, h) rect of the output as premultiplied BGRA uint8.
+
+        If the result of an adjustment layer is memoized for this rect,
+        compositing starts from the topmost such result instead of from
+        the bottom of the stack.
+        """
+        layers = list(layers)
+        states = stack_state(layers)
+        adjustments = [index for index, layer in enumerate(layers)
+                       if getattr(layer, 'is_adjustment', False)]
+        start, result = 0, None
+        for index in reversed(adjustments):
+            tile = tile_results.get(Compositor._adjustment_key(
+                states[:index], layers[index], canvas_size, output_size, rect))
+            if tile is not None:
+                start, result = index + 1, to_float(tile)
+                break
+        if result is None:
+            result = np.zeros((4, rect[3], rect[2]), dtype=np.float32)  # Planar, see blending
+        for index in range(start, len(layers)):
+            result = Compositor.apply_layer(result, layers[index], states[:index],
+                                            canvas_size, output_size, rect)
+        return to_uint8(result)
+
+    @staticmethod
+    def apply_layer(result, layer, below_state, canvas_size, output_size, rect):
+        """Put one layer over the planar float composite of rect; return the composite.
+
+        Raster layers are blended in place. An adjustment layer replaces
+        the composite with an adjusted copy, memoized under below_state,
+        the stack_state of the layers composited so far.
+        """
+        if not getattr(layer, 'is_adjustment', False):
+            Compositor.blend_layer(result, layer, canvas_size, output_size, rect)
+            return result
+        if layer.opacity <= 0:
+            return result
+        key = Compositor._adjustment_key(below_state, layer, canvas_size, output_size, rect)
+        tile = tile_results.get(key)
+        if tile is None:
+            tile = layer.apply(to_uint8(result))
+            tile_results.put(key, tile)
+        return to_float(tile)
+
+    @staticmethod
+    def blend_layer(result, layer, canvas_size, output_size, rect):
+        """Blend one layer onto the planar float composite of rect, in place."""
+        if layer.opacity <= 0:
+            return
+        placed = Compositor._sample(layer, canvas_size, output_size, rect)
+        if placed is None:
+            return
+        left, top, pixels = placed
+        tile_x, tile_y = rect[:2]
+        target = result[:, top - tile_y:top - tile_y + pixels.shape[0],
+                        left - tile_x:left - tile_x + pixels.shape[1]]
+        blend(target, to_float(pixels, layer.opacity),
+              getattr(layer, 'blend_mode', DEFAULT_BLEND_MODE))
+
+    @staticmethod
+    def placement(layer, canvas_size, output_size):
+        """Return (x, y, width, height) of a layer in output pixels."""
+        out_w, out_h = output_size
+        unit = min(out_w / canvas_size[0], out_h / canvas_size[1])
+        fit = min(out_w / layer.width, out_h / layer.height)
+        scaled_w = max(1, int(round(layer.width * fit)))
+        scaled_h = max(1, int(round(layer.height * fit)))
+        x = (out_w - scaled_w) // 2 + int(round(layer.offset[0] * unit))
+        y = (out_h - scaled_h) // 2 + int(round(layer.offset[1] * unit))
+        return x, y, scaled_w, scaled_h
+
+    @staticmethod
+    def _sample(layer, canvas_size, output_size, rect):
+        """Resample the part of a layer covering rect as premultiplied BGRA.
+
+        Returns (left, top, pixels) in output coordinates, or None when the
+        layer does not overlap rect. Reads only the overlapping region of
+        the pyramid level closest above the output scale.
+        """
+        x, y, scaled_w, scaled_h = Compositor.placement(layer, canvas_size, output_size)
+        tile_x, tile_y, tile_w, tile_h = rect
+        left, top = max(x, tile_x), max(y, tile_y)
+        right = min(x + scaled_w, tile_x + tile_w)
+        bottom = min(y + scaled_h, tile_y + tile_h)
+        if left >= right or top >= bottom:
+            return None
+
+        fit = scaled_w / layer.width
+        level = int(math.floor(math.log2(1.0 / fit))) if fit < 1.0 else 0
+        level = min(level, layer.level_count() - 1)
+        level_w, level_h = layer.level_size(level)
+        scale_x, scale_y = scaled_w / level_w, scaled_h / level_h  # Output pixels per level pixel
+
+        if scale_x == 1.0 and scale_y == 1.0:
+            pixels = Compositor._premultiplied(
+                layer.region(left - x, top - y, right - left, bottom - top, level=level))
+            return left, top, pixels
+
+        # Source pixel centres of the first and last output pixels, plus a
+        # margin so that interpolation never reaches the edge of the crop
+        first_x = (left - x + 0.5) / scale_x - 0.5
+        first_y = (top - y + 0.5) / scale_y - 0.5
+        src_x = max(0, int(math.floor(first_x)) - 1)
+        src_y = max(0, int(math.floor(first_y)) - 1)
+        src_right = min(level_w, int(math.ceil((right - x - 0.5) / scale_x - 0.5)) + 2)
+        src_bottom = min(level_h, int(math.ceil((bottom - y - 0.5) / scale_y - 0.5)) + 2)
+        crop = Compositor._premultiplied(
+            layer.region(src_x, src_y, src_right - src_x, src_bottom - src_y, level=level))
+
+        inverse = np.float32([[1.0 / scale_x, 0.0, first_x - src_x],
+                              [0.0, 1.0 / scale_y, first_y - src_y]])
+        pixels = cv2.warpAffine(crop, inverse, (right - left, bottom - top),
+                                flags=cv2.INTER_LINEAR | cv2.WARP_INVERSE_MAP,
+                                borderMode=cv2.BORDER_REPLICATE)
+        return left, top, pixels
+
+    @staticmethod
+    def _adjustment_key(below_state, layer, canvas_size, output_size, rect):
+        return below_state, layer.version, layer.opacity, canvas_size, output_size, rect
+
+    @staticmethod
+    def _premultiplied(pixels):
+        """Premultiplied BGRA copy of BGR or straight BGRA pixels."""
+        if pixels.shape[2] == 4:
+            return cv2.cvtColor(pixels, cv2.COLOR_RGBA2mRGBA)
+        return cv2.cvtColor(pixels, cv2.COLOR_BGR2BGRA)
+
+    @classmethod
+    def _executor(cls):
+        """Shared pool that composites tiles in parallel."""
+        with cls._pool_lock:
+            if cls._pool is None:
+                cls._pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 4,
+                                               thread_name_prefix="compositor")
+            return cls._pool
+
+
+def stack_state(layers):
+    """Hashable compositing state of a bottom-to-top list of layers.
+
+    Covers order, pixel versions and every property the compositor reads,
+    so two equal states always composite to the same pixels.
+    """
+    return tuple((layer.id, layer.version, layer.opacity, tuple(layer.offset),
+                  getattr(layer, 'blend_mode', DEFAULT_BLEND_MODE)) for layer in layers)
+
+
+class CompositeCache:
+    """Composites a layer stack around an active layer from cached groups.
+
+    The visible layers below the active layer and the visible layers above
+    it are each flattened once per output tile and kept as 8-bit
+    premultiplied tiles in an LRU bounded by limit_mb. Entries are keyed
+    by the stack_state of the group, so a group misses exactly when one of
+    its layers changes visibility, position or pixels, while changes to the
+    active layer itself reuse both groups: a tile then costs three blends
+    whatever the size of the stack.
+
+    Separable blend modes are not associative, so the group above is only
+    flattened when all of its layers use Normal and none of them is an
+    adjustment layer; otherwise they are put one by one over the active
+    layer. Adjustment layers keep their own per-tile results (see
+    core.adjustments.TileResults), so an active adjustment layer whose
+    sliders are moving costs one lookup table pass per tile.
+    """
+
+    def __init__(self, limit_mb=256):
+        self.limit = int(limit_mb * 1024 * 1024)
+        self._tiles = OrderedDict()  # (group state, canvas size, output size, rect) -> tile
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def composite_tiles(self, layers, active, canvas_size, output_size, rects):
+        """Composite rects of a bottom-to-top stack as premultiplied BGRA uint8 tiles.
+
+        layers is the whole stack, hidden layers included, so that hiding
+        or showing the active layer keeps both groups. active may be None,
+        in which case the whole stack is one cached group.
+        """
+        layers = list(layers)
+        split = next((index for index, layer in enumerate(layers) if layer is active), len(layers))
+        below = [layer for layer in layers[:split] if self._contributes(layer)]
+        above = [layer for layer in layers[split + 1:] if self._contributes(layer)]
+        active = active if active is not None and self._contributes(active) else None
+        below_state, above_state = stack_state(below), stack_state(above)
+        active_state = below_state + stack_state([active] if active is not None else [])
+        flatten_above = all(not getattr(layer, 'is_adjustment', False) and
+                            getattr(layer, 'blend_mode', DEFAULT_BLEND_MODE) == DEFAULT_BLEND_MODE
+                            for layer in above)
+
+        def render(rect):
+            result = to_float(self._group_tile(below, below_state, canvas_size, output_size, rect))
+            if active is not None:
+                result = Compositor.apply_layer(result, active, below_state,
+                                                canvas_size, output_size, rect)
+            if flatten_above and above:
+                blend(result, to_float(self._group_tile(above, above_state, canvas_size,
+                                                        output_size, rect)))
+            elif not flatten_above:
+                for index, layer in enumerate(above):
+                    result = Compositor.apply_layer(result, layer, active_state + above_state[:index],
+                                                    canvas_size, output_size, rect)
+            return to_uint8(result)
+
+        return Compositor.map_tiles(render, rects)
+
+    def clear(self):
+        with self._lock:
+            self._tiles.clear()
+            self._bytes = 0
+
+    @staticmethod
+    def _contributes(layer):
+        return layer.visible and layer.opacity > 0
+
+    def _group_tile(self, layers, state, canvas_size, output_size, rect):
+        """Flattened tile of a group of layers, from the LRU when possible."""
+        if not layers:
+            return np.zeros((rect[3], rect[2], 4), dtype=np.uint8)
+        key = (state, canvas_size, output_size, rect)
+        with self._lock:
+            tile = self._tiles.get(key)
+            if tile is not None:
+                self._tiles.move_to_end(key)
+                return tile
+
+        tile = Compositor.composite_tile(layers, canvas_size, output_size, rect)
+        with self._lock:
+            if key not in self._tiles:
+                self._tiles[key] = tile
+                self._bytes += tile.nbytes
+            while self._bytes > self.limit and len(self._tiles) > 1:
+                _, evicted = self._tiles.popitem(last=False)
+                self._bytes -= evicted.nbytes
+        return tile
@@ -0,0 +1,268 @@
+import copy
+import threading
+import uuid
+from .blending import DEFAULT_BLEND_MODE
+from .lazy_import import np
+from .image_handler import ImageHandler
+from .tiles import (TILE_SIZE, PatchedArray, downsample_half, halve_region, level_count, read_region,
+                    tile_grid, tile_rect)
+
+class Layer:
+    """A raster layer: contiguous pixels plus its compositing properties.
+
+    Pixels are a uint8 array in cv2's native channel order, either HxWx3
+    BGR (opaque) or HxWx4 BGRA with straight alpha. They are never
+    modified in place; set_pixels swaps in a new array, so a shallow
+    snapshot of a layer can be read safely from another thread.
+
+    The pixels may also be spilled to a TileCache, in which case they are
+    read tile by tile through region() and only assembled in full when the
+    pixels property is accessed. Either way the layer keeps a lazily built
+    mipmap pyramid (level 0 being the pixels, each further level halving
+    the previous one) for rendering at reduced zoom.
+
+    Every layer has a stable id that survives reordering and renaming and
+    is shared by its snapshots.
+    """
+
+    is_adjustment = False  # See core.adjustments.AdjustmentLayer
+
+    def __init__(self, pixels, name="", opacity=1.0, offset=(0, 0), visible=True, layer_id=None,
+                 blend_mode=DEFAULT_BLEND_MODE):
+        self.id = layer_id or uuid.uuid4().hex
+        self.name = name
+        self.opacity = opacity
+        self.blend_mode = blend_mode  # Key of core.blending.BLEND_MODES
+        self.offset = offset  # (x, y) shift from the centred position, canvas units
+        self.visible = visible
+        self.version = 0  # Bumped whenever the pixels change
+        self.tile_cache = None
+        self._levels = [self._as_buffer(pixels)]
+        self._levels_lock = threading.Lock()  # Levels are built from several threads
+
+    @classmethod
+    def from_levels(cls, levels, **properties):
+        """Create a layer from an already built pyramid, level 0 first.
+
+        The levels may be arrays or tiled buffers (a saved project's layers
+        are read back as tiled buffers that load tiles on demand).
+        """
+        layer = cls(levels[0], **properties)
+        layer._levels = [layer._levels[0]] + [cls._as_buffer(level) for level in levels[1:]]
+        return layer
+
+    @classmethod
+    def from_qimage(cls, image, name=""):
+        """Create a layer from a copy of a QImage's pixels."""
+        return cls(ImageHandler.image_to_array(image), name)
+
+    @property
+    def pixels(self):
+        """The full-resolution pixels as an array (assembled if spilled)."""
+        buffer = self._levels[0]
+        return buffer if isinstance(buffer, np.ndarray) else buffer.to_array()
+
+    @property
+    def buffer(self):
+        """The full-resolution pixels as stored: an array or a TiledArray."""
+        return self._levels[0]
+
+    @property
+    def width(self):
+        return self._levels[0].shape[1]
+
+    @property
+    def height(self):
+        return self._levels[0].shape[0]
+
+    @property
+    def channels(self):
+        return self._levels[0].shape[2]
+
+    @property
+    def size(self):
+        """(width, height) of the pixel buffer."""
+        return self.width, self.height
+
+    @property
+    def nbytes(self):
+        """Size of the full-resolution pixels in bytes."""
+        return self._levels[0].nbytes
+
+    @property
+    def is_spilled(self):
+        return not isinstance(self._levels[0], np.ndarray)
+
+    def set_pixels(self, pixels):
+        """Replace the pixel buffer."""
+        buffer = self._as_buffer(pixels)
+        if self.tile_cache is not None and isinstance(buffer, np.ndarray):
+            buffer = self.tile_cache.spill(buffer)
+        self._levels = [buffer]
+        self.version += 1
+
+    def read_tiles(self, keys):
+        """Return copies of the full-resolution tiles at the given (col, row) keys."""
+        return {(col, row): self.region(*tile_rect(col, row, self.width, self.height)).copy()
+                for col, row in keys}
+
+    def write_tiles(self, tiles):
+        """Overwrite some full-resolution tiles, sharing the others with the current pixels.
+
+        tiles maps (col, row) to arrays shaped like the tiles read_tiles
+        returns. Only these tiles, and the tiles of the built pyramid
+        levels that cover them, are replaced: the work is proportional to
+        the tiles touched, not to the layer. The current buffers are left
+        untouched for any snapshot still reading them.
+        """
+        levels = [self._patch(self._levels[0], tiles)]
+        rects = [tile_rect(col, row, self.width, self.height) for col, row in tiles]
+        for level in self._levels[1:]:
+            # Each level pixel averages the 2x2 pixels under it in the level before
+            height, width = level.shape[:2]
+            rects = [(x // 2, y // 2, min(width, (x + w + 1) // 2) - x // 2,
+                      min(height, (y + h + 1) // 2) - y // 2) for x, y, w, h in rects]
+            keys = {(col, row) for x, y, w, h in rects if w > 0 and h > 0
+                    for row in range(y // TILE_SIZE, (y + h - 1) // TILE_SIZE + 1)
+                    for col in range(x // TILE_SIZE, (x + w - 1) // TILE_SIZE + 1)}
+            levels.append(self._patch(level, {
+                key: halve_region(levels[-1], *tile_rect(*key, width, height)) for key in keys}))
+        self._levels = levels
+        self.version += 1
+
+    def spill(self, tile_cache):
+        """Move the pixels and any built pyramid levels into a TileCache."""
+        self.tile_cache = tile_cache
+        self._levels = [level if not isinstance(level, np.ndarray) else tile_cache.spill(level)
+                        for level in self._levels]
+
+    def level_count(self):
+        """Number of pyramid levels, the last one fitting in a single tile."""
+        return level_count(self.width, self.height)
+
+    def level_size(self, level):
+        """(width, height) of a pyramid level."""
+        height, width = self._level(level).shape[:2]
+        return width, height
+
+    def region(self, x, y, w, h, level=0):
+        """Read a rectangle of a pyramid level (a view for in-memory levels)."""
+        return read_region(self._level(level), x, y, w, h)
+
+    def level_image(self, level):
+        """Return a QImage of a whole pyramid level (a view for in-memory levels)."""
+        width, height = self.level_size(level)
+        return ImageHandler.array_to_qimage(self.region(0, 0, width, height, level=level))
+
+    def to_qimage(self):
+        """Return a QImage viewing this layer's pixels without copying them.
+
+        The QImage references the current buffer, which stays alive as long
+        as the QImage does, even if the layer's pixels are replaced.
+        """
+        return ImageHandler.array_to_qimage(self.pixels)
+
+    def snapshot(self):
+        """Shallow copy sharing the pixel buffer, for use on other threads."""
+        return copy.copy(self)
+
+    def _level(self, level):
+        """Return a pyramid level buffer, building missing levels on first use."""
+        level = min(level, self.level_count() - 1)
+        levels = self._levels
+        if len(levels) > level:
+            return levels[level]
+        with self._levels_lock:
+            while len(levels) <= level:
+                next_level = downsample_half(levels[-1])
+                if self.tile_cache is not None:
+                    next_level = self.tile_cache.spill(next_level)
+                levels.append(next_level)
+        return levels[level]
+
+    def _patch(self, buffer, tiles):
+        """buffer with some tiles replaced, see core.tiles.PatchedArray."""
+        patched = PatchedArray.patch(buffer, tiles)
+        cols, rows = tile_grid(patched.shape[1], patched.shape[0])
+        if len(patched.tiles) * 2 <= cols * rows:
+            return patched
+        # Mostly rewritten: fold the tiles back into one buffer, so the
+        # replaced base is freed (the copy is paid for by the edits so far)
+        buffer = patched.to_array()
+        return self.tile_cache.spill(buffer) if self.tile_cache is not None else buffer
+
+    @staticmethod
+    def _as_buffer(pixels):
+        if isinstance(pixels, np.ndarray):
+            return np.ascontiguousarray(pixels, dtype=np.uint8)
+        return pixels  # Already a TiledArray (spilled or in a project file)
+
+
+class Document:
+    """An ordered stack of layers, bottom to top.
+
+    Layers are indexed by id, and each layer's stack position is kept in a
+    dict, so lookups are O(1). Structural changes renumber only the
+    positions between the first and last index they shift.
+    """
+
+    def __init__(self, tile_cache=None):
+        self.layers = []
+        self.tile_cache = tile_cache  # Optional TileCache that layer pixels spill into
+        self._by_id = {}  # Layer id -> layer
+        self._positions = {}  # Layer id -> index in self.layers
+
+    def __len__(self):
+        return len(self.layers)
+
+    def __iter__(self):
+        return iter(self.layers)
+
+    def __contains__(self, layer):
+        return self._by_id.get(layer.id) is layer
+
+    def get(self, layer_id):
+        """Return the layer with the given id, or None."""
+        return self._by_id.get(layer_id)
+
+    def add_layer(self, layer, index=None):
+        """Insert a layer, on top of the stack by default."""
+        if index is None:
+            index = len(self.layers)
+        if self.tile_cache is not None:
+            layer.spill(self.tile_cache)
+        self.layers.insert(index, layer)
+        self._by_id[layer.id] = layer
+        self._renumber(index, len(self.layers))
+        return layer
+
+    def remove_layer(self, layer):
+        """Remove a layer from the stack."""
+        index = self._positions.pop(layer.id)
+        del self._by_id[layer.id]
+        del self.layers[index]
+        self._renumber(index, len(self.layers))
+
+    def move_layer(self, layer, index):
+        """Move a layer to a new stack position."""
+        current = self._positions[layer.id]
+        self.layers.insert(index, self.layers.pop(current))
+        self._renumber(min(current, index), max(current, index) + 1)
+
+    def index_of(self, layer):
+        """Stack position of a layer, 0 being the bottom."""
+        return self._positions[layer.id]
+
+    def visible_layers(self):
+        """Visible layers, bottom to top."""
+        return [layer for layer in self.layers if layer.visible]
+
+    def snapshot(self, visible_only=True):
+        """Shallow snapshots of the (visible) layers, for worker threads."""
+        layers = self.visible_layers() if visible_only else self.layers
+        return [layer.snapshot() for layer in layers]
+
+    def _renumber(self, start, stop):
+        """Refresh the stored positions of layers start to stop - 1."""
+        for index in range(start, stop):
+            self._positions[self.layers[index].id] = index
@@ -0,0 +1,115 @@
+import threading
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from .graph import build_graph
+from .lazy_import import np
+from .tiles import TILE_SIZE, tile_grid
+
+class _BandSignals(QObject):
+    """Signals emitted by a band task (QRunnable cannot emit them itself)."""
+
+    done = pyqtSignal(int)  # band row
+
+
+class _BandTask(QRunnable):
+    """Computes one row of output tiles into a run's result on a worker thread."""
+
+    def __init__(self, row, output, result, cancelled):
+        super().__init__()
+        self.row = row
+        self.output = output  # core.graph node
+        self.result = result
+        self.cancelled = cancelled  # threading.Event of the run
+        self.stopped = False  # Set once run() no longer touches the task
+        self.signals = _BandSignals()
+
+    def run(self):
+        output, result = self.output, self.result
+        self.output = self.result = None  # Nothing heavy is kept once the band is done
+        cols, _ = tile_grid(output.width, output.height)
+        y = self.row * TILE_SIZE
+        h = min(TILE_SIZE, output.height - y)
+        for col in range(cols):
+            if self.cancelled.is_set():
+                self.stopped = True
+                return
+            x = col * TILE_SIZE
+            w = min(TILE_SIZE, output.width - x)
+            result[y:y + h, x:x + w] = output.tile(col, self.row, memoize=False)
+        self.stopped = True
+        self.signals.done.emit(self.row)
+
+
+class FilterRunner(QObject):
+    """Applies a chain of filters to a whole layer at full resolution on a thread pool.
+
+    The layer is handed over as a snapshot, so edits on the GUI thread do
+    not affect the run. Each task computes one row of tiles of the
+    output of the layer's core.graph (cv2 releases the GIL) into a new
+    pixel array, so the GUI thread only ever counts finished rows. Tiles
+    are pulled through the shared node outputs, so the ones a preview
+    already computed at full resolution are not filtered again. The
+    filtered pixels are emitted with finished; a cancelled run emits
+    cancelled instead and drops its partial result.
+    """
+
+    progressChanged = pyqtSignal(int, int)  # done rows, total rows
+    finished = pyqtSignal(object, object)  # layer snapshot, filtered pixels
+    cancelled = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.thread_pool = QThreadPool(self)
+        self.layer = None
+        self.steps = None
+        self.result = None
+        self._tasks = []
+        self._stopping = []  # Tasks of cancelled runs that were already running
+        self._done = 0
+        self._cancelled = threading.Event()
+
+    def start(self, layer, steps):
+        """Start filtering a layer snapshot with a sequence of (core.filters kind, params)."""
+        self.cancel()
+        self.layer = layer
+        self.steps = [(kind, dict(params)) for kind, params in steps]
+        output = build_graph(layer, self.steps)
+        self.result = np.empty((layer.height, layer.width, layer.channels), dtype=np.uint8)
+        self._done = 0
+        self._cancelled = threading.Event()
+        _, rows = tile_grid(layer.width, layer.height)
+        self._tasks = [_BandTask(row, output, self.result, self._cancelled)
+                       for row in range(rows)]
+        for task in self._tasks:
+            task.setAutoDelete(False)
+            task.signals.done.connect(lambda row, task=task: self._handle_band_done(task))
+            self.thread_pool.start(task)
+
+    def cancel(self):
+        """Stop the run; bands in progress stop at their next tile."""
+        if not self.is_running():
+            return
+        self._cancelled.set()
+        # Queued tasks are dropped; running ones stop at their next tile and
+        # are kept alive until then
+        self._stopping = [task for task in self._stopping + self._tasks
+                          if not task.stopped and not self.thread_pool.tryTake(task)]
+        self._tasks = []
+        self.result = None
+        self.cancelled.emit()
+
+    def is_running(self):
+        return bool(self._tasks)
+
+    def wait(self):
+        """Block until the worker threads are idle."""
+        self.thread_pool.waitForDone()
+
+    def _handle_band_done(self, task):
+        if task not in self._tasks:
+            return  # From a cancelled run
+        self._done += 1
+        self.progressChanged.emit(self._done, len(self._tasks))
+        if self._done == len(self._tasks):
+            self._tasks = []
+            result, self.result = self.result, None
+            self.finished.emit(self.layer, result)
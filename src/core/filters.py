@@ -0,0 +1,151 @@
+import math
+from .adjustments import Parameter
+from .lazy_import import cv2, np
+
+# Filter kinds, in panel order, with their display names and parameters.
+# Parameters named radius are in full-resolution pixels.
+FILTERS = {
+    "gaussian_blur": ("Gaussian Blur", (
+        Parameter("radius", "Radius", 0.1, 100.0, 4.0, 0.1),
+    )),
+    "box_blur": ("Box Blur", (
+        Parameter("radius", "Radius", 1, 100, 4, 1),
+    )),
+    "sharpen": ("Sharpen", (
+        Parameter("amount", "Amount", 0.0, 5.0, 1.0, 0.01),
+        Parameter("radius", "Radius", 0.1, 20.0, 1.5, 0.1),
+    )),
+    "median": ("Median", (
+        Parameter("radius", "Radius", 1, 20, 2, 1),
+    )),
+    "bilateral": ("Bilateral", (
+        Parameter("radius", "Radius", 1, 20, 4, 1),
+        Parameter("tolerance", "Tolerance", 1, 150, 40, 1),
+    )),
+    "emboss": ("Emboss", (
+        Parameter("strength", "Strength", 0.1, 5.0, 1.0, 0.01),
+    )),
+    "edge_detect": ("Edge Detect", (
+        Parameter("strength", "Strength", 0.1, 5.0, 1.0, 0.01),
+    )),
+    "vignette": ("Vignette", (
+        Parameter("amount", "Amount", 0.0, 1.0, 0.5, 0.01),
+        Parameter("size", "Size", 0.0, 1.4, 0.6, 0.01),
+    )),
+}
+
+
+def default_params(kind):
+    """Parameter values of a new filter of the given kind."""
+    return {parameter.name: parameter.default for parameter in FILTERS[kind][1]}
+
+
+def _gaussian_blur(pixels, radius, **context):
+    return cv2.GaussianBlur(pixels, (0, 0), max(radius, 0.1))
+
+
+def _box_blur(pixels, radius, **context):
+    size = 2 * max(0, int(round(radius))) + 1
+    return cv2.blur(pixels, (size, size))
+
+
+def _sharpen(pixels, amount, radius, **context):
+    # Unsharp mask: push every pixel away from its blurred surroundings
+    blurred = cv2.GaussianBlur(pixels, (0, 0), max(radius, 0.1))
+    return cv2.addWeighted(pixels, 1.0 + amount, blurred, -amount, 0.0)
+
+
+def _median(pixels, radius, **context):
+    return cv2.medianBlur(pixels, 2 * max(0, int(round(radius))) + 1)
+
+
+def _bilateral(pixels, radius, tolerance, **context):
+    radius = max(1, int(round(radius)))
+    return cv2.bilateralFilter(pixels, 2 * radius + 1, tolerance, radius)
+
+
+def _emboss(pixels, strength, **context):
+    kernel = np.float32([[-2, -1, 0], [-1, 0, 1], [0, 1, 2]]) * strength
+    kernel[1, 1] += 1.0
+    return cv2.filter2D(pixels, -1, kernel)
+
+
+def _edge_detect(pixels, strength, **context):
+    dx = cv2.convertScaleAbs(cv2.Sobel(pixels, cv2.CV_16S, 1, 0))
+    dy = cv2.convertScaleAbs(cv2.Sobel(pixels, cv2.CV_16S, 0, 1))
+    return cv2.addWeighted(dx, 0.5 * strength, dy, 0.5 * strength, 0.0)
+
+
+def _vignette(pixels, amount, size, origin, image_size, **context):
+    # Distance from the image centre, 1 at the middle of each edge
+    width, height = image_size
+    xs = (np.arange(pixels.shape[1], dtype=np.float32) + origin[0] + 0.5) / (width / 2.0) - 1.0
+    ys = (np.arange(pixels.shape[0], dtype=np.float32) + origin[1] + 0.5) / (height / 2.0) - 1.0
+    distance = np.sqrt(ys[:, None] ** 2 + xs[None, :] ** 2)
+    t = np.clip((distance - size) / max(1e-3, math.sqrt(2.0) - size), 0.0, 1.0)
+    factor = 1.0 - amount * t * t * (3.0 - 2.0 * t)
+    return cv2.convertScaleAbs(pixels * factor[..., None])
+
+
+# kind -> (function, reach in full-resolution pixels of a parameter set)
+_FUNCTIONS = {
+    "gaussian_blur": (_gaussian_blur, lambda params: 3.0 * params["radius"]),
+    "box_blur": (_box_blur, lambda params: params["radius"]),
+    "sharpen": (_sharpen, lambda params: 3.0 * params["radius"]),
+    "median": (_median, lambda params: params["radius"]),
+    "bilateral": (_bilateral, lambda params: params["radius"]),
+    "emboss": (_emboss, lambda params: 1),
+    "edge_detect": (_edge_detect, lambda params: 1),
+    "vignette": (_vignette, lambda params: 0),
+}
+_PREMULTIPLIED = {"gaussian_blur", "box_blur", "sharpen", "median"}  # Kinds that mix neighbours
+
+
+def apply_filter(kind, params, pixels, origin=(0, 0), image_size=None, scale=1.0):
+    """Filter BGR or straight BGRA uint8 pixels; return a new array of the same shape.
+
+    pixels is the region of an image of image_size (width, height) whose
+    top-left corner is at origin. scale is image pixels per full-resolution
+    pixel, so radii shrink with it when filtering a reduced pyramid level.
+    Filters that mix neighbouring pixels run on premultiplied colour, so
+    transparent pixels do not bleed into opaque ones; the others leave
+    alpha unchanged.
+    """
+    function = _FUNCTIONS[kind][0]
+    params = {name: value * scale if name == "radius" else value for name, value in params.items()}
+    if image_size is None:
+        image_size = (pixels.shape[1], pixels.shape[0])
+    context = {"origin": origin, "image_size": image_size}
+    if pixels.shape[2] == 3:
+        return function(np.ascontiguousarray(pixels), **params, **context)
+    if kind in _PREMULTIPLIED:
+        premultiplied = cv2.cvtColor(pixels, cv2.COLOR_RGBA2mRGBA)
+        return cv2.cvtColor(function(premultiplied, **params, **context), cv2.COLOR_mRGBA2RGBA)
+    result = cv2.cvtColor(function(cv2.cvtColor(pixels, cv2.COLOR_BGRA2BGR), **params, **context),
+                          cv2.COLOR_BGR2BGRA)
+    result[..., 3] = pixels[..., 3]
+    return result
+
+
+def halo(kind, params, scale=1.0):
+    """Pixels of context a filtered region needs around it at a scale."""
+    return int(math.ceil(_FUNCTIONS[kind][1](params) * scale))
+
+
+def filter_region(layer, kind, params, x, y, w, h, level=0):
+    """Filtered (x, y, w, h) rectangle of a layer's pyramid level.
+
+    layer may be anything that reads like one, e.g. a core.graph node.
+    Reads the rectangle with the margin the filter reaches into, so
+    filtering an image region by region gives the same pixels as
+    filtering it whole.
+    """
+    level_w, level_h = layer.level_size(level)
+    scale = level_w / layer.width
+    margin = halo(kind, params, scale)
+    left, top = max(0, x - margin), max(0, y - margin)
+    right, bottom = min(level_w, x + w + margin), min(level_h, y + h + margin)
+    pixels = layer.region(left, top, right - left, bottom - top, level=level)
+    result = apply_filter(kind, params, pixels, (left, top), (level_w, level_h), scale)
+    return result[y - top:y - top + h, x - left:x - left + w]
+
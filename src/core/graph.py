@@ -0,0 +1,203 @@
+import math
+from .adjustments import TileResults
+from .filters import FILTERS, filter_region
+from .lazy_import import cv2
+from .tiles import TiledArray, tile_rect
+
+class Node:
+    """One operation of a layer's processing graph, evaluated lazily by tile.
+
+    A node reads nothing until one of its output tiles is pulled, and then
+    pulls only the input pixels that tile needs. Every node has a key made
+    of its kind, its parameters and the keys of its inputs, which names
+    its output: tiles are memoized in node_outputs under (key, level, col,
+    row) and shared by every node with the same upstream. Keys are derived
+    on every read, down to the layer's current pixel version, so a node
+    never serves tiles of pixels the layer no longer has. Parameters are
+    immutable, so a parameter change builds a new node over the same
+    inputs, whose tiles are then computed from the inputs' memoized tiles
+    rather than from the layer's pixels.
+
+    Nodes read like a layer's pyramid (width, height, channels,
+    level_count, level_size and region), so they can feed each other and
+    anything else that reads layers.
+    """
+
+    def __init__(self, input, kind, params):
+        self.input = input
+        self.kind = kind
+        self.params = dict(params)
+        self._params_key = tuple(sorted(self.params.items()))
+
+    @property
+    def key(self):
+        return self.kind, self._params_key, self.input.key
+
+    @property
+    def width(self):
+        return self.input.width
+
+    @property
+    def height(self):
+        return self.input.height
+
+    @property
+    def channels(self):
+        return self.input.channels
+
+    def level_count(self):
+        return self.input.level_count()
+
+    def level_size(self, level):
+        return self.input.level_size(level)
+
+    def region(self, x, y, w, h, level=0):
+        """Assemble a rectangle of a pyramid level from the node's tiles."""
+        return _NodeLevel(self, level).region(x, y, w, h)
+
+    def tile(self, col, row, level=0, memoize=True):
+        """One output tile of a pyramid level, computed on first use.
+
+        With memoize unset a tile that is not memoized yet is computed but
+        not kept, e.g. for a one-off run over a whole layer.
+        """
+        key = (self.key, level, col, row)
+        tile = node_outputs.get(key)
+        if tile is None:
+            tile = self.compute(*tile_rect(col, row, *self.level_size(level)), level)
+            if memoize:
+                node_outputs.put(key, tile)
+        return tile
+
+    def compute(self, x, y, w, h, level=0):
+        """Compute a rectangle of a pyramid level without memoizing it."""
+        raise NotImplementedError
+
+
+class _NodeLevel(TiledArray):
+    """One pyramid level of a node, as a TiledArray of its output tiles."""
+
+    def __init__(self, node, level):
+        width, height = node.level_size(level)
+        super().__init__((height, width, node.channels))
+        self.node = node
+        self.level = level
+
+    def tile(self, col, row):
+        return self.node.tile(col, row, self.level)
+
+
+class SourceNode(Node):
+    """The pixels of a layer, the root of its graph.
+
+    Its key is the layer's id and current pixel version, so editing the
+    pixels invalidates everything downstream, including the nodes already
+    built over it. The pyramid is read directly: the layer keeps it in
+    memory or in its own tile cache already.
+    """
+
+    def __init__(self, layer):
+        self.input = None
+        self.layer = layer
+        self.kind = "source"
+        self.params = {}
+
+    @property
+    def key(self):
+        return "source", self.layer.id, self.layer.version
+
+    @property
+    def width(self):
+        return self.layer.width
+
+    @property
+    def height(self):
+        return self.layer.height
+
+    @property
+    def channels(self):
+        return self.layer.channels
+
+    def level_count(self):
+        return self.layer.level_count()
+
+    def level_size(self, level):
+        return self.layer.level_size(level)
+
+    def region(self, x, y, w, h, level=0):
+        return self.layer.region(x, y, w, h, level=level)
+
+    def tile(self, col, row, level=0, memoize=True):
+        return self.compute(*tile_rect(col, row, *self.level_size(level)), level)
+
+    def compute(self, x, y, w, h, level=0):
+        return self.layer.region(x, y, w, h, level=level)
+
+
+class FilterNode(Node):
+    """A core.filters kind applied to its input.
+
+    Each tile reads its input with the margin the filter reaches into, so
+    the input's tiles around it are pulled (and memoized) too.
+    """
+
+    def compute(self, x, y, w, h, level=0):
+        return filter_region(self.input, self.kind, self.params, x, y, w, h, level)
+
+
+def build_graph(layer, steps):
+    """The output node of a layer put through steps, a sequence of (kind, params).
+
+    Kinds are core.filters kinds, applied in order.
+    """
+    node = SourceNode(layer)
+    for kind, params in steps:
+        if kind not in FILTERS:
+            raise ValueError(f"Unknown effect: {kind}")
+        node = FilterNode(node, kind, params)
+    return node
+
+
+class FilteredLayer:
+    """A layer seen through a chain of filters, for previewing it on the canvas.
+
+    Stands in for the layer in the compositor: every property is the
+    layer's own, but region() pulls pixels of whichever pyramid level is
+    read from the output of the layer's graph. The canvas reads the level
+    closest to the screen resolution for the exposed tiles only, so a
+    preview never filters more than the viewport at screen resolution,
+    and a change to the last filter reuses the memoized tiles of the
+    filters before it. With proxy set, regions are read one level lower
+    still and scaled up, which keeps slider drags interactive on large
+    layers.
+    """
+
+    def __init__(self, layer, steps, proxy=False):
+        self.layer = layer
+        self.output = build_graph(layer, steps)
+        self.proxy = proxy
+
+    def __getattr__(self, name):
+        return getattr(self.layer, name)
+
+    @property
+    def version(self):
+        return self.output.key, self.proxy
+
+    def region(self, x, y, w, h, level=0):
+        source = min(level + 1, self.layer.level_count() - 1) if self.proxy else level
+        if source == level:
+            return self.output.region(x, y, w, h, level)
+
+        # The source rect covering the requested one, scaled up
+        level_w, level_h = self.layer.level_size(level)
+        source_w, source_h = self.layer.level_size(source)
+        scale_x, scale_y = source_w / level_w, source_h / level_h
+        left, top = int(math.floor(x * scale_x)), int(math.floor(y * scale_y))
+        right = min(source_w, int(math.ceil((x + w) * scale_x)))
+        bottom = min(source_h, int(math.ceil((y + h) * scale_y)))
+        pixels = self.output.region(left, top, right - left, bottom - top, source)
+        return cv2.resize(pixels, (w, h), interpolation=cv2.INTER_LINEAR)
+
+
+node_outputs = TileResults(limit_mb=256)  # Shared by every graph, previews and runs alike
@@ -0,0 +1,248 @@
+from collections import deque
+from .tiles import tile_rect, TILE_SIZE
+
+class Command:
+    """One undoable edit.
+
+    Commands act on their target through its public methods, so the target
+    keeps every view in sync on undo and redo too. nbytes is the memory
+    the command keeps alive, counted against the history budget.
+    """
+
+    nbytes = 0
+
+    def do(self):
+        raise NotImplementedError
+
+    def undo(self):
+        raise NotImplementedError
+
+
+class AddLayersCommand(Command):
+    """Insert layers into the stack, on top by default.
+
+    The layers themselves are kept for redo once undone.
+    """
+
+    def __init__(self, manager, layers, index=None):
+        self.manager = manager
+        self.layers = list(layers)
+        self.index = index
+        self.nbytes = sum(layer.nbytes for layer in self.layers)
+
+    def do(self):
+        self.manager.insert_layers(self.layers, self.index)
+
+    def undo(self):
+        for layer in reversed(self.layers):
+            self.manager.remove_layer(layer)
+
+
+class RemoveLayerCommand(Command):
+    """Remove a layer, keeping it (not a copy of its pixels) for undo."""
+
+    def __init__(self, manager, layer):
+        self.manager = manager
+        self.layer = layer
+        self.index = None
+        self.nbytes = layer.nbytes
+
+    def do(self):
+        self.index = self.manager.document.index_of(self.layer)
+        self.manager.remove_layer(self.layer)
+
+    def undo(self):
+        self.manager.insert_layers([self.layer], self.index)
+
+
+class MoveLayerCommand(Command):
+    """Move a layer to another stack position."""
+
+    def __init__(self, manager, layer, index):
+        self.manager = manager
+        self.layer = layer
+        self.index = index
+        self.previous_index = None
+
+    def do(self):
+        self.previous_index = self.manager.document.index_of(self.layer)
+        self.manager.move_layer(self.layer, self.index)
+
+    def undo(self):
+        self.manager.move_layer(self.layer, self.previous_index)
+
+
+class SetVisibilityCommand(Command):
+    """Show or hide a layer."""
+
+    def __init__(self, manager, layer, visible):
+        self.manager = manager
+        self.layer = layer
+        self.visible = visible
+
+    def do(self):
+        self.manager.set_layer_visible(self.layer, self.visible)
+
+    def undo(self):
+        self.manager.set_layer_visible(self.layer, not self.visible)
+
+
+class SetBlendModeCommand(Command):
+    """Change how a layer blends with the layers below it."""
+
+    def __init__(self, manager, layer, mode):
+        self.manager = manager
+        self.layer = layer
+        self.mode = mode
+        self.previous_mode = layer.blend_mode
+
+    def do(self):
+        self.manager.set_layer_blend_mode(self.layer, self.mode)
+
+    def undo(self):
+        self.manager.set_layer_blend_mode(self.layer, self.previous_mode)
+
+
+class SetAdjustmentCommand(Command):
+    """Change the parameters of an adjustment layer.
+
+    previous defaults to the current parameters; pass it when the layer
+    was already updated live, e.g. while a slider was being dragged.
+    """
+
+    def __init__(self, manager, layer, params, previous=None):
+        self.manager = manager
+        self.layer = layer
+        self.params = dict(params)
+        self.previous = dict(previous if previous is not None else layer.params)
+
+    def do(self):
+        self.manager.set_adjustment_params(self.layer, self.params)
+
+    def undo(self):
+        self.manager.set_adjustment_params(self.layer, self.previous)
+
+
+class ReplacePixelsCommand(Command):
+    """Swap in a whole new pixel buffer, e.g. a filtered copy of the layer.
+
+    The previous buffer itself is kept for undo, never copied.
+    """
+
+    def __init__(self, manager, layer, pixels):
+        self.manager = manager
+        self.layer = layer
+        self.pixels = pixels
+        self.previous = layer.buffer
+        self.nbytes = pixels.nbytes + self.previous.nbytes
+
+    def do(self):
+        self.manager.set_layer_pixels(self.layer, self.pixels)
+        self.pixels = self.layer.buffer  # Spilled to the tile cache, if the layer uses one
+
+    def undo(self):
+        self.manager.set_layer_pixels(self.layer, self.previous)
+
+
+class PixelEditCommand(Command):
+    """A pixel edit stored as the before and after content of touched tiles.
+
+    Tiles are keyed by (col, row) on the TILE_SIZE grid. Undo and redo write
+    back only these tiles; the rest of the layer is never copied into the
+    history.
+    """
+
+    def __init__(self, manager, layer, before, after):
+        self.manager = manager
+        self.layer = layer
+        self.before = before
+        self.after = after
+        self.nbytes = sum(tile.nbytes for tile in before.values()) + \
+            sum(tile.nbytes for tile in after.values())
+
+    @classmethod
+    def from_region(cls, manager, layer, x, y, patch):
+        """Build the command that pastes patch with its top-left at (x, y)."""
+        height, width = patch.shape[:2]
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(layer.width, x + width), min(layer.height, y + height)
+        keys = [(col, row)
+                for row in range(y0 // TILE_SIZE, (y1 - 1) // TILE_SIZE + 1)
+                for col in range(x0 // TILE_SIZE, (x1 - 1) // TILE_SIZE + 1)]
+        before = layer.read_tiles(keys)
+        after = {}
+        for (col, row), tile in before.items():
+            tile_x, tile_y = tile_rect(col, row, layer.width, layer.height)[:2]
+            tile = tile.copy()
+            left, top = max(x0, tile_x), max(y0, tile_y)
+            right = min(x1, tile_x + tile.shape[1])
+            bottom = min(y1, tile_y + tile.shape[0])
+            tile[top - tile_y:bottom - tile_y, left - tile_x:right - tile_x] = \
+                patch[top - y:bottom - y, left - x:right - x]
+            after[(col, row)] = tile
+        return cls(manager, layer, before, after)
+
+    def do(self):
+        self.manager.write_layer_tiles(self.layer, self.after)
+
+    def undo(self):
+        self.manager.write_layer_tiles(self.layer, self.before)
+
+
+class History:
+    """Linear undo/redo stack with a memory budget.
+
+    execute() runs a command and records it, dropping anything that could
+    be redone. When the commands on both stacks keep more than limit_mb
+    megabytes alive, the oldest undo steps are evicted first; the most
+    recent step is always kept so the last edit can be undone.
+    """
+
+    def __init__(self, limit_mb=512):
+        self.limit_bytes = int(limit_mb * 1024 * 1024)
+        self.total_bytes = 0
+        self._undo = deque()
+        self._redo = []
+
+    def execute(self, command):
+        """Run a command and make it the newest undo step."""
+        command.do()
+        while self._redo:
+            self.total_bytes -= self._redo.pop().nbytes
+        self._undo.append(command)
+        self.total_bytes += command.nbytes
+        self._evict()
+
+    def undo(self):
+        """Undo the newest step; return False if there is none."""
+        if not self._undo:
+            return False
+        command = self._undo.pop()
+        command.undo()
+        self._redo.append(command)
+        return True
+
+    def redo(self):
+        """Redo the last undone step; return False if there is none."""
+        if not self._redo:
+            return False
+        command = self._redo.pop()
+        command.do()
+        self._undo.append(command)
+        return True
+
+    def can_undo(self):
+        return bool(self._undo)
+
+    def can_redo(self):
+        return bool(self._redo)
+
+    def clear(self):
+        """Forget every step."""
+        self._undo.clear()
+        self._redo.clear()
+        self.total_bytes = 0
+
+    def _evict(self):
+        while self.total_bytes > self.limit_bytes and len(self._undo) > 1:
+            self.total_bytes -= self._undo.popleft().nbytes
@@ -0,0 +1,69 @@
+import zipfile
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from .lazy_import import cv2
+from .image_handler import ImageHandler
+
+class _ExportSignals(QObject):
+    """Signals emitted by an export task (QRunnable cannot emit them itself)."""
+
+    done = pyqtSignal(bool)  # success
+
+
+class _ExportTask(QRunnable):
+    """Runs one save function on a worker thread."""
+
+    def __init__(self, file_path, save):
+        super().__init__()
+        self.file_path = file_path
+        self.save = save  # Callable returning True on success
+        self.signals = _ExportSignals()
+
+    def run(self):
+        try:
+            success = self.save()
+        except (cv2.error, MemoryError, ValueError, OSError, zipfile.BadZipFile):
+            success = False
+        self.signals.done.emit(success)
+
+
+class ImageExporter(QObject):
+    """Runs full-resolution exports and project saves off the GUI thread.
+
+    The layers are handed over as Layer snapshots (Document.snapshot). They
+    share pixel buffers that are never modified in place, so taking the
+    snapshot costs no pixel copies and later edits on the GUI thread do not
+    affect an export in progress.
+    """
+
+    exportFinished = pyqtSignal(str, bool)  # file_path, success
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(1)
+        self._tasks = []
+
+    def export(self, layers, canvas_size, file_path, file_extension, output_size=None):
+        """Queue an export of the given bottom-to-top list of layer snapshots."""
+        layers = list(layers)
+        self._start(file_path, lambda: ImageHandler.save_image(
+            layers, canvas_size, file_path, file_extension, output_size))
+
+    def save_project(self, project, layers, file_path, properties=None):
+        """Queue saving layer snapshots to a core.project.ProjectFile."""
+        layers = list(layers)
+        self._start(file_path, lambda: project.save(layers, file_path, properties))
+
+    def is_running(self):
+        return bool(self._tasks)
+
+    def _start(self, file_path, save):
+        task = _ExportTask(file_path, save)
+        task.setAutoDelete(False)
+        task.signals.done.connect(lambda success: self._handle_done(task, success))
+        self._tasks.append(task)
+        self.thread_pool.start(task)
+
+    def _handle_done(self, task, success):
+        self._tasks.remove(task)
+        self.exportFinished.emit(task.file_path, success)
@@ -1,51 +1,98 @@
-import cv2
-from PyQt5.QtGui import QImage, QPixmap, QPainter
-from PyQt5.QtCore import QRectF, Qt
-from PyQt5.QtWidgets import QMessageBox
+import sys
+from PyQt5.QtGui import QImage, QPixmap
+from .lazy_import import cv2, np
+from .compositor import Compositor
+from .profiler import traced
+
+# Qt formats whose memory layout matches cv2's native BGR/BGRA byte order.
+# ARGB32 is a native-endian 0xAARRGGBB word, i.e. B, G, R, A bytes on
+# little-endian machines only.
+BGRA_FORMAT = QImage.Format_ARGB32 if sys.byteorder == 'little' else None
+BGR_FORMAT = QImage.Format_BGR888
+
 
 class ImageHandler:
     """Handles image loading, processing and saving operations."""
     
     @staticmethod
-    def load_image(file_path):
-        """Load and process an image file."""
+    @traced("load_pixels")
+    def load_pixels(file_path):
+        """Decode an image file into an HxWx3 BGR or HxWx4 BGRA uint8 array.
+
+        Colour images are returned exactly as cv2 decodes them, without a
+        separate channel-swap pass, so an import costs one copy of the
+        pixels. Does not touch Qt, so it is safe to call from worker threads.
+        """
         image = cv2.imread(file_path, cv2.IMREAD_UNCHANGED)
         if image is None:
             return None
             
-        if image.shape[2] == 4:
-            image = cv2.cvtColor(image, cv2.COLOR_BGRA2RGBA)
-        else:
-            image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-            
-        h, w, ch = image.shape
-        bytes_per_line = ch * w
-        format = QImage.Format_RGBA8888 if ch == 4 else QImage.Format_RGB888
-        q_img = QImage(image.data, w, h, bytes_per_line, format)
-        return QPixmap.fromImage(q_img)
+        if image.dtype != np.uint8:
+            # 16-bit and float images are scaled into 8 bits per channel
+            scale = 255.0 / 65535.0 if image.dtype == np.uint16 else 255.0
+            image = cv2.convertScaleAbs(image, alpha=scale)
+        if image.ndim == 2:
+            return cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        return image
+
+    @staticmethod
+    @traced("load_image")
+    def load_image(file_path):
+        """Load and process an image file."""
+        pixels = ImageHandler.load_pixels(file_path)
+        if pixels is None:
+            return None
+        return QPixmap.fromImage(ImageHandler.array_to_qimage(pixels))
+
+    @staticmethod
+    def array_to_qimage(pixels):
+        """Wrap an HxWx3 BGR or HxWx4 BGRA uint8 array in a QImage.
+
+        A C-contiguous array is read in place (other views are compacted
+        first), using its row stride as bytesPerLine, so rows need no 4-byte
+        padding. PyQt keeps a
+        reference to the array on the QImage, so the buffer cannot be freed
+        while the Python QImage is alive. C++-side copies of the QImage do
+        not hold that reference; convert or copy() before handing it to code
+        that outlives it.
+        """
+        if not pixels.flags.c_contiguous:
+            pixels = np.ascontiguousarray(pixels)  # e.g. a tile sliced out of a layer
+        h, w, channels = pixels.shape
+        if channels == 3:
+            return QImage(pixels, w, h, pixels.strides[0], BGR_FORMAT)
+        if BGRA_FORMAT is None:
+            pixels = cv2.cvtColor(pixels, cv2.COLOR_BGRA2RGBA)
+            return QImage(pixels, w, h, pixels.strides[0], QImage.Format_RGBA8888)
+        return QImage(pixels, w, h, pixels.strides[0], BGRA_FORMAT)
 
     @staticmethod
-    def save_image(canvas, file_path, file_extension):
-        """Save the image to disk."""
-        canvas_rect = canvas.canvas_rect.rect()
-        canvas_rect = QRectF(
-            canvas_rect.x() + canvas.canvas_rect.pos().x(),
-            canvas_rect.y() + canvas.canvas_rect.pos().y(),
-            canvas_rect.width(),
-            canvas_rect.height()
-        )
-
-        pixmap = QPixmap(int(canvas_rect.width()), int(canvas_rect.height()))
-        pixmap.fill(Qt.transparent)
-
-        canvas.canvas_rect.setVisible(False)
-        painter = QPainter(pixmap)
-        canvas.scene.render(
-            painter,
-            QRectF(pixmap.rect()),
-            canvas_rect
-        )
-        painter.end()
-        canvas.canvas_rect.setVisible(True)
-
-        return pixmap.save(file_path, file_extension.upper())
\ No newline at end of file
+    def image_to_array(q_img):
+        """Copy a QImage into an HxWx4 BGRA uint8 array with straight alpha."""
+        target_format = BGRA_FORMAT or QImage.Format_RGBA8888
+        q_img = q_img.convertToFormat(target_format)
+        ptr = q_img.constBits()
+        ptr.setsize(q_img.byteCount())
+        rows = np.frombuffer(ptr, dtype=np.uint8).reshape(q_img.height(), q_img.bytesPerLine())
+        pixels = rows[:, :q_img.width() * 4].reshape(q_img.height(), q_img.width(), 4)
+        if BGRA_FORMAT is None:
+            return cv2.cvtColor(pixels, cv2.COLOR_RGBA2BGRA)
+        return pixels.copy()
+
+    @staticmethod
+    @traced("save_image")
+    def save_image(layers, canvas_size, file_path, file_extension, output_size=None):
+        """Composite a layer stack at full resolution and save it to disk.
+
+        layers is a bottom-to-top list of core.document.Layer and canvas_size
+        the (width, height) of the preview canvas. Without output_size the
+        image is written at the smallest size that keeps every layer at its
+        native resolution. Only uses QImage and NumPy, so it can run on a
+        worker thread.
+        """
+        if output_size is None:
+            output_size = Compositor.native_size(
+                (layer.size for layer in layers if not layer.is_adjustment), canvas_size)
+
+        pixels = Compositor.composite(layers, canvas_size, output_size)
+        return ImageHandler.array_to_qimage(pixels).save(file_path, file_extension.upper())
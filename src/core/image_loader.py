@@ -0,0 +1,108 @@
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from .image_handler import ImageHandler
+
+class _DecodeSignals(QObject):
+    """Signals emitted by a decode task (QRunnable cannot emit them itself)."""
+
+    decoded = pyqtSignal(int, object)  # position, BGR(A) array, TiledBuffer or None
+
+
+class _DecodeTask(QRunnable):
+    """Decodes a single file on a worker thread."""
+
+    def __init__(self, position, file_path, loader):
+        super().__init__()
+        self.position = position
+        self.file_path = file_path
+        self.loader = loader
+        self.signals = _DecodeSignals()
+
+    def run(self):
+        if self.loader.is_cancelled():
+            return
+        pixels = ImageHandler.load_pixels(self.file_path)
+        if pixels is not None and self.loader.tile_cache is not None:
+            pixels = self.loader.tile_cache.spill(pixels)
+        self.signals.decoded.emit(self.position, pixels)
+
+
+class ImageLoader(QObject):
+    """Decodes a batch of image files in parallel on a thread pool.
+
+    Images are decoded off the GUI thread (cv2 releases the GIL) and handed
+    back as BGR(A) arrays in selection order, as soon as each one and all of its
+    predecessors are ready. With a tile_cache the pixels are spilled to
+    disk on the worker too, and handed back as TiledBuffers.
+    """
+
+    imageLoaded = pyqtSignal(str, object)  # file_path, BGR(A) array or TiledBuffer
+    loadFailed = pyqtSignal(str)  # file_path
+    progressChanged = pyqtSignal(int, int)  # done, total
+    finished = pyqtSignal()
+
+    def __init__(self, parent=None, tile_cache=None):
+        super().__init__(parent)
+        self.tile_cache = tile_cache
+        self.thread_pool = QThreadPool(self)
+        self.file_paths = []
+        self._tasks = []
+        self._pending = {}
+        self._next_position = 0
+        self._cancelled = False
+
+    def load(self, file_paths):
+        """Start decoding the given files."""
+        self.file_paths = list(file_paths)
+        self._tasks = []
+        self._pending.clear()
+        self._next_position = 0
+        self._cancelled = False
+
+        if not self.file_paths:
+            self.finished.emit()
+            return
+
+        for position, file_path in enumerate(self.file_paths):
+            task = _DecodeTask(position, file_path, self)
+            task.setAutoDelete(False)
+            task.signals.decoded.connect(self._handle_decoded)
+            self._tasks.append(task)
+            self.thread_pool.start(task)
+
+    def cancel(self):
+        """Stop the batch; files that are not decoded yet are skipped."""
+        if self._cancelled or not self.is_running():
+            return
+        self._cancelled = True
+        self.thread_pool.clear()
+        self._pending.clear()
+        self.finished.emit()
+
+    def is_cancelled(self):
+        return self._cancelled
+
+    def is_running(self):
+        return self._next_position < len(self.file_paths) and not self._cancelled
+
+    def _handle_decoded(self, position, image):
+        """Buffer a decoded image and release every result that is now in order."""
+        if self._cancelled:
+            return
+        self._pending[position] = image
+
+        while self._next_position in self._pending:
+            image = self._pending.pop(self._next_position)
+            file_path = self.file_paths[self._next_position]
+            self._next_position += 1
+
+            if image is None:
+                self.loadFailed.emit(file_path)
+            else:
+                self.imageLoaded.emit(file_path, image)
+            self.progressChanged.emit(self._next_position, len(self.file_paths))
+            if self._cancelled:
+                return
+
+        if self._next_position == len(self.file_paths):
+            self._tasks = []
+            self.finished.emit()
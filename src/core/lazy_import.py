@@ -0,0 +1,22 @@
+import importlib
+
+class LazyModule:
+    """Stand-in for a module that is only imported on first attribute access.
+
+    cv2 and numpy take most of the application's import time but are not
+    needed until the first image is opened, so core modules reach them
+    through these proxies. Each attribute is looked up once and then kept
+    on the proxy, so later accesses cost a plain attribute lookup.
+    """
+
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, attr):
+        value = getattr(importlib.import_module(self._name), attr)
+        setattr(self, attr, value)
+        return value
+
+
+cv2 = LazyModule("cv2")
+np = LazyModule("numpy")
@@ -0,0 +1,135 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+class _NullSpan:
+    """Context manager used while profiling is off."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    def __init__(self, profiler, name, args):
+        self.profiler = profiler
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.record(self.name, self.start, time.perf_counter(), self.args)
+        return False
+
+
+class Profiler:
+    """Records timed spans and counters, exportable as a Chrome trace.
+
+    Off by default; while off, span() returns a shared no-op context and
+    traced functions only pay one attribute check. Spans may be recorded
+    from any thread. Only the newest max_events events are kept, so a long
+    session cannot grow without bound. Per-name totals (count, total, last
+    and max duration) are kept separately for live display.
+    """
+
+    def __init__(self, max_events=1_000_000):
+        self.enabled = False
+        self._events = deque(maxlen=max_events)
+        self._stats = {}  # name -> [count, total s, last s, max s]
+        self._threads = {}  # thread id -> thread name
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def span(self, name, **args):
+        """Context manager timing the enclosed block as a span called name."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, args)
+
+    def record(self, name, start, end, args=None):
+        """Record a span from perf_counter start and end times."""
+        duration = end - start
+        thread = threading.current_thread()
+        event = {"name": name, "ph": "X", "pid": os.getpid(), "tid": thread.ident,
+                 "ts": (start - self._origin) * 1e6, "dur": duration * 1e6}
+        if args:
+            event["args"] = args
+        with self._lock:
+            self._events.append(event)
+            self._threads.setdefault(thread.ident, thread.name)
+            stats = self._stats.setdefault(name, [0, 0.0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += duration
+            stats[2] = duration
+            stats[3] = max(stats[3], duration)
+
+    def counter(self, name, **values):
+        """Record counter values (shown as a graph in the trace viewer)."""
+        if not self.enabled:
+            return
+        event = {"name": name, "ph": "C", "pid": os.getpid(), "tid": threading.get_ident(),
+                 "ts": (time.perf_counter() - self._origin) * 1e6, "args": values}
+        with self._lock:
+            self._events.append(event)
+
+    def stats(self, name):
+        """Return {'count', 'total_ms', 'last_ms', 'max_ms', 'mean_ms'} for a span name."""
+        with self._lock:
+            count, total, last, longest = self._stats.get(name, (0, 0.0, 0.0, 0.0))
+        return {"count": count, "total_ms": total * 1000, "last_ms": last * 1000,
+                "max_ms": longest * 1000, "mean_ms": total * 1000 / count if count else 0.0}
+
+    def summary(self):
+        """Return stats() for every span name, slowest total first."""
+        with self._lock:
+            names = list(self._stats)
+        return sorted(((name, self.stats(name)) for name in names),
+                      key=lambda item: item[1]["total_ms"], reverse=True)
+
+    def export_chrome_trace(self, path):
+        """Write the recorded events as Chrome trace JSON (chrome://tracing, Perfetto)."""
+        with self._lock:
+            events = list(self._events)
+            threads = dict(self._threads)
+        metadata = [{"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid,
+                     "args": {"name": name}} for tid, name in threads.items()]
+        with open(path, "w") as trace_file:
+            json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, trace_file)
+
+    def clear(self):
+        with self._lock:
+            self._events.clear()
+            self._stats.clear()
+
+
+profiler = Profiler()  # Shared by the whole application
+
+
+def traced(name):
+    """Decorator recording every call of a function as a span called name."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.record(name, start, time.perf_counter())
+        return wrapper
+    return decorator
@@ -0,0 +1,403 @@
+import json
+import os
+import struct
+import threading
+import weakref
+import zipfile
+from collections import OrderedDict
+from .adjustments import AdjustmentLayer
+from .blending import DEFAULT_BLEND_MODE
+from .lazy_import import cv2, np
+from .document import Layer
+from .profiler import traced
+from .tiles import TILE_SIZE, TiledArray, tile_grid, tile_rect
+
+PROJECT_EXTENSION = "unif"
+FORMAT_NAME = "unificator-project"
+FORMAT_VERSION = 1
+THUMBNAIL_SIZE = 64
+
+# Zip end of central directory records, see _complete_length
+_END_RECORD = struct.Struct("<4s4H2LH")
+_END_SIGNATURE = b"PK\x05\x06"
+_ZIP64_LOCATOR = struct.Struct("<4sLQL")
+_ZIP64_END_RECORD = struct.Struct("<4sQ2H2L4Q")
+_SCAN_CHUNK = 1 << 20
+
+
+class ProjectBuffer(TiledArray):
+    """A layer pyramid level stored in a project file, read tile by tile."""
+
+    def __init__(self, archive, prefix, shape):
+        super().__init__(tuple(shape))
+        self.archive = archive
+        self.prefix = prefix
+        archive.buffers.add(self)
+
+    def tile(self, col, row):
+        """Return one tile, clipped to the image bounds."""
+        height, width, channels = self.shape
+        _, _, w, h = tile_rect(col, row, width, height)
+        return self.archive.tile(f"{self.prefix}/{col}_{row}", (h, w, channels))
+
+
+class _ArchiveReader:
+    """Shared read handle on a project file with a small LRU of decoded tiles.
+
+    The ProjectBuffers reading through it register in buffers, so saving
+    over the file knows which tiles are still in use. recovered is set
+    when the file ends with a save that was cut short, see _open_archive.
+    """
+
+    def __init__(self, path, budget_mb=64):
+        self.path = path
+        self.buffers = weakref.WeakSet()
+        self.budget_bytes = int(budget_mb * 1024 * 1024)
+        self._resident = OrderedDict()  # entry name -> tile array, LRU order
+        self._resident_bytes = 0
+        self._lock = threading.Lock()
+        self.zip_file, self._file = _open_archive(path)
+        self.recovered = self._file is not None
+
+    def names(self):
+        return self.zip_file.namelist()
+
+    def read(self, name):
+        with self._lock:
+            return self.zip_file.read(name)
+
+    def tile(self, name, shape):
+        with self._lock:
+            tile = self._resident.get(name)
+            if tile is not None:
+                self._resident.move_to_end(name)
+                return tile
+            tile = np.frombuffer(self.zip_file.read(name), dtype=np.uint8).reshape(shape)
+            self._resident[name] = tile  # frombuffer arrays are read-only
+            self._resident_bytes += tile.nbytes
+            while self._resident_bytes > self.budget_bytes and len(self._resident) > 1:
+                _, evicted = self._resident.popitem(last=False)
+                self._resident_bytes -= evicted.nbytes
+            return tile
+
+    def reopen(self, replacement=None):
+        """Read the file again, e.g. after appending to it.
+
+        With replacement set, that file is first renamed over this one.
+        Both happen under the lock, so no tile is read in between, and the
+        file is closed before it is replaced, which Windows requires.
+        Entries keep their names, so the decoded tiles stay valid.
+        """
+        with self._lock:
+            self.close()
+            if replacement is not None:
+                os.replace(replacement, self.path)
+            self.zip_file, self._file = _open_archive(self.path)
+            self.recovered = self._file is not None
+
+    def close(self):
+        self.zip_file.close()
+        if self._file is not None:
+            self._file.close()
+
+
+class _FilePrefix:
+    """Read-only view of the first size bytes of a binary file, for zipfile."""
+
+    def __init__(self, file, size):
+        self._file = file
+        self._size = size
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._file.tell()
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_END:
+            offset, whence = self._size + offset, os.SEEK_SET
+        return self._file.seek(offset, whence)
+
+    def read(self, size=-1):
+        remaining = max(0, self._size - self._file.tell())
+        return self._file.read(remaining if size is None or size < 0 else min(size, remaining))
+
+    def close(self):
+        self._file.close()
+
+
+def _open_archive(path):
+    """Open a project file for reading; return (zip file, file view or None).
+
+    Saves append after the end of the previous archive, so a save cut
+    short leaves a complete archive followed by a partial one. zipfile
+    finds no end record then, and the file is read up to the last
+    complete archive instead, through a _FilePrefix returned with it.
+    """
+    try:
+        return zipfile.ZipFile(path, "r"), None
+    except zipfile.BadZipFile:
+        file = open(path, "rb")
+        size = _complete_length(file)
+        if size is None:
+            file.close()
+            raise
+        view = _FilePrefix(file, size)
+        return zipfile.ZipFile(view, "r"), view
+
+
+def _complete_length(file):
+    """Length of the last complete zip archive at the start of file, or None."""
+    end = file.seek(0, os.SEEK_END)
+    while end > 0:
+        start = max(0, end - _SCAN_CHUNK)
+        file.seek(start)
+        data = file.read(end - start + len(_END_SIGNATURE) - 1)  # Signatures across chunks
+        index = len(data)
+        while (index := data.rfind(_END_SIGNATURE, 0, index)) >= 0:
+            length = _archive_length(file, start + index)
+            if length is not None:
+                return length
+        end = start
+    return None
+
+
+def _archive_length(file, position):
+    """Length of the archive whose end record is at position, or None if there is none."""
+    file.seek(position)
+    record = file.read(_END_RECORD.size)
+    if len(record) < _END_RECORD.size:
+        return None
+    _, _, _, _, _, directory_size, directory_offset, comment_size = _END_RECORD.unpack(record)
+    directory_end = position
+    if position >= _ZIP64_LOCATOR.size:
+        file.seek(position - _ZIP64_LOCATOR.size)
+        signature, _, record64_offset, _ = _ZIP64_LOCATOR.unpack(file.read(_ZIP64_LOCATOR.size))
+        if signature == b"PK\x06\x07":
+            file.seek(record64_offset)
+            record64 = file.read(_ZIP64_END_RECORD.size)
+            if len(record64) < _ZIP64_END_RECORD.size or record64[:4] != b"PK\x06\x06":
+                return None
+            directory_size, directory_offset = _ZIP64_END_RECORD.unpack(record64)[-2:]
+            directory_end = record64_offset
+    # The central directory must end right where the end records start
+    if directory_offset + directory_size != directory_end:
+        return None
+    if directory_size:
+        file.seek(directory_offset)
+        if file.read(4) != b"PK\x01\x02":
+            return None
+    return position + _END_RECORD.size + comment_size
+
+
+class ProjectFile:
+    """A layered project saved as a zip of manifests, thumbnails and tiles.
+
+    Every layer is stored with its whole mipmap pyramid, each level as
+    deflated raw tiles (one zip entry per tile, in cv2 channel order) under
+    layers/<id>/<revision>/<level>/. A manifest per save records the layer
+    stack and where each layer's current tiles and thumbnail are; the one
+    with the highest revision wins. Adjustment layers have no tiles and are
+    stored in the manifest as their kind and parameters.
+
+    load() reads only the latest manifest and the thumbnails. Layer pixels
+    come back as ProjectBuffers that read tiles when they are first drawn,
+    so opening costs the same however large the layers are. save() to the
+    file that was loaded or last saved appends only the layers whose pixels
+    changed since, plus a new manifest, after the end of the file: the
+    previous revision stays readable until the new one is complete. The
+    whole file is rewritten, to a temporary name then renamed over it, when
+    saving elsewhere or once stale revisions take up more space than the
+    live ones; tiles of unchanged layers are copied over as they are, and so
+    are tiles loaded layers still read (e.g. from the undo history).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.properties = {}  # Extra manifest values, e.g. canvas_size
+        self._reader = None
+        self._revision = 0
+        self._stored = {}  # layer id -> (pixel version, manifest entry)
+
+    def load(self):
+        """Read the manifest and thumbnails; return (layers, thumbnails).
+
+        layers are bottom to top. thumbnails maps layer ids to BGR(A)
+        arrays of at most THUMBNAIL_SIZE pixels a side.
+        """
+        reader = _ArchiveReader(self.path)
+        manifest = self._latest_manifest(reader)
+        layers, thumbnails = self._load_entries(reader, manifest["layers"])
+        self._reader = reader
+        self._revision = manifest["revision"]
+        self._stored = {layer.id: (layer.version, entry)
+                        for layer, entry in zip(layers, manifest["layers"])}
+        self.properties = manifest.get("properties", {})
+        return layers, thumbnails
+
+    def stored_layers(self):
+        """{layer id: (pixel version, manifest entry)} of the layers last loaded or saved.
+
+        load_entries() reads the layers back from the entries, for as long
+        as the file keeps their tiles: until they change and the file is
+        saved again.
+        """
+        return dict(self._stored)
+
+    def load_entries(self, entries):
+        """Load layers from manifest entries of stored_layers(); return (layers, thumbnails)."""
+        return self._load_entries(_ArchiveReader(self.path), entries)
+
+    @staticmethod
+    def _load_entries(reader, entries):
+        layers, thumbnails = [], {}
+        for entry in entries:
+            if "adjustment" in entry:
+                layer = AdjustmentLayer(entry["adjustment"], entry["params"], name=entry["name"],
+                                        opacity=entry["opacity"], visible=entry["visible"],
+                                        layer_id=entry["id"])
+                layers.append(layer)
+                continue
+            levels = [ProjectBuffer(reader, prefix, shape)
+                      for prefix, shape in zip(entry["levels"], entry["level_shapes"])]
+            layer = Layer.from_levels(
+                levels, name=entry["name"], opacity=entry["opacity"],
+                offset=tuple(entry["offset"]), visible=entry["visible"], layer_id=entry["id"],
+                blend_mode=entry.get("blend_mode", DEFAULT_BLEND_MODE))
+            layers.append(layer)
+            thumbnails[layer.id] = cv2.imdecode(
+                np.frombuffer(reader.read(entry["thumbnail"]), dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+        return layers, thumbnails
+
+    @traced("save_project")
+    def save(self, layers, path=None, properties=None):
+        """Save bottom-to-top layer snapshots, rewriting only changed layers."""
+        path = path or self.path
+        if properties is not None:
+            self.properties = properties
+        reader = self._reader
+        same_file = reader is not None and path == self.path
+        if same_file and not reader.recovered and self._stale_bytes() <= os.path.getsize(path) / 2:
+            with zipfile.ZipFile(path, "a", compression=zipfile.ZIP_DEFLATED, compresslevel=1) as archive:
+                # zipfile would write over the central directory; start past
+                # it so it stays valid until the new one is written
+                archive.start_dir = archive.fp.seek(0, os.SEEK_END)
+                self._write(archive, layers)
+            reader.reopen()
+            return True
+
+        temp_path = f"{path}.tmp"
+        with zipfile.ZipFile(temp_path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1) as archive:
+            self._write(archive, layers, reader)
+            if same_file:
+                # Loaded layers keep reading their tiles from the new file
+                self._copy(archive, reader, {buffer.prefix for buffer in list(reader.buffers)})
+        if same_file:
+            reader.reopen(temp_path)
+            return True
+
+        os.replace(temp_path, path)
+        if reader is not None and not reader.buffers:
+            reader.close()  # Otherwise it closes with the last layer reading through it
+        self.path = path
+        self._reader = _ArchiveReader(path)
+        return True
+
+    def _write(self, archive, layers, reader=None):
+        """Write the layers and a new manifest, copying unchanged layers from reader if set."""
+        revision = self._revision + 1
+        stored = {}
+        entries, reused = [], set()
+        for layer in layers:
+            previous = self._stored.get(layer.id)
+            if previous is not None and previous[0] == layer.version:
+                entry = dict(previous[1])
+                reused.update(entry.get("levels", ()))
+                if "thumbnail" in entry:
+                    reused.add(entry["thumbnail"])
+            elif layer.is_adjustment:
+                # Adjustment layers are just their parameters
+                entry = {"id": layer.id, "adjustment": layer.kind, "params": layer.params}
+            else:
+                entry = self._write_layer(archive, layer, revision)
+            entry.update(name=layer.name, opacity=layer.opacity,
+                         offset=list(layer.offset), visible=layer.visible,
+                         blend_mode=layer.blend_mode)
+            entries.append(entry)
+            stored[layer.id] = (layer.version, entry)
+        if reader is not None:
+            self._copy(archive, reader, reused)
+
+        manifest = {
+            "format": FORMAT_NAME,
+            "version": FORMAT_VERSION,
+            "revision": revision,
+            "tile_size": TILE_SIZE,
+            "properties": self.properties,
+            "layers": entries,
+        }
+        archive.writestr(f"manifests/{revision:06d}.json", json.dumps(manifest, indent=1))
+        self._revision = revision
+        self._stored = stored
+
+    @staticmethod
+    def _copy(archive, reader, names):
+        """Copy the entries of reader named, or under a prefix named, that archive lacks."""
+        written = set(archive.namelist())
+        for name in reader.names():
+            if name not in written and (name in names or name.rsplit("/", 1)[0] in names):
+                archive.writestr(name, reader.read(name),
+                                 compress_type=reader.zip_file.getinfo(name).compress_type)
+
+    def _write_layer(self, archive, layer, revision):
+        """Write a layer's pyramid tiles and thumbnail; return its manifest entry."""
+        base = f"layers/{layer.id}/{revision}"
+        prefixes, shapes = [], []
+        for level in range(layer.level_count()):
+            width, height = layer.level_size(level)
+            prefix = f"{base}/{level}"
+            cols, rows = tile_grid(width, height)
+            for row in range(rows):
+                for col in range(cols):
+                    tile = layer.region(*tile_rect(col, row, width, height), level=level)
+                    archive.writestr(f"{prefix}/{col}_{row}", np.ascontiguousarray(tile).tobytes())
+            prefixes.append(prefix)
+            shapes.append([height, width, layer.channels])
+
+        thumbnail_name = f"thumbnails/{layer.id}/{revision}.png"
+        archive.writestr(thumbnail_name, self._thumbnail_png(layer), compress_type=zipfile.ZIP_STORED)
+        return {"id": layer.id, "levels": prefixes, "level_shapes": shapes,
+                "thumbnail": thumbnail_name}
+
+    @staticmethod
+    def _thumbnail_png(layer):
+        """PNG of the layer scaled from its smallest pyramid level to THUMBNAIL_SIZE."""
+        level = layer.level_count() - 1
+        while level > 0 and max(layer.level_size(level)) < THUMBNAIL_SIZE:
+            level -= 1
+        width, height = layer.level_size(level)
+        fit = min(1.0, THUMBNAIL_SIZE / width, THUMBNAIL_SIZE / height)
+        pixels = cv2.resize(np.ascontiguousarray(layer.region(0, 0, width, height, level=level)),
+                            (max(1, round(width * fit)), max(1, round(height * fit))),
+                            interpolation=cv2.INTER_AREA)
+        return cv2.imencode(".png", pixels)[1].tobytes()
+
+    @staticmethod
+    def _latest_manifest(reader):
+        names = [name for name in reader.names() if name.startswith("manifests/")]
+        if not names:
+            raise ValueError("Not a project file: no manifest")
+        manifest = json.loads(reader.read(max(names)))
+        if manifest.get("format") != FORMAT_NAME or manifest.get("version", 0) > FORMAT_VERSION:
+            raise ValueError("Unsupported project format")
+        return manifest
+
+    def _stale_bytes(self):
+        """Bytes of the file neither the last saved layers nor loaded ones use."""
+        used = {prefix for _, entry in self._stored.values() for prefix in entry.get("levels", ())}
+        used.update(entry["thumbnail"] for _, entry in self._stored.values() if "thumbnail" in entry)
+        used.update(buffer.prefix for buffer in list(self._reader.buffers))
+        live = sum(info.compress_size for info in self._reader.zip_file.infolist()
+                   if info.filename in used or info.filename.rsplit("/", 1)[0] in used)
+        return os.path.getsize(self.path) - live
@@ -0,0 +1,108 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt5.QtGui import QImage
+from .lazy_import import cv2
+from .image_handler import ImageHandler
+from .profiler import traced
+
+class _ThumbnailSignals(QObject):
+    """Signals emitted by a thumbnail task (QRunnable cannot emit them itself)."""
+
+    done = pyqtSignal(object, int, QImage)  # layer, pixel version, thumbnail
+
+
+class _ThumbnailTask(QRunnable):
+    """Builds one layer thumbnail on a worker thread."""
+
+    def __init__(self, layer, version, thumbnailer):
+        super().__init__()
+        self.layer = layer
+        self.version = version
+        self.thumbnailer = thumbnailer
+        self.signals = _ThumbnailSignals()
+
+    def run(self):
+        self.signals.done.emit(self.layer, self.version, self.thumbnailer.generate(self.layer))
+
+
+class Thumbnailer(QObject):
+    """Generates layer thumbnails on a thread pool.
+
+    Thumbnails are scaled down from the smallest pyramid level that is still
+    at least twice the thumbnail size, never from the full-resolution
+    pixels. Results are cached by a hash of the pixel content, so a layer
+    with the same pixels as an earlier one (the same file imported again)
+    only costs the hash.
+    """
+
+    thumbnailReady = pyqtSignal(object, int, QImage)  # layer, pixel version, thumbnail
+
+    def __init__(self, size=40, cache_entries=1024, parent=None):
+        super().__init__(parent)
+        self.size = size
+        self.cache_entries = cache_entries
+        self.thread_pool = QThreadPool(self)
+        self._cache = OrderedDict()  # content digest -> QImage, LRU order
+        self._cache_lock = threading.Lock()
+        self._pending = {}  # (layer id, version) -> task
+
+    def request(self, layer):
+        """Queue a thumbnail for the layer's current pixels."""
+        key = (layer.id, layer.version)
+        if key in self._pending:
+            return
+        task = _ThumbnailTask(layer, layer.version, self)
+        task.setAutoDelete(False)
+        task.signals.done.connect(self._handle_done)
+        self._pending[key] = task
+        self.thread_pool.start(task)
+
+    @traced("thumbnail")
+    def generate(self, layer):
+        """Return the thumbnail of a layer, from the cache when possible."""
+        digest = self.content_digest(layer)
+        with self._cache_lock:
+            image = self._cache.get(digest)
+            if image is not None:
+                self._cache.move_to_end(digest)
+                return image
+
+        image = self._scale_down(layer)
+        with self._cache_lock:
+            self._cache[digest] = image
+            while len(self._cache) > self.cache_entries:
+                self._cache.popitem(last=False)
+        return image
+
+    @staticmethod
+    def content_digest(layer, band_height=512):
+        """Hash a layer's full-resolution pixels, reading them in bands."""
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(repr((layer.width, layer.height, layer.channels)).encode())
+        for y in range(0, layer.height, band_height):
+            band = layer.region(0, y, layer.width, min(band_height, layer.height - y))
+            hasher.update(band if band.flags.c_contiguous else band.copy())
+        return hasher.digest()
+
+    def _scale_down(self, layer):
+        """Resize the closest sufficient pyramid level to the thumbnail size."""
+        level = 0
+        while level + 1 < layer.level_count():
+            next_w, next_h = layer.level_size(level + 1)
+            if max(next_w, next_h) < self.size * 2:
+                break
+            level += 1
+
+        width, height = layer.level_size(level)
+        fit = min(self.size / width, self.size / height)
+        pixels = cv2.resize(layer.region(0, 0, width, height, level=level),
+                            (max(1, round(width * fit)), max(1, round(height * fit))),
+                            interpolation=cv2.INTER_AREA)
+        # Own the pixels: the array is freed once this returns
+        return ImageHandler.array_to_qimage(pixels).copy()
+
+    def _handle_done(self, layer, version, image):
+        self._pending.pop((layer.id, version), None)
+        self.thumbnailReady.emit(layer, version, image)
@@ -0,0 +1,118 @@
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+import weakref
+from collections import OrderedDict
+from .lazy_import import np
+from .tiles import TILE_SIZE, TiledArray, tile_grid, tile_rect
+
+class TiledBuffer(TiledArray):
+    """Read-only pixel buffer whose data lives in a TileCache tile file.
+
+    Quacks like the (height, width, channels) arrays it replaces through
+    shape and region(). The tile file is removed once the buffer and every
+    layer snapshot sharing it have been garbage collected.
+    """
+
+    def __init__(self, cache, key, shape):
+        super().__init__(shape)
+        self.cache = cache
+        self.key = key
+        self._finalizer = weakref.finalize(self, cache.discard, key)
+
+    def tile(self, col, row):
+        """Return one tile, clipped to the image bounds."""
+        return self.cache.tile(self.key, col, row)
+
+
+class TileCache:
+    """Spills layer pixels into memory-mapped tile files on disk.
+
+    Each spilled buffer is written tile-major to its own file under
+    cache_dir, so a tile is one contiguous run of bytes. Tiles that were
+    read recently are kept in memory up to budget_mb megabytes and evicted
+    least-recently-used first; everything else is paged in from the file
+    on demand. Safe to use from several threads.
+    """
+
+    def __init__(self, budget_mb=256, cache_dir=None):
+        self.budget_bytes = int(budget_mb * 1024 * 1024)
+        self._owns_dir = cache_dir is None
+        self.cache_dir = cache_dir or tempfile.mkdtemp(prefix="unificator-tiles-")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._files = {}  # key -> (read-only memmap of (rows, cols, T, T, C), (width, height))
+        self._resident = OrderedDict()  # (key, col, row) -> tile array, LRU order
+        self.resident_bytes = 0
+        self._lock = threading.RLock()
+
+    def spill(self, pixels):
+        """Write an HxWxC uint8 array to a tile file and return its TiledBuffer."""
+        height, width, channels = pixels.shape
+        cols, rows = tile_grid(width, height)
+        key = uuid.uuid4().hex
+        path = self._path(key)
+
+        tiles = np.memmap(path, dtype=np.uint8, mode="w+",
+                          shape=(rows, cols, TILE_SIZE, TILE_SIZE, channels))
+        for row in range(rows):
+            for col in range(cols):
+                x, y, w, h = tile_rect(col, row, width, height)
+                tiles[row, col, :h, :w] = pixels[y:y + h, x:x + w]
+        tiles.flush()
+        del tiles
+
+        with self._lock:
+            self._files[key] = (
+                np.memmap(path, dtype=np.uint8, mode="r",
+                          shape=(rows, cols, TILE_SIZE, TILE_SIZE, channels)),
+                (width, height)
+            )
+        return TiledBuffer(self, key, (height, width, channels))
+
+    def tile(self, key, col, row):
+        """Return a read-only tile of a spilled buffer, kept resident under the budget."""
+        with self._lock:
+            cache_key = (key, col, row)
+            tile = self._resident.get(cache_key)
+            if tile is not None:
+                self._resident.move_to_end(cache_key)
+                return tile
+
+            tiles, (width, height) = self._files[key]
+            _, _, w, h = tile_rect(col, row, width, height)
+            tile = np.array(tiles[row, col, :h, :w])
+            tile.flags.writeable = False  # Shared by every reader of the tile
+            self._resident[cache_key] = tile
+            self.resident_bytes += tile.nbytes
+            self._evict()
+            return tile
+
+    def discard(self, key):
+        """Forget a spilled buffer and delete its tile file."""
+        with self._lock:
+            entry = self._files.pop(key, None)
+            for cache_key in [k for k in self._resident if k[0] == key]:
+                self.resident_bytes -= self._resident.pop(cache_key).nbytes
+        if entry is not None:
+            del entry
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def close(self):
+        """Drop every spilled buffer and remove the cache directory if we created it."""
+        for key in list(self._files):
+            self.discard(key)
+        if self._owns_dir:
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def _evict(self):
+        while self.resident_bytes > self.budget_bytes and len(self._resident) > 1:
+            _, tile = self._resident.popitem(last=False)
+            self.resident_bytes -= tile.nbytes
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.tiles")
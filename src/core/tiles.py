@@ -0,0 +1,134 @@
+import math
+from .lazy_import import cv2, np
+
+TILE_SIZE = 256  # Edge length of the square tiles used for caching and paging
+
+
+def tile_grid(width, height, tile_size=TILE_SIZE):
+    """Return (columns, rows) of tiles needed to cover an image."""
+    return math.ceil(width / tile_size), math.ceil(height / tile_size)
+
+
+def tile_rect(col, row, width, height, tile_size=TILE_SIZE):
+    """Return (x, y, w, h) of a tile, clipped to the image bounds."""
+    x = col * tile_size
+    y = row * tile_size
+    return x, y, min(tile_size, width - x), min(tile_size, height - y)
+
+
+def level_count(width, height, tile_size=TILE_SIZE):
+    """Number of halving levels until an image fits in a single tile."""
+    longest = max(width, height)
+    if longest <= tile_size:
+        return 1
+    return math.ceil(math.log2(longest / tile_size)) + 1
+
+
+class TiledArray:
+    """Read-only (height, width, channels) uint8 image stored as tiles.
+
+    Subclasses provide tile(); region() and to_array() assemble arbitrary
+    rectangles from the tiles they overlap, so a tiled array can stand in
+    for an ndarray wherever pixels are read through read_region.
+    """
+
+    def __init__(self, shape):
+        self.shape = shape
+
+    @property
+    def nbytes(self):
+        height, width, channels = self.shape
+        return height * width * channels
+
+    def tile(self, col, row):
+        """Return one tile, clipped to the image bounds."""
+        raise NotImplementedError
+
+    def region(self, x, y, w, h):
+        """Assemble an arbitrary rectangle from the tiles it overlaps."""
+        height, width, channels = self.shape
+        x, y = max(0, x), max(0, y)
+        w, h = min(w, width - x), min(h, height - y)
+        result = np.empty((max(h, 0), max(w, 0), channels), dtype=np.uint8)
+        if w <= 0 or h <= 0:
+            return result
+
+        for row in range(y // TILE_SIZE, (y + h - 1) // TILE_SIZE + 1):
+            for col in range(x // TILE_SIZE, (x + w - 1) // TILE_SIZE + 1):
+                tile = self.tile(col, row)
+                tile_x, tile_y = col * TILE_SIZE, row * TILE_SIZE
+                left, top = max(x, tile_x), max(y, tile_y)
+                right = min(x + w, tile_x + tile.shape[1])
+                bottom = min(y + h, tile_y + tile.shape[0])
+                result[top - y:bottom - y, left - x:right - x] = \
+                    tile[top - tile_y:bottom - tile_y, left - tile_x:right - tile_x]
+        return result
+
+    def to_array(self):
+        """Assemble the whole image into a new in-memory array."""
+        return self.region(0, 0, self.shape[1], self.shape[0])
+
+
+class PatchedArray(TiledArray):
+    """An image with some tiles replaced, sharing all others with a base image.
+
+    Overwriting a few tiles of a layer makes one of these instead of a
+    copy of the whole buffer: only the new tiles are held and the rest
+    are read from the base (an ndarray or a TiledArray), which is never
+    modified. Patching a PatchedArray again starts from the same base, so
+    a run of edits never nests.
+    """
+
+    def __init__(self, base, tiles):
+        super().__init__(base.shape)
+        self.base = base
+        self.tiles = tiles  # (col, row) -> tile, clipped to the image bounds
+
+    @classmethod
+    def patch(cls, buffer, tiles):
+        """buffer with the tiles of a (col, row) -> tile dict replaced."""
+        if isinstance(buffer, PatchedArray):
+            return cls(buffer.base, {**buffer.tiles, **tiles})
+        return cls(buffer, dict(tiles))
+
+    def tile(self, col, row):
+        tile = self.tiles.get((col, row))
+        if tile is None:
+            height, width = self.shape[:2]
+            tile = read_region(self.base, *tile_rect(col, row, width, height))
+        return tile
+
+
+def read_region(buffer, x, y, w, h):
+    """Read a region from an ndarray (as a view) or a TiledArray."""
+    if isinstance(buffer, np.ndarray):
+        return buffer[y:y + h, x:x + w]
+    return buffer.region(x, y, w, h)
+
+
+def halve_region(buffer, x, y, w, h):
+    """The (x, y, w, h) rectangle of an image halved with area averaging.
+
+    Each output pixel is the mean of the 2x2 source pixels under it (an
+    odd last row or column is left out), so a rectangle halved on its
+    own matches the same rectangle of the whole halved image.
+    """
+    height, width, channels = buffer.shape
+    source = read_region(buffer, 2 * x, 2 * y, min(2 * w, width - 2 * x), min(2 * h, height - 2 * y))
+    return cv2.resize(source, (w, h), interpolation=cv2.INTER_AREA).reshape(h, w, channels)
+
+
+def downsample_half(buffer, band_height=TILE_SIZE * 2):
+    """Halve an image with area averaging, reading it in horizontal bands.
+
+    Reading band by band keeps spilled buffers from being materialised in
+    full just to build the next pyramid level.
+    """
+    height, width, channels = buffer.shape
+    out_w, out_h = max(1, width // 2), max(1, height // 2)
+    result = np.empty((out_h, out_w, channels), dtype=np.uint8)
+
+    for out_y in range(0, out_h, band_height // 2):
+        band_h = min(band_height // 2, out_h - out_y)
+        result[out_y:out_y + band_h] = halve_region(buffer, 0, out_y, out_w, band_h)
+    return result
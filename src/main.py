@@ -1,12 +1,86 @@
+import time
+_START = time.perf_counter()  # Before the heavy imports, for --startup-timing
+
+import os
 import sys
 from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QObject, QEvent, QTimer
 from main_window import MainWindow
+from core.profiler import profiler
+
+DEFAULT_TRACE_PATH = 'unificator-trace.json'
+
+class StartupTimer(QObject):
+    """Reports time-to-first-paint for `python main.py --startup-timing`.
+
+    Watches for the first paint event of the main window or any of its
+    children, prints how long each startup phase took since main.py began
+    executing, then quits.
+    """
+
+    def __init__(self, app, marks):
+        super().__init__(app)
+        self.app = app
+        self.marks = marks  # [(phase name, perf_counter)]
+        app.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            self.app.removeEventFilter(self)
+            self.marks.append(("first paint", time.perf_counter()))
+            previous = _START
+            for name, mark in self.marks:
+                print(f"{name:>16}: {(mark - previous) * 1000:7.1f} ms")
+                previous = mark
+            print(f"{'time to paint':>16}: {(previous - _START) * 1000:7.1f} ms")
+            QTimer.singleShot(0, self.app.quit)
+        return False
+
+def profile_trace_path(argv):
+    """Trace output path if profiling was requested, else None.
+
+    `--profile[=trace.json]` on the command line or UNIFICATOR_PROFILE=1
+    (or =trace.json) in the environment turn profiling on.
+    """
+    for arg in argv:
+        if arg == '--profile':
+            return DEFAULT_TRACE_PATH
+        if arg.startswith('--profile='):
+            return arg.split('=', 1)[1]
+    value = os.environ.get('UNIFICATOR_PROFILE')
+    if value:
+        return DEFAULT_TRACE_PATH if value == '1' else value
+    return None
+
+def write_profile(trace_path):
+    """Print per-span totals and write the Chrome trace."""
+    for name, stats in profiler.summary():
+        print(f"{name:>16}: {stats['count']:6d} calls, {stats['total_ms']:9.1f} ms total, "
+              f"{stats['mean_ms']:7.2f} ms mean, {stats['max_ms']:7.2f} ms max")
+    profiler.export_chrome_trace(trace_path)
+    print(f"Trace written to {trace_path} (open it in chrome://tracing or ui.perfetto.dev)")
 
 def main():
+    marks = [("imports", time.perf_counter())]
+    trace_path = profile_trace_path(sys.argv)
+    if trace_path:
+        profiler.enable()
+        profiler.record("imports", _START, marks[0][1])
     app = QApplication(sys.argv)
-    window = MainWindow()
+    marks.append(("QApplication", time.perf_counter()))
+    with profiler.span("MainWindow"):
+        window = MainWindow()
+    marks.append(("MainWindow", time.perf_counter()))
+    if trace_path:
+        app.aboutToQuit.connect(lambda: write_profile(trace_path))
+    if '--startup-timing' in sys.argv:
+        StartupTimer(app, marks)
+        window.show()
+        sys.exit(app.exec_())
+
     window.show()
+    window.recover_autosave()  # Prompts if the last session crashed
     sys.exit(app.exec_())
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -1,27 +1,126 @@
-from PyQt5 import QtWidgets, uic
-from PyQt5.QtWidgets import QFileDialog, QMessageBox
+from PyQt5 import QtWidgets
+from PyQt5.QtWidgets import QFileDialog, QMessageBox, QProgressDialog, QShortcut
+from PyQt5.QtGui import QKeySequence
+from PyQt5.QtCore import QTimer, QStandardPaths
 import os
-import res_rc
+import zipfile
+import ui_interface
 from widgets.canvas import Canvas
 from widgets.panel_manager import PanelManager
 from widgets.layer_manager import LayerManager
-from core.image_handler import ImageHandler
+from widgets.adjust_panel import AdjustPanel
+from widgets.effects_panel import EffectsPanel
+from widgets.profiler_overlay import ProfilerOverlay
+from core.image_loader import ImageLoader
+from core.image_exporter import ImageExporter
+from core.filter_runner import FilterRunner
+from core.filters import FILTERS
+from core.graph import FilteredLayer
+from core.document import Layer
+from core.tile_cache import TileCache
+from core.history import History
+from core.project import ProjectFile, PROJECT_EXTENSION
+from core.autosave import Autosaver, Checkpoint
+from core.profiler import profiler
 
-class MainWindow(QtWidgets.QMainWindow):
+class MainWindow(QtWidgets.QMainWindow, ui_interface.Ui_MainWindow):
     """Main application window."""
     
     def __init__(self):
         super().__init__()
+        self.image_loader = None
+        self.import_progress = None
+        self.filter_progress = None
+        self.failed_imports = []
+        self.pending_layers = []  # Decoded layers waiting for the next batch insert
+        self.tile_cache = self._create_tile_cache()
+        self.project = None  # ProjectFile last opened or saved
+        self.history = History(float(os.environ.get('UNIFICATOR_HISTORY_MB', 512)))
+        self.image_exporter = ImageExporter(self)
+        self.image_exporter.exportFinished.connect(self._handle_export_finished)
+        self.checkpoint = Checkpoint.create(self._autosave_dir())
+        self.autosaver = Autosaver(self.checkpoint, self._autosave_state,
+                                   float(os.environ.get('UNIFICATOR_AUTOSAVE_SECONDS', 60)), self)
         self._load_ui()
         self._setup_canvas()
         self._setup_panel_manager()
         self._setup_layer_manager()
+        self._setup_adjust_panel()
+        self._setup_effects_panel()
         self._connect_signals()
 
     def _load_ui(self):
-        """Load the UI file."""
-        ui_path = os.path.join(os.path.dirname(__file__), 'interface.ui')
-        uic.loadUi(ui_path, self)
+        """Build the UI from ui_interface, compiled ahead of time from interface.ui.
+
+        Regenerate it with python build_ui.py after editing interface.ui;
+        python build_ui.py --check fails while it is out of date.
+        """
+        self.setupUi(self)
+
+    def _create_tile_cache(self):
+        """Create the on-disk tile cache if UNIFICATOR_TILE_CACHE_MB is set.
+
+        The value is the budget, in megabytes, of tiles kept in memory; the
+        optional UNIFICATOR_TILE_CACHE_DIR chooses where tile files go.
+        """
+        budget_mb = os.environ.get('UNIFICATOR_TILE_CACHE_MB')
+        if not budget_mb:
+            return None
+        return TileCache(float(budget_mb), os.environ.get('UNIFICATOR_TILE_CACHE_DIR'))
+
+    def _autosave_dir(self):
+        """Directory of the sessions' crash-recovery checkpoints (UNIFICATOR_AUTOSAVE_DIR overrides it)."""
+        directory = os.environ.get('UNIFICATOR_AUTOSAVE_DIR')
+        if directory:
+            return directory
+        data_dir = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation)
+        return os.path.join(data_dir or os.path.expanduser('~/.unificator'), 'recovery')
+
+    def _autosave_state(self):
+        """Layer snapshots and properties for the autosaver, taken on the GUI thread."""
+        return self.layer_manager.document.snapshot(visible_only=False), self._project_properties()
+
+    def recover_autosave(self):
+        """Offer to restore a checkpoint a crashed session left, then start autosaving.
+
+        Every session checkpoints into its own locked directory and deletes
+        it on a clean exit, so only checkpoints whose lock went stale are
+        offered, newest first; those of other running instances are never
+        touched. A restored checkpoint becomes this session's own, since
+        the restored layers read their pixels from its files. Once one is
+        restored, the rest are kept for the next start.
+        """
+        restored = False
+        for checkpoint in Checkpoint.orphans(self._autosave_dir()):
+            if restored:
+                checkpoint.release()
+                continue
+            answer = QMessageBox.question(
+                self, "Recover Layers",
+                "A previous session did not close normally. Restore its layers?",
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.Yes)
+            if answer == QMessageBox.Yes:
+                try:
+                    layers, thumbnails, properties = checkpoint.load()
+                    self.layer_manager.load_layers(
+                        layers, thumbnails, properties.get("next_layer_number"))
+                    restored = True
+                except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+                    QMessageBox.warning(self, "Recovery Error", "The recovered layers could not be read.")
+            if restored:
+                self.checkpoint.discard()
+                self.checkpoint = self.autosaver.checkpoint = checkpoint
+            else:
+                checkpoint.discard()
+        self.autosaver.start()
+
+    def closeEvent(self, event):
+        """Remove the recovery checkpoint and spilled tile files when the window closes."""
+        self.autosaver.stop()
+        self.checkpoint.discard()
+        if self.tile_cache is not None:
+            self.tile_cache.close()
+        super().closeEvent(event)
 
     def _setup_canvas(self):
         """Setup the canvas widget."""
@@ -31,6 +130,8 @@ class MainWindow(QtWidgets.QMainWindow):
         layout = self.visualizer.parentWidget().layout()
         layout.replaceWidget(self.visualizer, self.canvas)
         self.visualizer.deleteLater()
+        if profiler.enabled:
+            self.profiler_overlay = ProfilerOverlay(self.canvas)
 
     def _setup_panel_manager(self):
         """Setup the panel manager."""
@@ -45,6 +146,11 @@ class MainWindow(QtWidgets.QMainWindow):
         # Connect add layer button only once
         self.add_layer_button.clicked.connect(self._handle_add_layer)
         self.save_button.clicked.connect(self._handle_save_image)
+        self.apply_button.clicked.connect(self._handle_apply)
+        self.cancel_button.clicked.connect(self._handle_cancel)
+        # Ctrl+Z / Ctrl+Shift+Z (platform standard keys)
+        QShortcut(QKeySequence.Undo, self, self.layer_manager.undo)
+        QShortcut(QKeySequence.Redo, self, self.layer_manager.redo)
 
     def _handle_tool_button(self, button, idx):
         """Handle tool button clicks."""
@@ -60,7 +166,8 @@ class MainWindow(QtWidgets.QMainWindow):
 
         file_dialog = QFileDialog(self)
         file_dialog.setFileMode(QFileDialog.AnyFile)
-        file_dialog.setNameFilter("PNG (*.png);;JPEG (*.jpg *.jpeg);;BMP (*.bmp);;GIF (*.gif)")
+        file_dialog.setNameFilter("PNG (*.png);;JPEG (*.jpg *.jpeg);;BMP (*.bmp);;GIF (*.gif);;"
+                                  f"Unificator project (*.{PROJECT_EXTENSION})")
         file_dialog.setDefaultSuffix("png")
         file_dialog.setAcceptMode(QFileDialog.AcceptSave)
 
@@ -76,10 +183,68 @@ class MainWindow(QtWidgets.QMainWindow):
         if not file_path.lower().endswith(f".{file_extension}"):
             file_path += f".{file_extension}"
 
-        if ImageHandler.save_image(self.canvas, file_path, file_extension):
+        if file_extension == PROJECT_EXTENSION:
+            self._save_project(file_path)
+            return
+
+        canvas_size = (self.canvas.canvas_size.width(), self.canvas.canvas_size.height())
+        self.save_button.setEnabled(False)
+        self.image_exporter.export(
+            self.layer_manager.document.snapshot(), canvas_size, file_path, file_extension)
+
+    def _save_project(self, file_path):
+        """Save every layer, hidden ones included, as a layered project.
+
+        Saving again to the same project only writes the layers whose
+        pixels changed since it was opened or last saved.
+        """
+        if self.project is None:
+            self.project = ProjectFile(file_path)
+        self.save_button.setEnabled(False)
+        self.image_exporter.save_project(
+            self.project, self.layer_manager.document.snapshot(visible_only=False),
+            file_path, self._project_properties())
+
+    def _project_properties(self):
+        """Document-wide values stored with projects and checkpoints."""
+        return {
+            "canvas_size": [self.canvas.canvas_size.width(), self.canvas.canvas_size.height()],
+            "next_layer_number": self.layer_manager.start_index,
+        }
+
+    def _open_project(self, file_path):
+        """Replace the layer stack with a project's layers, loaded lazily.
+
+        The current layers and their undo history are dropped, so the user
+        is asked first when there are any.
+        """
+        if len(self.layer_manager.document) and QMessageBox.question(
+                self, "Open Project",
+                "Opening a project replaces the current layers and clears the undo history. Continue?",
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.No) != QMessageBox.Yes:
+            return
+        project = ProjectFile(file_path)
+        try:
+            layers, thumbnails = project.load()
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            QMessageBox.warning(self, "Open Error", f"Failed to open the project {file_path}.")
+            return
+        self.project = project
+        self.layer_manager.load_layers(
+            layers, thumbnails, project.properties.get("next_layer_number"))
+        self.checkpoint.seed(project)
+
+    def _handle_export_finished(self, file_path, success):
+        """Report the result of a background export."""
+        self.save_button.setEnabled(not self.image_exporter.is_running())
+        if success and file_path.endswith(f".{PROJECT_EXTENSION}"):
+            self.checkpoint.seed(self.project)  # Saved layers need no copies in the checkpoint
+        if success:
+            kind = "Project" if file_path.endswith(f".{PROJECT_EXTENSION}") else "Image"
             QMessageBox.information(self, "Success", 
-                                  f"Image saved successfully as {file_path}")
+                                  f"{kind} saved successfully as {file_path}")
         else:
+            file_extension = os.path.splitext(file_path)[1].lstrip(".")
             QMessageBox.warning(self, "Save Error", 
                               f"Failed to save the image in {file_extension.upper()} format.")
             
@@ -88,21 +253,159 @@ class MainWindow(QtWidgets.QMainWindow):
         self.layer_manager = LayerManager(self)
         layout = self.layer_holder_frame.layout()
         layout.addWidget(self.layer_manager)
+        self.canvas.set_document(self.layer_manager.document)
+
+    def _setup_adjust_panel(self):
+        """Add the adjustment layer controls under Transform in the Adjust panel."""
+        self.adjust_panel = AdjustPanel(self.frame_17)
+        self.verticalLayout_13.addWidget(self.adjust_panel)
+        self.adjust_panel.adjustmentRequested.connect(self.layer_manager.add_adjustment)
+        self.adjust_panel.paramsChanged.connect(self.layer_manager.set_adjustment_params)
+        self.adjust_panel.paramsCommitted.connect(self.layer_manager.edit_adjustment)
+        self.layer_manager.activeLayerChanged.connect(self.adjust_panel.set_layer)
+        self.layer_manager.model.dataChanged.connect(lambda *args: self.adjust_panel.refresh())
+
+    def _setup_effects_panel(self):
+        """Add the filter chain controls under Black and White in the Effects panel."""
+        self.effects_panel = EffectsPanel(self.frame_18)
+        self.verticalLayout_15.addWidget(self.effects_panel)
+        self.effects_panel.previewChanged.connect(self._handle_filter_preview)
+        self.effects_panel.previewCleared.connect(lambda: self.canvas.set_preview(None))
+        self.layer_manager.activeLayerChanged.connect(self.effects_panel.set_layer)
+        self.filter_runner = FilterRunner(self)
+        self.filter_runner.progressChanged.connect(self._handle_filter_progress)
+        self.filter_runner.finished.connect(self._handle_filter_finished)
+        self.filter_runner.cancelled.connect(self._close_filter_progress)
+
+    def _handle_filter_preview(self, steps, proxy):
+        """Show the active layer through the filter chain while its sliders move."""
+        layer = self.layer_manager.active_layer
+        if layer is not None:
+            self.canvas.set_preview(FilteredLayer(layer, steps, proxy))
+
+    def _handle_apply(self):
+        """Apply the previewed filter chain to the whole active layer in the background."""
+        panel = self.effects_panel
+        if not panel.steps or panel.layer is None or self.filter_runner.is_running():
+            return
+        panel.setEnabled(False)
+        labels = ", ".join(FILTERS[kind][0] for kind, _ in panel.steps)
+        self.filter_progress = QProgressDialog(f"Applying {labels}...", "Cancel", 0, 0, self)
+        self.filter_progress.setWindowTitle("Effects")
+        self.filter_progress.setMinimumDuration(500)
+        self.filter_progress.setValue(0)
+        self.filter_progress.canceled.connect(self.filter_runner.cancel)
+        self.filter_runner.start(panel.layer.snapshot(), panel.steps)
+
+    def _handle_cancel(self):
+        """Stop a running filter chain, or else drop the filter preview."""
+        if self.filter_runner.is_running():
+            self.filter_runner.cancel()
+        else:
+            self.effects_panel.clear()
+
+    def _handle_filter_progress(self, done, total):
+        """Advance the filter progress dialog."""
+        if self.filter_progress is not None:
+            self.filter_progress.setMaximum(total)
+            self.filter_progress.setValue(done)
+
+    def _handle_filter_finished(self, snapshot, pixels):
+        """Swap the filtered pixels into the layer as one undo step."""
+        self._close_filter_progress()
+        layer = self.layer_manager.document.get(snapshot.id)
+        if layer is None or layer.version != snapshot.version:
+            QMessageBox.warning(self, "Effects", "The layer changed while the filter was running.")
+            return
+        self.layer_manager.replace_pixels(layer, pixels)
+        self.effects_panel.clear()
+
+    def _close_filter_progress(self):
+        """Tear down the filter progress dialog once a run ends."""
+        self.effects_panel.setEnabled(True)
+        if self.filter_progress is not None:
+            self.filter_progress.canceled.disconnect()
+            self.filter_progress.close()
+            self.filter_progress.deleteLater()
+            self.filter_progress = None
 
     def _handle_add_layer(self):
         """Handle adding multiple layers at once."""
         file_dialog = QFileDialog(self)
         file_dialog.setFileMode(QFileDialog.ExistingFiles)  # Allow multiple file selection
-        file_dialog.setNameFilter("Images (*.png *.jpg *.jpeg *.bmp *.gif)")
+        file_dialog.setNameFilter("Images (*.png *.jpg *.jpeg *.bmp *.gif);;"
+                                  f"Unificator project (*.{PROJECT_EXTENSION})")
         
         if file_dialog.exec_():
             file_paths = file_dialog.selectedFiles()
-            
-            # Process all selected files
-            for file_path in file_paths:
-                pixmap = ImageHandler.load_image(file_path)
-                if pixmap:
-                    self.layer_manager.add_layer(pixmap)
-            
-            # Update canvas once after all layers are added
-            self.layer_manager._update_canvas()
\ No newline at end of file
+            projects = [path for path in file_paths if path.endswith(f".{PROJECT_EXTENSION}")]
+            if projects and len(file_paths) > 1:
+                # A project replaces the stack, so it cannot be combined with anything else
+                QMessageBox.warning(self, "Add Layer",
+                                    "Select either a single project or only images.")
+            elif projects:
+                self._open_project(projects[0])
+            else:
+                self._add_files(file_paths)
+
+    def _add_files(self, file_paths):
+        """Decode files in the background and add a layer as each one is ready."""
+        if not file_paths or self.image_loader is not None:
+            return
+
+        self.add_layer_button.setEnabled(False)
+        self.failed_imports = []
+        self.import_progress = QProgressDialog(
+            "Importing images...", "Cancel", 0, len(file_paths), self)
+        self.import_progress.setWindowTitle("Add Layer")
+        self.import_progress.setMinimumDuration(500)
+        self.import_progress.setValue(0)
+
+        self.image_loader = ImageLoader(self, self.tile_cache)
+        self.image_loader.imageLoaded.connect(self._handle_image_loaded)
+        self.image_loader.loadFailed.connect(self._handle_image_failed)
+        self.image_loader.progressChanged.connect(self._handle_import_progress)
+        self.image_loader.finished.connect(self._handle_import_finished)
+        self.import_progress.canceled.connect(self.image_loader.cancel)
+        self.image_loader.load(file_paths)
+
+    def _handle_image_loaded(self, file_path, pixels):
+        """Queue decoded pixels as a new layer.
+
+        Results that arrive in the same event-loop pass are added together
+        through LayerManager.add_layers.
+        """
+        if not self.pending_layers:
+            QTimer.singleShot(0, self._flush_pending_layers)
+        self.pending_layers.append(Layer(pixels))
+
+    def _flush_pending_layers(self):
+        """Add every queued layer in one batch."""
+        layers, self.pending_layers = self.pending_layers, []
+        self.layer_manager.add_layers(layers)
+
+    def _handle_image_failed(self, file_path):
+        """Remember a file that could not be decoded."""
+        self.failed_imports.append(file_path)
+
+    def _handle_import_progress(self, done, total):
+        """Advance the import progress dialog."""
+        if self.import_progress is not None:
+            self.import_progress.setValue(done)
+
+    def _handle_import_finished(self):
+        """Tear down the import pipeline once the batch is done or cancelled."""
+        self._flush_pending_layers()
+        if self.import_progress is not None:
+            self.import_progress.canceled.disconnect()
+            self.import_progress.close()
+            self.import_progress.deleteLater()
+            self.import_progress = None
+        self.image_loader.deleteLater()
+        self.image_loader = None
+        self.add_layer_button.setEnabled(True)
+
+        if self.failed_imports:
+            QMessageBox.warning(self, "Load Error",
+                              "Failed to load:\n" + "\n".join(self.failed_imports))
+            self.failed_imports = []
@@ -0,0 +1,48 @@
+# Registers the Qt resources (icons and images used by interface.ui).
+#
+# The resources are read from the binary resources/res.rcc, which Qt maps
+# from disk and only decodes an image when it is first used. Importing the
+# pyrcc5 module res_rc instead would execute ~1 MB of embedded bytes before
+# the window can appear, so it is only used when res.rcc is missing.
+#
+# res.rcc is built from res_rc (regenerate that with pyrcc5 first when
+# resources/res.qrc changes):
+#
+#     python res_rcc.py
+import os
+import struct
+from PyQt5.QtCore import QResource
+
+RCC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'resources', 'res.rcc')
+
+
+def register_resources():
+    """Register the resources, from res.rcc when possible."""
+    if os.path.exists(RCC_PATH) and QResource.registerResource(RCC_PATH):
+        return
+    import res_rc  # Registers the embedded copy on import
+
+
+def build_rcc(path=RCC_PATH):
+    """Write the resources compiled into res_rc as a binary (rcc -binary) file.
+
+    The layout is the "qres" header with big-endian format version and
+    tree, data and name offsets, followed by the three tables exactly as
+    pyrcc5 embedded them.
+    """
+    import res_rc
+    header_size = 20
+    data_offset = header_size
+    name_offset = data_offset + len(res_rc.qt_resource_data)
+    tree_offset = name_offset + len(res_rc.qt_resource_name)
+    with open(path, 'wb') as rcc_file:
+        rcc_file.write(b'qres' + struct.pack('>IIII', 2, tree_offset, data_offset, name_offset))
+        rcc_file.write(res_rc.qt_resource_data)
+        rcc_file.write(res_rc.qt_resource_name)
+        rcc_file.write(res_rc.qt_resource_struct_v2)
+
+
+register_resources()
+
+if __name__ == '__main__':
+    build_rcc()
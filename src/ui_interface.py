@@ -0,0 +1,822 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'interface.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_MainWindow(object):
+    def setupUi(self, MainWindow):
+        MainWindow.setObjectName("MainWindow")
+        MainWindow.resize(1124, 623)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(MainWindow.sizePolicy().hasHeightForWidth())
+        MainWindow.setSizePolicy(sizePolicy)
+        self.centralwidget = QtWidgets.QWidget(MainWindow)
+        self.centralwidget.setStyleSheet("background-color: rgb(57, 57, 57);\n"
+"")
+        self.centralwidget.setObjectName("centralwidget")
+        self.verticalLayout = QtWidgets.QVBoxLayout(self.centralwidget)
+        self.verticalLayout.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout.setSpacing(0)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.frame = QtWidgets.QFrame(self.centralwidget)
+        self.frame.setEnabled(True)
+        self.frame.setStyleSheet("QFrame { \n"
+"    margin: 0px;\n"
+"    padding: 0px;\n"
+"    border: none;\n"
+" }")
+        self.frame.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame.setObjectName("frame")
+        self.horizontalLayout = QtWidgets.QHBoxLayout(self.frame)
+        self.horizontalLayout.setContentsMargins(0, 0, 0, 0)
+        self.horizontalLayout.setSpacing(0)
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.frame_4 = QtWidgets.QFrame(self.frame)
+        self.frame_4.setMinimumSize(QtCore.QSize(160, 0))
+        self.frame_4.setMaximumSize(QtCore.QSize(200, 16777215))
+        self.frame_4.setInputMethodHints(QtCore.Qt.ImhNone)
+        self.frame_4.setFrameShape(QtWidgets.QFrame.NoFrame)
+        self.frame_4.setFrameShadow(QtWidgets.QFrame.Plain)
+        self.frame_4.setLineWidth(0)
+        self.frame_4.setObjectName("frame_4")
+        self.horizontalLayout_3 = QtWidgets.QHBoxLayout(self.frame_4)
+        self.horizontalLayout_3.setContentsMargins(0, 0, 0, 0)
+        self.horizontalLayout_3.setSpacing(0)
+        self.horizontalLayout_3.setObjectName("horizontalLayout_3")
+        self.frame_13 = QtWidgets.QFrame(self.frame_4)
+        self.frame_13.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame_13.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_13.setObjectName("frame_13")
+        self.horizontalLayout_8 = QtWidgets.QHBoxLayout(self.frame_13)
+        self.horizontalLayout_8.setContentsMargins(0, 0, 0, 0)
+        self.horizontalLayout_8.setSpacing(0)
+        self.horizontalLayout_8.setObjectName("horizontalLayout_8")
+        self.label_6 = QtWidgets.QLabel(self.frame_13)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.label_6.sizePolicy().hasHeightForWidth())
+        self.label_6.setSizePolicy(sizePolicy)
+        self.label_6.setMinimumSize(QtCore.QSize(60, 40))
+        self.label_6.setMaximumSize(QtCore.QSize(60, 40))
+        self.label_6.setSizeIncrement(QtCore.QSize(0, 0))
+        font = QtGui.QFont()
+        font.setPointSize(11)
+        self.label_6.setFont(font)
+        self.label_6.setStyleSheet("image: url(:/images/images/logo3.png);")
+        self.label_6.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.label_6.setLineWidth(0)
+        self.label_6.setText("")
+        self.label_6.setAlignment(QtCore.Qt.AlignLeading|QtCore.Qt.AlignLeft|QtCore.Qt.AlignVCenter)
+        self.label_6.setObjectName("label_6")
+        self.horizontalLayout_8.addWidget(self.label_6)
+        self.horizontalLayout_3.addWidget(self.frame_13, 0, QtCore.Qt.AlignLeft)
+        self.frame_12 = QtWidgets.QFrame(self.frame_4)
+        self.frame_12.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame_12.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_12.setObjectName("frame_12")
+        self.verticalLayout_5 = QtWidgets.QVBoxLayout(self.frame_12)
+        self.verticalLayout_5.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_5.setSpacing(0)
+        self.verticalLayout_5.setObjectName("verticalLayout_5")
+        self.label_5 = QtWidgets.QLabel(self.frame_12)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.label_5.sizePolicy().hasHeightForWidth())
+        self.label_5.setSizePolicy(sizePolicy)
+        self.label_5.setMinimumSize(QtCore.QSize(30, 30))
+        self.label_5.setMaximumSize(QtCore.QSize(16777215, 60))
+        font = QtGui.QFont()
+        font.setPointSize(14)
+        font.setBold(True)
+        font.setItalic(False)
+        font.setUnderline(False)
+        font.setWeight(75)
+        font.setStrikeOut(False)
+        font.setKerning(True)
+        font.setStyleStrategy(QtGui.QFont.PreferDefault)
+        self.label_5.setFont(font)
+        self.label_5.setStyleSheet("color: rgb(222, 221, 218);")
+        self.label_5.setAlignment(QtCore.Qt.AlignBottom|QtCore.Qt.AlignHCenter)
+        self.label_5.setObjectName("label_5")
+        self.verticalLayout_5.addWidget(self.label_5)
+        self.label_7 = QtWidgets.QLabel(self.frame_12)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.label_7.sizePolicy().hasHeightForWidth())
+        self.label_7.setSizePolicy(sizePolicy)
+        self.label_7.setMinimumSize(QtCore.QSize(30, 16))
+        self.label_7.setMaximumSize(QtCore.QSize(16777215, 16))
+        font = QtGui.QFont()
+        font.setPointSize(9)
+        font.setBold(True)
+        font.setItalic(False)
+        font.setUnderline(False)
+        font.setWeight(75)
+        font.setStrikeOut(False)
+        font.setKerning(True)
+        font.setStyleStrategy(QtGui.QFont.PreferDefault)
+        self.label_7.setFont(font)
+        self.label_7.setStyleSheet("color: rgb(222, 221, 218);")
+        self.label_7.setAlignment(QtCore.Qt.AlignHCenter|QtCore.Qt.AlignTop)
+        self.label_7.setObjectName("label_7")
+        self.verticalLayout_5.addWidget(self.label_7)
+        self.horizontalLayout_3.addWidget(self.frame_12)
+        self.horizontalLayout.addWidget(self.frame_4, 0, QtCore.Qt.AlignHCenter)
+        self.frame_6 = QtWidgets.QFrame(self.frame)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Preferred)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.frame_6.sizePolicy().hasHeightForWidth())
+        self.frame_6.setSizePolicy(sizePolicy)
+        self.frame_6.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame_6.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_6.setObjectName("frame_6")
+        self.horizontalLayout_6 = QtWidgets.QHBoxLayout(self.frame_6)
+        self.horizontalLayout_6.setContentsMargins(0, 0, 0, 0)
+        self.horizontalLayout_6.setObjectName("horizontalLayout_6")
+        self.frame_11 = QtWidgets.QFrame(self.frame_6)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Preferred)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.frame_11.sizePolicy().hasHeightForWidth())
+        self.frame_11.setSizePolicy(sizePolicy)
+        self.frame_11.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame_11.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_11.setObjectName("frame_11")
+        self.horizontalLayout_7 = QtWidgets.QHBoxLayout(self.frame_11)
+        self.horizontalLayout_7.setContentsMargins(-1, 0, -1, 0)
+        self.horizontalLayout_7.setSpacing(10)
+        self.horizontalLayout_7.setObjectName("horizontalLayout_7")
+        self.pushButton = QtWidgets.QPushButton(self.frame_11)
+        self.pushButton.setStyleSheet("image: url(:/icons/icons/arrow-87-64.png);")
+        self.pushButton.setText("")
+        self.pushButton.setObjectName("pushButton")
+        self.horizontalLayout_7.addWidget(self.pushButton)
+        self.pushButton_32 = QtWidgets.QPushButton(self.frame_11)
+        self.pushButton_32.setStyleSheet("image: url(:/icons/icons/arrow-55-64.gif);\n"
+"QPushButton{\n"
+"    \n"
+"    background-color: rgb(38, 162, 105);\n"
+"}\n"
+"QPushButton:hover{\n"
+"    background-color: rgb(165, 29, 45);\n"
+"}")
+        self.pushButton_32.setText("")
+        self.pushButton_32.setObjectName("pushButton_32")
+        self.horizontalLayout_7.addWidget(self.pushButton_32)
+        self.horizontalLayout_6.addWidget(self.frame_11, 0, QtCore.Qt.AlignRight|QtCore.Qt.AlignVCenter)
+        self.horizontalLayout.addWidget(self.frame_6)
+        self.frame_5 = QtWidgets.QFrame(self.frame)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.frame_5.sizePolicy().hasHeightForWidth())
+        self.frame_5.setSizePolicy(sizePolicy)
+        self.frame_5.setMinimumSize(QtCore.QSize(0, 0))
+        self.frame_5.setFrameShape(QtWidgets.QFrame.NoFrame)
+        self.frame_5.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_5.setObjectName("frame_5")
+        self.horizontalLayout_4 = QtWidgets.QHBoxLayout(self.frame_5)
+        self.horizontalLayout_4.setContentsMargins(6, 15, 6, 15)
+        self.horizontalLayout_4.setSpacing(5)
+        self.horizontalLayout_4.setObjectName("horizontalLayout_4")
+        self.pushButton_4 = QtWidgets.QPushButton(self.frame_5)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Minimum)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.pushButton_4.sizePolicy().hasHeightForWidth())
+        self.pushButton_4.setSizePolicy(sizePolicy)
+        self.pushButton_4.setMinimumSize(QtCore.QSize(10, 10))
+        self.pushButton_4.setMaximumSize(QtCore.QSize(25, 25))
+        self.pushButton_4.setStyleSheet("image: url(:/icons/icons/minus-small.svg);\n"
+"background-color: rgb(229, 165, 10);")
+        self.pushButton_4.setText("")
+        self.pushButton_4.setObjectName("pushButton_4")
+        self.horizontalLayout_4.addWidget(self.pushButton_4)
+        self.pushButton_3 = QtWidgets.QPushButton(self.frame_5)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Minimum)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.pushButton_3.sizePolicy().hasHeightForWidth())
+        self.pushButton_3.setSizePolicy(sizePolicy)
+        self.pushButton_3.setMinimumSize(QtCore.QSize(10, 10))
+        self.pushButton_3.setMaximumSize(QtCore.QSize(25, 25))
+        self.pushButton_3.setStyleSheet("image: url(:/icons/icons/expand.svg);\n"
+"background-color: rgb(26, 95, 180);")
+        self.pushButton_3.setText("")
+        self.pushButton_3.setObjectName("pushButton_3")
+        self.horizontalLayout_4.addWidget(self.pushButton_3)
+        self.pushButton_2 = QtWidgets.QPushButton(self.frame_5)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Minimum)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.pushButton_2.sizePolicy().hasHeightForWidth())
+        self.pushButton_2.setSizePolicy(sizePolicy)
+        self.pushButton_2.setMinimumSize(QtCore.QSize(10, 10))
+        self.pushButton_2.setMaximumSize(QtCore.QSize(25, 25))
+        self.pushButton_2.setStyleSheet("image: url(:/icons/icons/cross(1).svg);\n"
+"background-color: rgb(137, 5, 5);\n"
+"")
+        self.pushButton_2.setText("")
+        self.pushButton_2.setObjectName("pushButton_2")
+        self.horizontalLayout_4.addWidget(self.pushButton_2)
+        self.horizontalLayout.addWidget(self.frame_5, 0, QtCore.Qt.AlignRight|QtCore.Qt.AlignVCenter)
+        self.verticalLayout.addWidget(self.frame, 0, QtCore.Qt.AlignTop)
+        self.frame_2 = QtWidgets.QFrame(self.centralwidget)
+        self.frame_2.setEnabled(True)
+        self.frame_2.setLayoutDirection(QtCore.Qt.LeftToRight)
+        self.frame_2.setAutoFillBackground(False)
+        self.frame_2.setStyleSheet("QFrame {\n"
+"    \n"
+"    margin: 0px;\n"
+"    padding: 0px;\n"
+"}\n"
+"\n"
+"QToolButton{\n"
+"    border:none;\n"
+"    margin: 0px;\n"
+"    padding: 0px;\n"
+"}\n"
+"\n"
+"\n"
+"")
+        self.frame_2.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame_2.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_2.setObjectName("frame_2")
+        self.horizontalLayout_2 = QtWidgets.QHBoxLayout(self.frame_2)
+        self.horizontalLayout_2.setContentsMargins(0, 0, 0, 0)
+        self.horizontalLayout_2.setSpacing(0)
+        self.horizontalLayout_2.setObjectName("horizontalLayout_2")
+        self.frame_7 = QtWidgets.QFrame(self.frame_2)
+        font = QtGui.QFont()
+        font.setBold(False)
+        font.setWeight(50)
+        self.frame_7.setFont(font)
+        self.frame_7.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame_7.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_7.setObjectName("frame_7")
+        self.verticalLayout_2 = QtWidgets.QVBoxLayout(self.frame_7)
+        self.verticalLayout_2.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_2.setSpacing(0)
+        self.verticalLayout_2.setObjectName("verticalLayout_2")
+        self.frame_23 = QtWidgets.QFrame(self.frame_7)
+        self.frame_23.setStyleSheet("QToolButton{\n"
+"    color: rgb(246, 245, 244);\n"
+"}\n"
+"\n"
+"QToolButton:hover{\n"
+"    background-color: rgb(80, 80, 80);\n"
+"}\n"
+"\n"
+"\n"
+"QToolButton:pressed {\n"
+"                background-color: darkgray;\n"
+"            }\n"
+"\n"
+"QToolButton:checked{\n"
+"    background-color: rgb(80, 80, 80);\n"
+"}")
+        self.frame_23.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame_23.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_23.setObjectName("frame_23")
+        self.verticalLayout_8 = QtWidgets.QVBoxLayout(self.frame_23)
+        self.verticalLayout_8.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_8.setSpacing(0)
+        self.verticalLayout_8.setObjectName("verticalLayout_8")
+        self.adjust_button = QtWidgets.QToolButton(self.frame_23)
+        self.adjust_button.setMinimumSize(QtCore.QSize(50, 50))
+        self.adjust_button.setMaximumSize(QtCore.QSize(50, 50))
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        font.setBold(True)
+        font.setWeight(75)
+        self.adjust_button.setFont(font)
+        self.adjust_button.setLayoutDirection(QtCore.Qt.RightToLeft)
+        self.adjust_button.setStyleSheet("")
+        icon = QtGui.QIcon()
+        icon.addPixmap(QtGui.QPixmap(":/icons/icons/levels.png"), QtGui.QIcon.Normal, QtGui.QIcon.Off)
+        self.adjust_button.setIcon(icon)
+        self.adjust_button.setIconSize(QtCore.QSize(25, 25))
+        self.adjust_button.setCheckable(True)
+        self.adjust_button.setChecked(False)
+        self.adjust_button.setPopupMode(QtWidgets.QToolButton.InstantPopup)
+        self.adjust_button.setToolButtonStyle(QtCore.Qt.ToolButtonTextUnderIcon)
+        self.adjust_button.setAutoRaise(False)
+        self.adjust_button.setObjectName("adjust_button")
+        self.verticalLayout_8.addWidget(self.adjust_button)
+        self.effects_button = QtWidgets.QToolButton(self.frame_23)
+        self.effects_button.setMinimumSize(QtCore.QSize(50, 50))
+        self.effects_button.setMaximumSize(QtCore.QSize(50, 50))
+        font = QtGui.QFont()
+        font.setPointSize(8)
+        font.setBold(True)
+        font.setWeight(75)
+        self.effects_button.setFont(font)
+        self.effects_button.setLayoutDirection(QtCore.Qt.RightToLeft)
+        self.effects_button.setStyleSheet("")
+        icon1 = QtGui.QIcon()
+        icon1.addPixmap(QtGui.QPixmap(":/icons/icons/icons8-magic-wand-64.png"), QtGui.QIcon.Normal, QtGui.QIcon.Off)
+        self.effects_button.setIcon(icon1)
+        self.effects_button.setIconSize(QtCore.QSize(30, 30))
+        self.effects_button.setCheckable(True)
+        self.effects_button.setPopupMode(QtWidgets.QToolButton.InstantPopup)
+        self.effects_button.setToolButtonStyle(QtCore.Qt.ToolButtonTextUnderIcon)
+        self.effects_button.setAutoRaise(False)
+        self.effects_button.setObjectName("effects_button")
+        self.verticalLayout_8.addWidget(self.effects_button)
+        self.verticalLayout_2.addWidget(self.frame_23, 0, QtCore.Qt.AlignTop)
+        self.horizontalLayout_2.addWidget(self.frame_7)
+        self.panel_frame = QtWidgets.QFrame(self.frame_2)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Minimum)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.panel_frame.sizePolicy().hasHeightForWidth())
+        self.panel_frame.setSizePolicy(sizePolicy)
+        self.panel_frame.setMinimumSize(QtCore.QSize(0, 0))
+        self.panel_frame.setMaximumSize(QtCore.QSize(300, 1000000))
+        self.panel_frame.setStyleSheet("background-color: rgb(80, 80, 80);")
+        self.panel_frame.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.panel_frame.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.panel_frame.setObjectName("panel_frame")
+        self.verticalLayout_3 = QtWidgets.QVBoxLayout(self.panel_frame)
+        self.verticalLayout_3.setObjectName("verticalLayout_3")
+        self.stackedWidget_2 = QtWidgets.QStackedWidget(self.panel_frame)
+        self.stackedWidget_2.setEnabled(True)
+        self.stackedWidget_2.setToolTipDuration(-1)
+        self.stackedWidget_2.setStyleSheet("")
+        self.stackedWidget_2.setFrameShape(QtWidgets.QFrame.Box)
+        self.stackedWidget_2.setLineWidth(1)
+        self.stackedWidget_2.setObjectName("stackedWidget_2")
+        self.adjust_panel = QtWidgets.QWidget()
+        self.adjust_panel.setMinimumSize(QtCore.QSize(250, 300))
+        self.adjust_panel.setObjectName("adjust_panel")
+        self.horizontalLayout_10 = QtWidgets.QHBoxLayout(self.adjust_panel)
+        self.horizontalLayout_10.setObjectName("horizontalLayout_10")
+        self.scrollArea_2 = QtWidgets.QScrollArea(self.adjust_panel)
+        self.scrollArea_2.setWidgetResizable(True)
+        self.scrollArea_2.setObjectName("scrollArea_2")
+        self.scrollAreaWidgetContents_4 = QtWidgets.QWidget()
+        self.scrollAreaWidgetContents_4.setGeometry(QtCore.QRect(0, 0, 230, 451))
+        self.scrollAreaWidgetContents_4.setObjectName("scrollAreaWidgetContents_4")
+        self.verticalLayout_24 = QtWidgets.QVBoxLayout(self.scrollAreaWidgetContents_4)
+        self.verticalLayout_24.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_24.setSpacing(0)
+        self.verticalLayout_24.setObjectName("verticalLayout_24")
+        self.frame_14 = QtWidgets.QFrame(self.scrollAreaWidgetContents_4)
+        self.frame_14.setStyleSheet("QLabel{\n"
+"    \n"
+"    \n"
+"    \n"
+"    color: rgb(192, 191, 188);\n"
+"}")
+        self.frame_14.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame_14.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_14.setObjectName("frame_14")
+        self.verticalLayout_7 = QtWidgets.QVBoxLayout(self.frame_14)
+        self.verticalLayout_7.setObjectName("verticalLayout_7")
+        self.frame_17 = QtWidgets.QFrame(self.frame_14)
+        self.frame_17.setMinimumSize(QtCore.QSize(0, 0))
+        self.frame_17.setMaximumSize(QtCore.QSize(16777215, 16777215))
+        self.frame_17.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame_17.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_17.setObjectName("frame_17")
+        self.verticalLayout_13 = QtWidgets.QVBoxLayout(self.frame_17)
+        self.verticalLayout_13.setObjectName("verticalLayout_13")
+        self.frame_47 = QtWidgets.QFrame(self.frame_17)
+        self.frame_47.setMaximumSize(QtCore.QSize(16777215, 35))
+        self.frame_47.setStyleSheet("QFrame { border: none; /* Remove the border */ margin: 0px; /* Set all margins to zero */ padding: 0px; /* Set all padding to zero */ }")
+        self.frame_47.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame_47.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_47.setObjectName("frame_47")
+        self.verticalLayout_34 = QtWidgets.QVBoxLayout(self.frame_47)
+        self.verticalLayout_34.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_34.setSpacing(0)
+        self.verticalLayout_34.setObjectName("verticalLayout_34")
+        self.label_9 = QtWidgets.QLabel(self.frame_47)
+        self.label_9.setObjectName("label_9")
+        self.verticalLayout_34.addWidget(self.label_9, 0, QtCore.Qt.AlignHCenter|QtCore.Qt.AlignTop)
+        self.verticalLayout_13.addWidget(self.frame_47)
+        self.frame_48 = QtWidgets.QFrame(self.frame_17)
+        self.frame_48.setStyleSheet("QPushButton{\n"
+"        color: rgb(255, 255, 255);\n"
+"}")
+        self.frame_48.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame_48.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_48.setObjectName("frame_48")
+        self.verticalLayout_9 = QtWidgets.QVBoxLayout(self.frame_48)
+        self.verticalLayout_9.setObjectName("verticalLayout_9")
+        self.frame_65 = QtWidgets.QFrame(self.frame_48)
+        self.frame_65.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame_65.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_65.setObjectName("frame_65")
+        self.horizontalLayout_9 = QtWidgets.QHBoxLayout(self.frame_65)
+        self.horizontalLayout_9.setObjectName("horizontalLayout_9")
+        self.pushButton_5 = QtWidgets.QPushButton(self.frame_65)
+        self.pushButton_5.setObjectName("pushButton_5")
+        self.horizontalLayout_9.addWidget(self.pushButton_5, 0, QtCore.Qt.AlignLeft)
+        self.label = QtWidgets.QLabel(self.frame_65)
+        self.label.setMinimumSize(QtCore.QSize(15, 15))
+        self.label.setMaximumSize(QtCore.QSize(15, 15))
+        self.label.setText("")
+        self.label.setPixmap(QtGui.QPixmap(":/icons/icons/arrow-24-48.png"))
+        self.label.setAlignment(QtCore.Qt.AlignRight|QtCore.Qt.AlignTrailing|QtCore.Qt.AlignVCenter)
+        self.label.setObjectName("label")
+        self.horizontalLayout_9.addWidget(self.label)
+        self.verticalLayout_9.addWidget(self.frame_65)
+        self.frame_74 = QtWidgets.QFrame(self.frame_48)
+        self.frame_74.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame_74.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_74.setObjectName("frame_74")
+        self.horizontalLayout_13 = QtWidgets.QHBoxLayout(self.frame_74)
+        self.horizontalLayout_13.setObjectName("horizontalLayout_13")
+        self.pushButton_8 = QtWidgets.QPushButton(self.frame_74)
+        self.pushButton_8.setObjectName("pushButton_8")
+        self.horizontalLayout_13.addWidget(self.pushButton_8, 0, QtCore.Qt.AlignLeft)
+        self.label_2 = QtWidgets.QLabel(self.frame_74)
+        self.label_2.setMinimumSize(QtCore.QSize(15, 15))
+        self.label_2.setMaximumSize(QtCore.QSize(15, 15))
+        self.label_2.setText("")
+        self.label_2.setPixmap(QtGui.QPixmap(":/icons/icons/arrow-24-48.png"))
+        self.label_2.setAlignment(QtCore.Qt.AlignRight|QtCore.Qt.AlignTrailing|QtCore.Qt.AlignVCenter)
+        self.label_2.setObjectName("label_2")
+        self.horizontalLayout_13.addWidget(self.label_2)
+        self.verticalLayout_9.addWidget(self.frame_74)
+        self.frame_66 = QtWidgets.QFrame(self.frame_48)
+        self.frame_66.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame_66.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_66.setObjectName("frame_66")
+        self.horizontalLayout_11 = QtWidgets.QHBoxLayout(self.frame_66)
+        self.horizontalLayout_11.setObjectName("horizontalLayout_11")
+        self.pushButton_6 = QtWidgets.QPushButton(self.frame_66)
+        self.pushButton_6.setObjectName("pushButton_6")
+        self.horizontalLayout_11.addWidget(self.pushButton_6, 0, QtCore.Qt.AlignLeft)
+        self.label_8 = QtWidgets.QLabel(self.frame_66)
+        self.label_8.setMinimumSize(QtCore.QSize(15, 15))
+        self.label_8.setMaximumSize(QtCore.QSize(15, 15))
+        self.label_8.setText("")
+        self.label_8.setPixmap(QtGui.QPixmap(":/icons/icons/arrow-24-48.png"))
+        self.label_8.setAlignment(QtCore.Qt.AlignRight|QtCore.Qt.AlignTrailing|QtCore.Qt.AlignVCenter)
+        self.label_8.setObjectName("label_8")
+        self.horizontalLayout_11.addWidget(self.label_8)
+        self.verticalLayout_9.addWidget(self.frame_66)
+        self.frame_67 = QtWidgets.QFrame(self.frame_48)
+        self.frame_67.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame_67.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_67.setObjectName("frame_67")
+        self.horizontalLayout_12 = QtWidgets.QHBoxLayout(self.frame_67)
+        self.horizontalLayout_12.setObjectName("horizontalLayout_12")
+        self.pushButton_7 = QtWidgets.QPushButton(self.frame_67)
+        self.pushButton_7.setObjectName("pushButton_7")
+        self.horizontalLayout_12.addWidget(self.pushButton_7, 0, QtCore.Qt.AlignLeft)
+        self.label_13 = QtWidgets.QLabel(self.frame_67)
+        self.label_13.setMinimumSize(QtCore.QSize(15, 15))
+        self.label_13.setMaximumSize(QtCore.QSize(15, 15))
+        self.label_13.setText("")
+        self.label_13.setPixmap(QtGui.QPixmap(":/icons/icons/arrow-24-48.png"))
+        self.label_13.setAlignment(QtCore.Qt.AlignRight|QtCore.Qt.AlignTrailing|QtCore.Qt.AlignVCenter)
+        self.label_13.setObjectName("label_13")
+        self.horizontalLayout_12.addWidget(self.label_13)
+        self.verticalLayout_9.addWidget(self.frame_67)
+        self.verticalLayout_13.addWidget(self.frame_48)
+        self.verticalLayout_7.addWidget(self.frame_17)
+        self.verticalLayout_24.addWidget(self.frame_14, 0, QtCore.Qt.AlignTop)
+        self.scrollArea_2.setWidget(self.scrollAreaWidgetContents_4)
+        self.horizontalLayout_10.addWidget(self.scrollArea_2)
+        self.stackedWidget_2.addWidget(self.adjust_panel)
+        self.effects_panel = QtWidgets.QWidget()
+        self.effects_panel.setMinimumSize(QtCore.QSize(250, 250))
+        self.effects_panel.setObjectName("effects_panel")
+        self.horizontalLayout_35 = QtWidgets.QHBoxLayout(self.effects_panel)
+        self.horizontalLayout_35.setObjectName("horizontalLayout_35")
+        self.scrollArea_3 = QtWidgets.QScrollArea(self.effects_panel)
+        self.scrollArea_3.setWidgetResizable(True)
+        self.scrollArea_3.setObjectName("scrollArea_3")
+        self.scrollAreaWidgetContents_5 = QtWidgets.QWidget()
+        self.scrollAreaWidgetContents_5.setGeometry(QtCore.QRect(0, 0, 218, 291))
+        self.scrollAreaWidgetContents_5.setObjectName("scrollAreaWidgetContents_5")
+        self.verticalLayout_25 = QtWidgets.QVBoxLayout(self.scrollAreaWidgetContents_5)
+        self.verticalLayout_25.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_25.setSpacing(0)
+        self.verticalLayout_25.setObjectName("verticalLayout_25")
+        self.frame_15 = QtWidgets.QFrame(self.scrollAreaWidgetContents_5)
+        self.frame_15.setStyleSheet("QLabel{\n"
+"    \n"
+"    \n"
+"    \n"
+"    color: rgb(192, 191, 188);\n"
+"}")
+        self.frame_15.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame_15.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_15.setObjectName("frame_15")
+        self.verticalLayout_14 = QtWidgets.QVBoxLayout(self.frame_15)
+        self.verticalLayout_14.setObjectName("verticalLayout_14")
+        self.frame_18 = QtWidgets.QFrame(self.frame_15)
+        self.frame_18.setMinimumSize(QtCore.QSize(0, 0))
+        self.frame_18.setMaximumSize(QtCore.QSize(16777215, 16777215))
+        self.frame_18.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame_18.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_18.setObjectName("frame_18")
+        self.verticalLayout_15 = QtWidgets.QVBoxLayout(self.frame_18)
+        self.verticalLayout_15.setObjectName("verticalLayout_15")
+        self.frame_55 = QtWidgets.QFrame(self.frame_18)
+        self.frame_55.setMaximumSize(QtCore.QSize(16777215, 35))
+        self.frame_55.setStyleSheet("QFrame { border: none; /* Remove the border */ margin: 0px; /* Set all margins to zero */ padding: 0px; /* Set all padding to zero */ }")
+        self.frame_55.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame_55.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_55.setObjectName("frame_55")
+        self.verticalLayout_38 = QtWidgets.QVBoxLayout(self.frame_55)
+        self.verticalLayout_38.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_38.setSpacing(0)
+        self.verticalLayout_38.setObjectName("verticalLayout_38")
+        self.label_16 = QtWidgets.QLabel(self.frame_55)
+        self.label_16.setObjectName("label_16")
+        self.verticalLayout_38.addWidget(self.label_16, 0, QtCore.Qt.AlignHCenter|QtCore.Qt.AlignTop)
+        self.verticalLayout_15.addWidget(self.frame_55)
+        self.frame_56 = QtWidgets.QFrame(self.frame_18)
+        self.frame_56.setStyleSheet("QPushButton{\n"
+"        color: rgb(255, 255, 255);\n"
+"}")
+        self.frame_56.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame_56.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_56.setObjectName("frame_56")
+        self.verticalLayout_16 = QtWidgets.QVBoxLayout(self.frame_56)
+        self.verticalLayout_16.setObjectName("verticalLayout_16")
+        self.frame_75 = QtWidgets.QFrame(self.frame_56)
+        self.frame_75.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame_75.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_75.setObjectName("frame_75")
+        self.horizontalLayout_31 = QtWidgets.QHBoxLayout(self.frame_75)
+        self.horizontalLayout_31.setObjectName("horizontalLayout_31")
+        self.pushButton_26 = QtWidgets.QPushButton(self.frame_75)
+        self.pushButton_26.setObjectName("pushButton_26")
+        self.horizontalLayout_31.addWidget(self.pushButton_26, 0, QtCore.Qt.AlignLeft)
+        self.label_17 = QtWidgets.QLabel(self.frame_75)
+        self.label_17.setMinimumSize(QtCore.QSize(15, 15))
+        self.label_17.setMaximumSize(QtCore.QSize(15, 15))
+        self.label_17.setText("")
+        self.label_17.setPixmap(QtGui.QPixmap(":/icons/icons/arrow-24-48.png"))
+        self.label_17.setAlignment(QtCore.Qt.AlignRight|QtCore.Qt.AlignTrailing|QtCore.Qt.AlignVCenter)
+        self.label_17.setObjectName("label_17")
+        self.horizontalLayout_31.addWidget(self.label_17)
+        self.verticalLayout_16.addWidget(self.frame_75)
+        self.frame_85 = QtWidgets.QFrame(self.frame_56)
+        self.frame_85.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame_85.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_85.setObjectName("frame_85")
+        self.horizontalLayout_32 = QtWidgets.QHBoxLayout(self.frame_85)
+        self.horizontalLayout_32.setObjectName("horizontalLayout_32")
+        self.pushButton_27 = QtWidgets.QPushButton(self.frame_85)
+        self.pushButton_27.setObjectName("pushButton_27")
+        self.horizontalLayout_32.addWidget(self.pushButton_27, 0, QtCore.Qt.AlignLeft)
+        self.label_18 = QtWidgets.QLabel(self.frame_85)
+        self.label_18.setMinimumSize(QtCore.QSize(15, 15))
+        self.label_18.setMaximumSize(QtCore.QSize(15, 15))
+        self.label_18.setText("")
+        self.label_18.setPixmap(QtGui.QPixmap(":/icons/icons/arrow-24-48.png"))
+        self.label_18.setAlignment(QtCore.Qt.AlignRight|QtCore.Qt.AlignTrailing|QtCore.Qt.AlignVCenter)
+        self.label_18.setObjectName("label_18")
+        self.horizontalLayout_32.addWidget(self.label_18)
+        self.verticalLayout_16.addWidget(self.frame_85)
+        self.frame_86 = QtWidgets.QFrame(self.frame_56)
+        self.frame_86.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame_86.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_86.setObjectName("frame_86")
+        self.horizontalLayout_33 = QtWidgets.QHBoxLayout(self.frame_86)
+        self.horizontalLayout_33.setObjectName("horizontalLayout_33")
+        self.pushButton_28 = QtWidgets.QPushButton(self.frame_86)
+        self.pushButton_28.setObjectName("pushButton_28")
+        self.horizontalLayout_33.addWidget(self.pushButton_28, 0, QtCore.Qt.AlignLeft)
+        self.label_19 = QtWidgets.QLabel(self.frame_86)
+        self.label_19.setMinimumSize(QtCore.QSize(15, 15))
+        self.label_19.setMaximumSize(QtCore.QSize(15, 15))
+        self.label_19.setText("")
+        self.label_19.setPixmap(QtGui.QPixmap(":/icons/icons/arrow-24-48.png"))
+        self.label_19.setAlignment(QtCore.Qt.AlignRight|QtCore.Qt.AlignTrailing|QtCore.Qt.AlignVCenter)
+        self.label_19.setObjectName("label_19")
+        self.horizontalLayout_33.addWidget(self.label_19)
+        self.verticalLayout_16.addWidget(self.frame_86)
+        self.frame_87 = QtWidgets.QFrame(self.frame_56)
+        self.frame_87.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame_87.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_87.setObjectName("frame_87")
+        self.horizontalLayout_34 = QtWidgets.QHBoxLayout(self.frame_87)
+        self.horizontalLayout_34.setObjectName("horizontalLayout_34")
+        self.pushButton_29 = QtWidgets.QPushButton(self.frame_87)
+        self.pushButton_29.setObjectName("pushButton_29")
+        self.horizontalLayout_34.addWidget(self.pushButton_29, 0, QtCore.Qt.AlignLeft)
+        self.label_20 = QtWidgets.QLabel(self.frame_87)
+        self.label_20.setMinimumSize(QtCore.QSize(15, 15))
+        self.label_20.setMaximumSize(QtCore.QSize(15, 15))
+        self.label_20.setText("")
+        self.label_20.setPixmap(QtGui.QPixmap(":/icons/icons/arrow-24-48.png"))
+        self.label_20.setAlignment(QtCore.Qt.AlignRight|QtCore.Qt.AlignTrailing|QtCore.Qt.AlignVCenter)
+        self.label_20.setObjectName("label_20")
+        self.horizontalLayout_34.addWidget(self.label_20)
+        self.verticalLayout_16.addWidget(self.frame_87)
+        self.verticalLayout_15.addWidget(self.frame_56)
+        self.verticalLayout_14.addWidget(self.frame_18)
+        self.verticalLayout_25.addWidget(self.frame_15, 0, QtCore.Qt.AlignTop)
+        self.scrollArea_3.setWidget(self.scrollAreaWidgetContents_5)
+        self.horizontalLayout_35.addWidget(self.scrollArea_3)
+        self.stackedWidget_2.addWidget(self.effects_panel)
+        self.verticalLayout_3.addWidget(self.stackedWidget_2)
+        self.frame_24 = QtWidgets.QFrame(self.panel_frame)
+        self.frame_24.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame_24.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_24.setObjectName("frame_24")
+        self.horizontalLayout_18 = QtWidgets.QHBoxLayout(self.frame_24)
+        self.horizontalLayout_18.setObjectName("horizontalLayout_18")
+        self.cancel_button = QtWidgets.QPushButton(self.frame_24)
+        self.cancel_button.setObjectName("cancel_button")
+        self.horizontalLayout_18.addWidget(self.cancel_button)
+        self.apply_button = QtWidgets.QPushButton(self.frame_24)
+        self.apply_button.setObjectName("apply_button")
+        self.horizontalLayout_18.addWidget(self.apply_button)
+        self.verticalLayout_3.addWidget(self.frame_24)
+        self.horizontalLayout_2.addWidget(self.panel_frame)
+        self.frame_9 = QtWidgets.QFrame(self.frame_2)
+        self.frame_9.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame_9.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_9.setObjectName("frame_9")
+        self.horizontalLayout_14 = QtWidgets.QHBoxLayout(self.frame_9)
+        self.horizontalLayout_14.setObjectName("horizontalLayout_14")
+        self.frame_16 = QtWidgets.QFrame(self.frame_9)
+        self.frame_16.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame_16.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_16.setObjectName("frame_16")
+        self.verticalLayout_4 = QtWidgets.QVBoxLayout(self.frame_16)
+        self.verticalLayout_4.setObjectName("verticalLayout_4")
+        self.frame_22 = QtWidgets.QFrame(self.frame_16)
+        self.frame_22.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame_22.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_22.setObjectName("frame_22")
+        self.horizontalLayout_16 = QtWidgets.QHBoxLayout(self.frame_22)
+        self.horizontalLayout_16.setObjectName("horizontalLayout_16")
+        self.canvas_resolution_button = QtWidgets.QPushButton(self.frame_22)
+        self.canvas_resolution_button.setObjectName("canvas_resolution_button")
+        self.horizontalLayout_16.addWidget(self.canvas_resolution_button)
+        self.verticalLayout_4.addWidget(self.frame_22)
+        self.visualizer_parent_frame = QtWidgets.QFrame(self.frame_16)
+        self.visualizer_parent_frame.setMinimumSize(QtCore.QSize(400, 400))
+        self.visualizer_parent_frame.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.visualizer_parent_frame.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.visualizer_parent_frame.setObjectName("visualizer_parent_frame")
+        self.horizontalLayout_15 = QtWidgets.QHBoxLayout(self.visualizer_parent_frame)
+        self.horizontalLayout_15.setObjectName("horizontalLayout_15")
+        self.visualizer = QtWidgets.QGraphicsView(self.visualizer_parent_frame)
+        self.visualizer.setFrameShape(QtWidgets.QFrame.Panel)
+        self.visualizer.setFrameShadow(QtWidgets.QFrame.Sunken)
+        self.visualizer.setLineWidth(5)
+        self.visualizer.setMidLineWidth(5)
+        self.visualizer.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
+        self.visualizer.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
+        self.visualizer.setSizeAdjustPolicy(QtWidgets.QAbstractScrollArea.AdjustToContents)
+        brush = QtGui.QBrush(QtGui.QColor(0, 0, 0, 120))
+        brush.setStyle(QtCore.Qt.CrossPattern)
+        self.visualizer.setBackgroundBrush(brush)
+        brush = QtGui.QBrush(QtGui.QColor(0, 0, 0))
+        brush.setStyle(QtCore.Qt.NoBrush)
+        self.visualizer.setForegroundBrush(brush)
+        self.visualizer.setInteractive(True)
+        self.visualizer.setCacheMode(QtWidgets.QGraphicsView.CacheNone)
+        self.visualizer.setResizeAnchor(QtWidgets.QGraphicsView.AnchorViewCenter)
+        self.visualizer.setObjectName("visualizer")
+        self.horizontalLayout_15.addWidget(self.visualizer)
+        self.verticalLayout_4.addWidget(self.visualizer_parent_frame)
+        self.frame_20 = QtWidgets.QFrame(self.frame_16)
+        self.frame_20.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame_20.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_20.setObjectName("frame_20")
+        self.horizontalLayout_17 = QtWidgets.QHBoxLayout(self.frame_20)
+        self.horizontalLayout_17.setObjectName("horizontalLayout_17")
+        self.save_button = QtWidgets.QPushButton(self.frame_20)
+        self.save_button.setObjectName("save_button")
+        self.horizontalLayout_17.addWidget(self.save_button)
+        self.verticalLayout_4.addWidget(self.frame_20)
+        self.horizontalLayout_14.addWidget(self.frame_16)
+        self.layer_frame = QtWidgets.QFrame(self.frame_9)
+        self.layer_frame.setMinimumSize(QtCore.QSize(350, 0))
+        self.layer_frame.setMaximumSize(QtCore.QSize(300, 16777215))
+        self.layer_frame.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.layer_frame.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.layer_frame.setObjectName("layer_frame")
+        self.verticalLayout_10 = QtWidgets.QVBoxLayout(self.layer_frame)
+        self.verticalLayout_10.setObjectName("verticalLayout_10")
+        self.frame_21 = QtWidgets.QFrame(self.layer_frame)
+        self.frame_21.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame_21.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_21.setObjectName("frame_21")
+        self.verticalLayout_11 = QtWidgets.QVBoxLayout(self.frame_21)
+        self.verticalLayout_11.setObjectName("verticalLayout_11")
+        self.frame_19 = QtWidgets.QFrame(self.frame_21)
+        self.frame_19.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame_19.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_19.setObjectName("frame_19")
+        self.horizontalLayout_19 = QtWidgets.QHBoxLayout(self.frame_19)
+        self.horizontalLayout_19.setObjectName("horizontalLayout_19")
+        self.add_layer_button = QtWidgets.QPushButton(self.frame_19)
+        self.add_layer_button.setObjectName("add_layer_button")
+        self.horizontalLayout_19.addWidget(self.add_layer_button)
+        self.verticalLayout_11.addWidget(self.frame_19)
+        self.layer_visualization_frame = QtWidgets.QFrame(self.frame_21)
+        self.layer_visualization_frame.setFrameShape(QtWidgets.QFrame.Panel)
+        self.layer_visualization_frame.setFrameShadow(QtWidgets.QFrame.Sunken)
+        self.layer_visualization_frame.setLineWidth(5)
+        self.layer_visualization_frame.setMidLineWidth(5)
+        self.layer_visualization_frame.setObjectName("layer_visualization_frame")
+        self.horizontalLayout_20 = QtWidgets.QHBoxLayout(self.layer_visualization_frame)
+        self.horizontalLayout_20.setObjectName("horizontalLayout_20")
+        self.scrollArea = QtWidgets.QScrollArea(self.layer_visualization_frame)
+        self.scrollArea.setFrameShape(QtWidgets.QFrame.NoFrame)
+        self.scrollArea.setFrameShadow(QtWidgets.QFrame.Plain)
+        self.scrollArea.setLineWidth(5)
+        self.scrollArea.setMidLineWidth(5)
+        self.scrollArea.setWidgetResizable(True)
+        self.scrollArea.setObjectName("scrollArea")
+        self.scroll_layer_widget = QtWidgets.QWidget()
+        self.scroll_layer_widget.setGeometry(QtCore.QRect(0, 0, 288, 411))
+        self.scroll_layer_widget.setObjectName("scroll_layer_widget")
+        self.verticalLayout_12 = QtWidgets.QVBoxLayout(self.scroll_layer_widget)
+        self.verticalLayout_12.setObjectName("verticalLayout_12")
+        self.frame_8 = QtWidgets.QFrame(self.scroll_layer_widget)
+        self.frame_8.setMinimumSize(QtCore.QSize(0, 0))
+        self.frame_8.setFrameShape(QtWidgets.QFrame.NoFrame)
+        self.frame_8.setFrameShadow(QtWidgets.QFrame.Sunken)
+        self.frame_8.setLineWidth(5)
+        self.frame_8.setMidLineWidth(5)
+        self.frame_8.setObjectName("frame_8")
+        self.horizontalLayout_21 = QtWidgets.QHBoxLayout(self.frame_8)
+        self.horizontalLayout_21.setObjectName("horizontalLayout_21")
+        self.layer_holder_frame = QtWidgets.QFrame(self.frame_8)
+        self.layer_holder_frame.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.layer_holder_frame.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.layer_holder_frame.setObjectName("layer_holder_frame")
+        self.verticalLayout_17 = QtWidgets.QVBoxLayout(self.layer_holder_frame)
+        self.verticalLayout_17.setObjectName("verticalLayout_17")
+        self.horizontalLayout_21.addWidget(self.layer_holder_frame)
+        self.verticalLayout_12.addWidget(self.frame_8)
+        self.scrollArea.setWidget(self.scroll_layer_widget)
+        self.horizontalLayout_20.addWidget(self.scrollArea)
+        self.verticalLayout_11.addWidget(self.layer_visualization_frame)
+        self.verticalLayout_10.addWidget(self.frame_21)
+        self.horizontalLayout_14.addWidget(self.layer_frame)
+        self.horizontalLayout_2.addWidget(self.frame_9)
+        self.verticalLayout.addWidget(self.frame_2)
+        self.frame_3 = QtWidgets.QFrame(self.centralwidget)
+        self.frame_3.setEnabled(True)
+        self.frame_3.setStyleSheet("QFrame { margin: 0px; padding: 0px; }")
+        self.frame_3.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.frame_3.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_3.setObjectName("frame_3")
+        self.verticalLayout_6 = QtWidgets.QVBoxLayout(self.frame_3)
+        self.verticalLayout_6.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_6.setSpacing(0)
+        self.verticalLayout_6.setObjectName("verticalLayout_6")
+        self.pushButton_33 = QtWidgets.QPushButton(self.frame_3)
+        self.pushButton_33.setObjectName("pushButton_33")
+        self.verticalLayout_6.addWidget(self.pushButton_33)
+        self.verticalLayout.addWidget(self.frame_3)
+        MainWindow.setCentralWidget(self.centralwidget)
+
+        self.retranslateUi(MainWindow)
+        self.stackedWidget_2.setCurrentIndex(0)
+        QtCore.QMetaObject.connectSlotsByName(MainWindow)
+
+    def retranslateUi(self, MainWindow):
+        _translate = QtCore.QCoreApplication.translate
+        MainWindow.setWindowTitle(_translate("MainWindow", "MainWindow"))
+        self.label_5.setText(_translate("MainWindow", "Unificator"))
+        self.label_7.setText(_translate("MainWindow", "Image"))
+        self.adjust_button.setText(_translate("MainWindow", "Adjust"))
+        self.effects_button.setText(_translate("MainWindow", "Effects"))
+        self.label_9.setText(_translate("MainWindow", "Transform"))
+        self.pushButton_5.setText(_translate("MainWindow", "Resize"))
+        self.pushButton_8.setText(_translate("MainWindow", "Cut"))
+        self.pushButton_6.setText(_translate("MainWindow", "Crop"))
+        self.pushButton_7.setText(_translate("MainWindow", "Rotate and Flip"))
+        self.label_16.setText(_translate("MainWindow", "Black and White"))
+        self.pushButton_26.setText(_translate("MainWindow", "Resize"))
+        self.pushButton_27.setText(_translate("MainWindow", "Cut"))
+        self.pushButton_28.setText(_translate("MainWindow", "Crop"))
+        self.pushButton_29.setText(_translate("MainWindow", "Rotate and Flip"))
+        self.cancel_button.setText(_translate("MainWindow", "Cancel"))
+        self.apply_button.setText(_translate("MainWindow", "Apply"))
+        self.canvas_resolution_button.setText(_translate("MainWindow", "Change Canvas Resolution"))
+        self.save_button.setText(_translate("MainWindow", "Save The Image"))
+        self.add_layer_button.setText(_translate("MainWindow", "Add Layer"))
+        self.pushButton_33.setText(_translate("MainWindow", "PushButton"))
+import res_rcc
@@ -0,0 +1,59 @@
+from PyQt5.QtWidgets import QFrame, QLabel, QPushButton, QVBoxLayout
+from PyQt5.QtCore import Qt, pyqtSignal
+from core.adjustments import ADJUSTMENTS
+from .parameter_form import ParameterForm
+from .style import PANEL_CONTROLS_STYLESHEET
+
+class AdjustPanel(QFrame):
+    """Adjustment layer controls of the Adjust panel.
+
+    A button per core.adjustments kind asks for a new adjustment layer.
+    While the active layer is an adjustment layer its parameters are shown
+    as sliders: a drag emits paramsChanged at every step, so the canvas
+    follows live, and paramsCommitted once on release with the values
+    from before the drag, so the whole drag is a single undo step.
+    """
+
+    adjustmentRequested = pyqtSignal(str)  # core.adjustments kind
+    paramsChanged = pyqtSignal(object, dict)  # layer, params
+    paramsCommitted = pyqtSignal(object, dict, dict)  # layer, params, previous params
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.layer = None  # AdjustmentLayer whose sliders are shown
+        self._setup_ui()
+
+    def _setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(QLabel("Adjustments"), 0, Qt.AlignHCenter)
+        for kind, (label, _) in ADJUSTMENTS.items():
+            button = QPushButton(label)
+            button.clicked.connect(lambda checked=False, kind=kind: self.adjustmentRequested.emit(kind))
+            layout.addWidget(button)
+
+        self.title_label = QLabel()
+        layout.addWidget(self.title_label, 0, Qt.AlignHCenter)
+        self.form = ParameterForm()
+        self.form.paramsChanged.connect(lambda params: self.paramsChanged.emit(self.layer, params))
+        self.form.paramsCommitted.connect(
+            lambda params, previous: self.paramsCommitted.emit(self.layer, params, previous))
+        layout.addWidget(self.form)
+        self.title_label.hide()
+        self.form.hide()
+        self.setStyleSheet(PANEL_CONTROLS_STYLESHEET)
+
+    def set_layer(self, layer):
+        """Show the sliders of layer if it is an adjustment layer, else none."""
+        self.layer = layer if layer is not None and layer.is_adjustment else None
+        self.title_label.setVisible(self.layer is not None)
+        self.form.setVisible(self.layer is not None)
+        if self.layer is not None:
+            label, parameters = ADJUSTMENTS[self.layer.kind]
+            self.title_label.setText(label)
+            self.form.set_parameters(parameters, self.layer.params)
+
+    def refresh(self):
+        """Move the sliders to the layer's current parameters, e.g. after an undo."""
+        if self.layer is not None and not self.form.is_dragging():
+            self.form.set_values(self.layer.params)
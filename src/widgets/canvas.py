@@ -1,6 +1,8 @@
 from PyQt5 import QtWidgets, QtCore, QtGui
-from PyQt5.QtGui import QPainter, QBrush, QColor, QPixmap
+from PyQt5.QtGui import QPainter, QBrush, QColor, QPixmap, QPixmapCache
 from PyQt5.QtCore import QRectF, Qt, QPointF, QSizeF, QTimer
+from .composite_item import CompositeItem
+from core.profiler import profiler, traced
 
 class Canvas(QtWidgets.QGraphicsView):
     """Custom canvas widget for image visualization."""
@@ -11,6 +13,7 @@ class Canvas(QtWidgets.QGraphicsView):
         self._init_variables()
         self._create_scene()
         self._setup_canvas_rect()
+        self._setup_composite_item()
         self.set_initial_zoom()
 
     def _setup_canvas(self):
@@ -21,7 +24,12 @@ class Canvas(QtWidgets.QGraphicsView):
         self.setRenderHint(QPainter.Antialiasing)
         self.setDragMode(QtWidgets.QGraphicsView.NoDrag)
         self.setTransformationAnchor(QtWidgets.QGraphicsView.NoAnchor)
-        self.setViewportUpdateMode(QtWidgets.QGraphicsView.FullViewportUpdate)
+        # Repaint only the dirty regions; panning scrolls the viewport pixels
+        # and the checkerboard comes from the cached background pixmap.
+        self.setViewportUpdateMode(QtWidgets.QGraphicsView.MinimalViewportUpdate)
+        self.setCacheMode(QtWidgets.QGraphicsView.CacheBackground)
+        # drawBackground covers every exposed pixel, which lets Qt blit on scroll
+        self.viewport().setAttribute(Qt.WA_OpaquePaintEvent)
         self.setBackgroundBrush(QBrush(QColor(57, 57, 57)))
 
     def _init_variables(self):
@@ -29,9 +37,15 @@ class Canvas(QtWidgets.QGraphicsView):
         self._drag_start_pos = None
         self.current_scale = 1.0
         self.is_panning = False
-        self.image_items = []  # Store all image items
+        self.document = None  # core.document.Document being shown
+        self.active_layer = None  # Layer selected in the layer panel
         self.canvas_size = QSizeF(800, 600)
         self._center_requested = False  # Flag to track centering request
+        self.checker_brush = self._create_checker_brush()
+        QPixmapCache.setCacheLimit(256 * 1024)  # KB shared by all composite tiles
+        self.frame_count = 0  # Number of viewport paint events
+        self.last_painted_pixels = 0  # Pixels repainted by the last frame
+        self.total_painted_pixels = 0
 
     def _create_scene(self):
         """Create and setup the graphics scene."""
@@ -51,6 +65,13 @@ class Canvas(QtWidgets.QGraphicsView):
             QtGui.QBrush(Qt.transparent)
         )
 
+    def _setup_composite_item(self):
+        """Add the item that paints the composited layer stack."""
+        self.composite_item = CompositeItem(self.canvas_size)
+        self.composite_item.set_document(self.document)
+        self.composite_item.set_active_layer(self.active_layer)
+        self.scene.addItem(self.composite_item)
+
     def set_initial_zoom(self):
         """Set the initial zoom level and center the canvas."""
         # Set initial zoom to 50%
@@ -68,21 +89,52 @@ class Canvas(QtWidgets.QGraphicsView):
         # Ensure the canvas is visible and centered after Qt finishes layout
         QTimer.singleShot(0, self._ensure_centered)
 
+    @traced("drawBackground")
     def drawBackground(self, painter, rect):
         """Draw checkered pattern for the entire workspace."""
+        painter.fillRect(rect, self.checker_brush)
+
+    def _create_checker_brush(self, grid_size=20):
+        """Build a texture brush holding one 2x2 tile of the checkered pattern.
+
+        The brush is anchored at the scene origin and scaled by the view
+        transform, so a repaint is a single fill whatever the zoom level.
+        """
         dark_gray = QColor(80, 80, 80)
         darker_gray = QColor(60, 60, 60)
-        grid_size = 20
-
-        left = int(rect.left()) - (int(rect.left()) % grid_size)
-        top = int(rect.top()) - (int(rect.top()) % grid_size)
 
-        for x in range(left, int(rect.right()), grid_size):
-            for y in range(top, int(rect.bottom()), grid_size):
-                if ((x // grid_size + y // grid_size) % 2) == 0:
-                    painter.fillRect(x, y, grid_size, grid_size, dark_gray)
-                else:
-                    painter.fillRect(x, y, grid_size, grid_size, darker_gray)
+        tile = QPixmap(grid_size * 2, grid_size * 2)
+        tile.fill(darker_gray)
+        painter = QPainter(tile)
+        painter.fillRect(0, 0, grid_size, grid_size, dark_gray)
+        painter.fillRect(grid_size, grid_size, grid_size, grid_size, dark_gray)
+        painter.end()
+        return QBrush(tile)
+
+    def paintEvent(self, event):
+        """Paint the viewport and record how many pixels the frame touched."""
+        painted_pixels = sum(rect.width() * rect.height() for rect in event.region().rects())
+        self.frame_count += 1
+        self.last_painted_pixels = painted_pixels
+        self.total_painted_pixels += painted_pixels
+        with profiler.span("paint"):
+            super().paintEvent(event)
+        profiler.counter("painted pixels", pixels=painted_pixels)
+
+    def paint_stats(self):
+        """Return the painted-pixel counters gathered since the last reset."""
+        return {
+            'frames': self.frame_count,
+            'last_painted_pixels': self.last_painted_pixels,
+            'total_painted_pixels': self.total_painted_pixels,
+            'viewport_pixels': self.viewport().width() * self.viewport().height(),
+        }
+
+    def reset_paint_stats(self):
+        """Reset the painted-pixel counters."""
+        self.frame_count = 0
+        self.last_painted_pixels = 0
+        self.total_painted_pixels = 0
 
     def mousePressEvent(self, event):
         """Handle mouse press events."""
@@ -130,31 +182,27 @@ class Canvas(QtWidgets.QGraphicsView):
 
         event.accept()
 
-    def clear_scene(self):
-        """Clear all items from the scene."""
-        if hasattr(self, 'scene'):
-            self.scene.clear()
-            self._setup_canvas_rect()
-            self.image_items.clear()
-
-    def add_image_layer(self, pixmap):
-        """Add an image layer to the scene."""
-        if pixmap:
-            scaled_pixmap = pixmap.scaled(
-                self.canvas_size.toSize(),
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation
-            )
-            
-            image_item = self.scene.addPixmap(scaled_pixmap)
-            x_offset = -scaled_pixmap.width() / 2
-            y_offset = -scaled_pixmap.height() / 2
-            image_item.setPos(x_offset, y_offset)
-            self.image_items.append(image_item)
+    def set_document(self, document):
+        """Show a core.document.Document's layer stack on the canvas."""
+        self.document = document
+        self.composite_item.set_document(document)
+
+    def set_active_layer(self, layer):
+        """Tell the composite which layer is being edited (None for no layer)."""
+        self.active_layer = layer
+        self.composite_item.set_active_layer(layer)
+
+    def set_preview(self, layer):
+        """Draw a stand-in for the active layer, e.g. a core.graph.FilteredLayer (None to stop)."""
+        self.composite_item.set_preview(layer)
+
+    def refresh(self):
+        """Repaint the composite after the layer stack or a layer changed."""
+        self.composite_item.update()
 
     def has_layers(self):
-        """Check if canvas has any layers."""
-        return len(self.image_items) > 0
+        """Check if canvas has any visible layers."""
+        return bool(self.composite_item.visible_layers())
         
     def _ensure_centered(self):
         """Ensure the canvas is centered in the viewport."""
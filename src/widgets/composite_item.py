@@ -0,0 +1,137 @@
+import math
+from PyQt5 import QtWidgets
+from PyQt5.QtGui import QImage, QPainter, QPixmap, QPixmapCache
+from PyQt5.QtCore import QRectF
+from core.compositor import CompositeCache, stack_state
+from core.profiler import profiler
+from core.tiles import TILE_SIZE, tile_rect
+
+class CompositeItem(QtWidgets.QGraphicsItem):
+    """Graphics item that paints the flattened layer stack over the canvas rect.
+
+    The stack is composited by core.compositor, so blend modes look the
+    same on the canvas as in an export. Each paint picks a composite
+    resolution of a power of two output pixels per canvas unit, the
+    smallest that still has one pixel per device pixel (capped at the
+    layers' native resolution), and composites the missing tiles of the
+    exposed rect in parallel. Tiles are cached in the global QPixmapCache
+    under a key built from every visible layer's id, version and
+    compositing properties, so any change to the stack simply misses the
+    cache and stale tiles age out of it.
+
+    Missing tiles come from a CompositeCache split around the active
+    layer, so edits to the active layer recomposite only that layer over
+    the cached groups below and above it. A preview layer set with
+    set_preview is drawn in place of the active layer the same way, so a
+    filter preview only filters the active layer's exposed tiles.
+    """
+
+    def __init__(self, canvas_size, parent=None):
+        super().__init__(parent)
+        self.canvas_size = (canvas_size.width(), canvas_size.height())
+        self.document = None  # core.document.Document shown by the item
+        self.active_layer = None  # Layer being edited, composited on its own
+        self.preview = None  # Stand-in drawn in place of the active layer
+        self.cache = CompositeCache()
+        self.setFlag(QtWidgets.QGraphicsItem.ItemUsesExtendedStyleOption)
+
+    def boundingRect(self):
+        width, height = self.canvas_size
+        return QRectF(-width / 2, -height / 2, width, height)
+
+    def set_document(self, document):
+        self.document = document
+        self.cache.clear()
+        self.update()
+
+    def set_active_layer(self, layer):
+        """Choose the layer the cached groups are split around."""
+        self.active_layer = layer
+
+    def set_preview(self, layer):
+        """Draw layer in place of the active layer until set back to None."""
+        self.preview = layer
+        self.update()
+
+    def stack(self):
+        """Bottom-to-top layers to composite, with the preview in place of the active layer."""
+        if self.document is None:
+            return []
+        if self.preview is None or self.active_layer is None:
+            return self.document.layers
+        return [self.preview if layer is self.active_layer else layer for layer in self.document]
+
+    def visible_layers(self):
+        """Bottom-to-top layers that contribute to the composite."""
+        return [layer for layer in self.stack() if layer.visible and layer.opacity > 0]
+
+    def composite_scale(self, scale, layers):
+        """Output pixels per canvas unit to composite at for a view scale."""
+        width, height = self.canvas_size
+        native = max([1.0] + [max(layer.width / width, layer.height / height)
+                              for layer in layers if not layer.is_adjustment])
+        exponent = math.ceil(math.log2(max(scale, 1 / 64)))
+        return 2.0 ** min(exponent, math.ceil(math.log2(native)))
+
+    def paint(self, painter, option, widget=None):
+        layers = self.visible_layers()
+        bounds = self.boundingRect()
+        exposed = option.exposedRect.intersected(bounds)
+        if not layers or exposed.isEmpty():
+            return
+
+        scale = self.composite_scale(option.levelOfDetailFromTransform(painter.worldTransform()), layers)
+        output_size = (int(math.ceil(self.canvas_size[0] * scale)),
+                       int(math.ceil(self.canvas_size[1] * scale)))
+        tile_units = TILE_SIZE / scale  # Canvas units covered by one tile
+        first_col = int((exposed.left() - bounds.left()) // tile_units)
+        last_col = min(int(math.ceil((exposed.right() - bounds.left()) / tile_units)),
+                       math.ceil(output_size[0] / TILE_SIZE))
+        first_row = int((exposed.top() - bounds.top()) // tile_units)
+        last_row = min(int(math.ceil((exposed.bottom() - bounds.top()) / tile_units)),
+                       math.ceil(output_size[1] / TILE_SIZE))
+
+        prefix = self._cache_prefix(layers, scale)
+        keys = {(col, row): f"{prefix}:{col}:{row}"
+                for row in range(first_row, last_row) for col in range(first_col, last_col)}
+        tiles = {}
+        missing = []
+        for position, key in keys.items():
+            tile = QPixmapCache.find(key)
+            if tile is not None and not tile.isNull():
+                tiles[position] = tile
+            else:
+                missing.append(position)
+
+        if missing:
+            rects = [tile_rect(col, row, *output_size) for col, row in missing]
+            with profiler.span("composite", tiles=len(missing)):
+                active = self.active_layer
+                if self.preview is not None and active is not None:
+                    active = self.preview
+                composited = self.cache.composite_tiles(self.stack(), active,
+                                                        self.canvas_size, output_size, rects)
+            for position, pixels in zip(missing, composited):
+                tile = QPixmap.fromImage(self._to_qimage(pixels))
+                QPixmapCache.insert(keys[position], tile)
+                tiles[position] = tile
+
+        painter.setRenderHint(QPainter.Antialiasing, False)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform, True)
+        for (col, row), tile in tiles.items():
+            target = QRectF(bounds.left() + col * tile_units, bounds.top() + row * tile_units,
+                            tile.width() / scale, tile.height() / scale)
+            painter.drawPixmap(target, tile, QRectF(tile.rect()))
+
+    @staticmethod
+    def _cache_prefix(layers, scale):
+        """Key prefix identifying the composite of these layers at this scale."""
+        return f"composite:{hash(stack_state(layers)):x}:{scale}"
+
+    @staticmethod
+    def _to_qimage(pixels):
+        """Copy premultiplied BGRA pixels into a QImage."""
+        height, width = pixels.shape[:2]
+        image = QImage(pixels.data, width, height, pixels.strides[0],
+                       QImage.Format_ARGB32_Premultiplied)
+        return image.copy()
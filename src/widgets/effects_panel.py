@@ -0,0 +1,118 @@
+from PyQt5.QtWidgets import QFrame, QLabel, QListWidget, QPushButton, QVBoxLayout
+from PyQt5.QtCore import Qt, pyqtSignal
+from core.filters import FILTERS, default_params
+from .parameter_form import ParameterForm
+from .style import PANEL_CONTROLS_STYLESHEET
+
+class EffectsPanel(QFrame):
+    """Filter chain controls of the Effects panel.
+
+    A button per core.filters kind adds that filter to the end of a chain
+    previewed on the active raster layer. The chain is listed in order,
+    and the sliders of the selected filter are shown, so any filter of
+    the chain can be tweaked. previewChanged asks for the preview to be
+    redrawn: with proxy set while a slider is being dragged, so the
+    preview can use a reduced resolution, and without it once the values
+    settle. Applying the chain at full resolution is left to the panel's
+    Apply button, see MainWindow.
+    """
+
+    previewChanged = pyqtSignal(object, bool)  # [(core.filters kind, params)], proxy
+    previewCleared = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.layer = None  # Raster layer the chain is previewed on
+        self.steps = []  # [kind, params] of each filter of the chain, in order
+        self._setup_ui()
+
+    def _setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(QLabel("Filters"), 0, Qt.AlignHCenter)
+        self.buttons = []
+        for kind, (label, _) in FILTERS.items():
+            button = QPushButton(label)
+            button.clicked.connect(lambda checked=False, kind=kind: self.add(kind))
+            layout.addWidget(button)
+            self.buttons.append(button)
+
+        self.chain_list = QListWidget()
+        self.chain_list.setMaximumHeight(100)
+        self.chain_list.currentRowChanged.connect(self._show_step)
+        layout.addWidget(self.chain_list)
+        self.remove_button = QPushButton("Remove Filter")
+        self.remove_button.clicked.connect(self.remove_current)
+        layout.addWidget(self.remove_button)
+        self.title_label = QLabel()
+        layout.addWidget(self.title_label, 0, Qt.AlignHCenter)
+        self.form = ParameterForm()
+        self.form.paramsChanged.connect(lambda params: self._handle_params(params, True))
+        self.form.paramsCommitted.connect(lambda params, previous: self._handle_params(params, False))
+        layout.addWidget(self.form)
+        self._update_chain_visible()
+        self.set_layer(None)
+        self.setStyleSheet(PANEL_CONTROLS_STYLESHEET)
+
+    def set_layer(self, layer):
+        """Filter layer from now on; only raster layers can be filtered."""
+        if layer is not None and layer.is_adjustment:
+            layer = None
+        if layer is not self.layer:
+            self.clear()
+        self.layer = layer
+        for button in self.buttons:
+            button.setEnabled(layer is not None)
+
+    def add(self, kind):
+        """Add a filter with its default parameters to the end of the chain."""
+        self.steps.append([kind, default_params(kind)])
+        self.chain_list.addItem(FILTERS[kind][0])
+        self._update_chain_visible()
+        self.chain_list.setCurrentRow(len(self.steps) - 1)
+        self._emit_preview(False)
+
+    def remove_current(self):
+        """Take the selected filter out of the chain."""
+        row = self.chain_list.currentRow()
+        if row < 0:
+            return
+        del self.steps[row]
+        self.chain_list.takeItem(row)
+        self._update_chain_visible()
+        if self.steps:
+            self._emit_preview(False)
+        else:
+            self.previewCleared.emit()
+
+    def clear(self):
+        """Stop previewing, e.g. once the chain was applied or cancelled."""
+        if not self.steps:
+            return
+        self.steps = []
+        self.chain_list.clear()
+        self._update_chain_visible()
+        self.previewCleared.emit()
+
+    def _update_chain_visible(self):
+        for widget in (self.chain_list, self.remove_button, self.title_label, self.form):
+            widget.setVisible(bool(self.steps))
+
+    def _show_step(self, row):
+        """Show the sliders of the filter at row of the chain."""
+        if row < 0:
+            return
+        kind, params = self.steps[row]
+        label, parameters = FILTERS[kind]
+        self.title_label.setText(label)
+        self.form.set_parameters(parameters, params)
+
+    def _handle_params(self, params, proxy):
+        row = self.chain_list.currentRow()
+        if row < 0:
+            return
+        self.steps[row][1] = params
+        self._emit_preview(proxy)
+
+    def _emit_preview(self, proxy):
+        self.previewChanged.emit([(kind, dict(params)) for kind, params in self.steps], proxy)
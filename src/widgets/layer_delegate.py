@@ -0,0 +1,109 @@
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyle
+from PyQt5.QtCore import Qt, pyqtSignal, QEvent, QRect, QSize
+from PyQt5.QtGui import QColor, QPainter, QPen, QFont, QFontMetrics, QCursor
+from .layer_model import LayerListModel
+
+class LayerDelegate(QStyledItemDelegate):
+    """Paints one layer row: visibility toggle, thumbnail, name and delete button.
+
+    Rows are painted, not built from child widgets, so a layer costs nothing
+    until it is scrolled into view. Clicks on the two buttons are turned
+    into signals carrying the row.
+    """
+
+    visibilityToggled = pyqtSignal(int)  # row
+    deleteRequested = pyqtSignal(int)  # row
+
+    ROW_HEIGHT = 50
+    BUTTON_SIZE = 24
+    THUMBNAIL_SIZE = 40
+    MARGIN = 5
+
+    BACKGROUND = QColor("#2d2d2d")
+    SELECTED_BACKGROUND = QColor("#383838")
+    BUTTON_BACKGROUND = QColor("#3d3d3d")
+    BUTTON_HOVER = QColor("#4d4d4d")
+    DROP_TARGET = QColor("#4a9eff")
+    TEXT = QColor("#ffffff")
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT + 1)
+
+    def button_rects(self, rect):
+        """Return the visibility, thumbnail, name and delete rects of a row."""
+        row = self._row_rect(rect)
+        center_y = row.center().y()
+        visibility = QRect(row.left() + self.MARGIN, center_y - self.BUTTON_SIZE // 2,
+                           self.BUTTON_SIZE, self.BUTTON_SIZE)
+        thumbnail = QRect(visibility.right() + 1 + self.MARGIN, center_y - self.THUMBNAIL_SIZE // 2,
+                          self.THUMBNAIL_SIZE, self.THUMBNAIL_SIZE)
+        delete = QRect(row.right() - self.MARGIN - self.BUTTON_SIZE + 1, center_y - self.BUTTON_SIZE // 2,
+                       self.BUTTON_SIZE, self.BUTTON_SIZE)
+        name = QRect(thumbnail.right() + 1 + 2 * self.MARGIN, row.top(),
+                     delete.left() - thumbnail.right() - 3 * self.MARGIN, row.height())
+        return visibility, thumbnail, name, delete
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        row_rect = self._row_rect(option.rect)
+        visibility, thumbnail_rect, name_rect, delete = self.button_rects(option.rect)
+
+        selected = bool(option.state & QStyle.State_Selected)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(self.SELECTED_BACKGROUND if selected else self.BACKGROUND)
+        painter.drawRoundedRect(row_rect, 4, 4)
+
+        view = option.widget
+        if view is not None and getattr(view, 'drop_row', -1) == index.row():
+            painter.setPen(QPen(self.DROP_TARGET, 2))
+            painter.setBrush(Qt.NoBrush)
+            painter.drawRoundedRect(row_rect.adjusted(1, 1, -1, -1), 4, 4)
+
+        hover_pos = view.viewport().mapFromGlobal(QCursor.pos()) if view is not None else None
+        visible = index.data(LayerListModel.VisibleRole)
+        self._paint_button(painter, visibility, "👁" if visible else "⊘", hover_pos)
+        self._paint_button(painter, delete, "×", hover_pos)
+
+        thumbnail = index.data(Qt.DecorationRole)
+        if thumbnail is not None:
+            target = QRect(0, 0, thumbnail.width(), thumbnail.height())
+            target.moveCenter(thumbnail_rect.center())
+            painter.drawPixmap(target, thumbnail)
+        painter.setPen(QPen(self.BUTTON_BACKGROUND, 1))
+        painter.setBrush(Qt.NoBrush)
+        painter.drawRect(thumbnail_rect)
+
+        font = QFont(option.font)
+        font.setPixelSize(12)
+        painter.setFont(font)
+        painter.setPen(self.TEXT)
+        name = QFontMetrics(font).elidedText(index.data(Qt.DisplayRole), Qt.ElideRight, name_rect.width())
+        painter.drawText(name_rect, Qt.AlignVCenter | Qt.AlignLeft, name)
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            visibility, _, _, delete = self.button_rects(option.rect)
+            if visibility.contains(event.pos()):
+                self.visibilityToggled.emit(index.row())
+                return True
+            if delete.contains(event.pos()):
+                self.deleteRequested.emit(index.row())
+                return True
+        return super().editorEvent(event, model, option, index)
+
+    def _paint_button(self, painter, rect, text, hover_pos):
+        hovered = hover_pos is not None and rect.contains(hover_pos)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(self.BUTTON_HOVER if hovered else self.BUTTON_BACKGROUND)
+        painter.drawRoundedRect(rect, 3, 3)
+        font = painter.font()
+        font.setPixelSize(16)
+        painter.setFont(font)
+        painter.setPen(self.TEXT)
+        painter.drawText(rect, Qt.AlignCenter, text)
+
+    def _row_rect(self, rect):
+        """The painted row, inset like the old layer widget margins."""
+        return rect.adjusted(2, 0, -2, -1)
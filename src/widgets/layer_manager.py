@@ -1,16 +1,32 @@
-from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QFrame, QScrollArea, QApplication)
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QColor
-from .layer_widget import LayerWidget
+from PyQt5.QtWidgets import QVBoxLayout, QFrame
+from PyQt5.QtCore import pyqtSignal
+from core.adjustments import AdjustmentLayer
+from core.document import Document
+from core.image_handler import ImageHandler
+from core.profiler import traced
+from core.history import (History, AddLayersCommand, RemoveLayerCommand, MoveLayerCommand,
+                          SetVisibilityCommand, SetBlendModeCommand, SetAdjustmentCommand,
+                          ReplacePixelsCommand)
+from core.thumbnailer import Thumbnailer
+from .layer_delegate import LayerDelegate
+from .layer_model import LayerListModel
+from .layer_view import LayerListView
+from .style import LAYER_PANEL_STYLESHEET
 
 class LayerManager(QFrame):
     """Manages the layer stack with Pixlr-style vertical reordering."""
+
+    activeLayerChanged = pyqtSignal(object)  # Layer, AdjustmentLayer or None
     
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.layers = []
+        self.document = Document(getattr(parent, 'tile_cache', None))
+        self.thumbnailer = Thumbnailer(parent=self)
+        self.model = LayerListModel(self.document, self.thumbnailer, self)
+        self.history = getattr(parent, 'history', None) or History()
         self.main_window = parent
-        self.start_index = 1  # Initialize the starting index
+        self.start_index = 1  # Number given to the next new layer's name
+        self.active_layer = None  # Layer of the current row, composited apart from the rest
         self._setup_ui()
         
     def _setup_ui(self):
@@ -18,144 +34,187 @@ class LayerManager(QFrame):
         self.main_layout.setContentsMargins(0, 0, 0, 0)
         self.main_layout.setSpacing(0)
         
-        # Scroll area with custom styling
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        
-        # Container for layers
-        self.layer_container = QWidget()
-        self.layer_layout = QVBoxLayout(self.layer_container)
-        self.layer_layout.setAlignment(Qt.AlignTop)
-        self.layer_layout.setSpacing(1)
-        self.layer_layout.setContentsMargins(2, 2, 2, 2)
-        
-        self.scroll_area.setWidget(self.layer_container)
-        self.main_layout.addWidget(self.scroll_area)
+        # Only the rows in view are painted by the delegate
+        self.list_view = LayerListView(self)
+        self.list_view.setModel(self.model)
+        self.delegate = LayerDelegate(self.list_view)
+        self.list_view.setItemDelegate(self.delegate)
+        self.list_view.layerMoved.connect(self._handle_layer_moved)
+        self.list_view.blendModeSelected.connect(self._handle_blend_mode_selected)
+        self.list_view.selectionModel().currentChanged.connect(self._handle_current_changed)
+        self.delegate.visibilityToggled.connect(self._handle_visibility_toggled)
+        self.delegate.deleteRequested.connect(self._handle_layer_deleted)
+        self.main_layout.addWidget(self.list_view)
         
-        # Enhanced styling
-        self.setStyleSheet("""
-            QFrame {
-                background-color: #1e1e1e;
-                border: none;
-            }
-            QScrollArea {
-                border: none;
-                background-color: transparent;
-            }
-            QWidget#layer_container {
-                background-color: transparent;
-            }
-            QScrollBar:vertical {
-                border: none;
-                background: #2d2d2d;
-                width: 10px;
-                margin: 0px;
-            }
-            QScrollBar::handle:vertical {
-                background: #4d4d4d;
-                min-height: 20px;
-                border-radius: 5px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background: #5d5d5d;
-            }
-            QScrollBar::add-line:vertical,
-            QScrollBar::sub-line:vertical {
-                height: 0px;
-            }
-            QScrollBar::add-page:vertical,
-            QScrollBar::sub-page:vertical {
-                background: none;
-            }
-        """)
-        self.layer_container.setObjectName("layer_container")
-
-    def add_layer(self, pixmap=None):
-        """Add a new layer with automatic sequential naming."""
-        layer_name = f"Layer {self.start_index}"
-        layer_widget = LayerWidget(layer_name, len(self.layers), pixmap, self.layer_container)
-        layer_widget.layerMoved.connect(self._handle_layer_moved)
-        layer_widget.layerVisibilityChanged.connect(self._handle_visibility_changed)
-        layer_widget.layerDeleted.connect(self._handle_layer_deleted)
-        
-        self.layers.insert(0, layer_widget)
-        self.layer_layout.insertWidget(0, layer_widget)
-        self._update_layer_indices()
-        self._update_canvas()
-        self.scroll_area.ensureWidgetVisible(layer_widget)
-        self.start_index += 1
+        # One shared style sheet for the whole panel, parsed once
+        self.setStyleSheet(LAYER_PANEL_STYLESHEET)
 
-    def _update_layer_indices(self):
-        """Update indices after reordering."""
-        for i, layer in enumerate(self.layers):
-            layer.index = len(self.layers) - 1 - i
+    def add_layer(self, layer):
+        """Add a core.document.Layer on top of the stack with sequential naming."""
+        self.add_layers([layer])
 
-    def _handle_layer_moved(self, from_index, to_index):
-        """Handle layer reordering."""
-        if from_index == to_index:
+    def add_layers(self, layers):
+        """Add several layers on top of the stack, in order, as one undo step."""
+        layers = list(layers)
+        if not layers:
             return
 
-        from_pos = None
-        to_pos = None
-        for i, layer in enumerate(self.layers):
-            if layer.index == from_index:
-                from_pos = i
-            elif layer.index == to_index:
-                to_pos = i
-            if from_pos is not None and to_pos is not None:
-                break
-
-        if from_pos is None or to_pos is None:
+        for layer in layers:
+            layer.name = f"Layer {self.start_index}"
+            self.start_index += 1
+        self.history.execute(AddLayersCommand(self, layers))
+        self.list_view.setCurrentIndex(self.model.index(self.model.row_of(layers[-1])))
+        self.list_view.scrollToTop()
+
+    def add_adjustment(self, kind):
+        """Add an adjustment layer of a core.adjustments kind above the active layer."""
+        index = len(self.document)
+        if self.active_layer is not None and self.active_layer in self.document:
+            index = self.document.index_of(self.active_layer) + 1
+        layer = AdjustmentLayer(kind)
+        self.history.execute(AddLayersCommand(self, [layer], index))
+        self.list_view.setCurrentIndex(self.model.index(self.model.row_of(layer)))
+        return layer
+
+    def edit_adjustment(self, layer, params, previous=None):
+        """Set an adjustment layer's parameters as one undo step.
+
+        previous is the parameters before an edit that was already shown
+        live with set_adjustment_params, such as a slider drag.
+        """
+        self.history.execute(SetAdjustmentCommand(self, layer, params, previous))
+
+    def replace_pixels(self, layer, pixels):
+        """Replace a layer's pixels, e.g. with a filtered copy, as one undo step."""
+        self.history.execute(ReplacePixelsCommand(self, layer, pixels))
+
+    def load_layers(self, layers, thumbnails=None, next_number=None):
+        """Replace the whole stack, e.g. with a project's layers, and reset history.
+
+        thumbnails maps layer ids to stored thumbnail arrays, which are
+        shown as is so that opening a project does not read layer pixels.
+        """
+        for layer in reversed(self.document.layers):
+            self.remove_layer(layer)
+        self.history.clear()
+        self.insert_layers(list(layers))
+        for layer in layers:
+            thumbnail = (thumbnails or {}).get(layer.id)
+            if thumbnail is not None:
+                self.model.set_thumbnail(layer, ImageHandler.array_to_qimage(thumbnail).copy())
+        self.start_index = next_number or len(self.document) + 1
+        self.list_view.scrollToTop()
+
+    def undo(self):
+        """Undo the last layer operation."""
+        self.history.undo()
+
+    def redo(self):
+        """Redo the last undone layer operation."""
+        self.history.redo()
+
+    # Operations below apply a change to the document, the list and the
+    # canvas together. They are called by history commands; user actions
+    # go through self.history so they can be undone.
+
+    def insert_layers(self, layers, index=None):
+        """Insert layers at a stack position, on top by default.
+
+        The model inserts all rows with a single notification, so the view
+        lays out once, and the canvas recomposites once.
+        """
+        if index is None:
+            index = len(self.document)
+        self.model.insert_layers(layers, index)
+        self._update_canvas()
+
+    def remove_layer(self, layer):
+        """Remove a layer."""
+        self.model.remove_row(self.model.row_of(layer))
+        self._update_canvas()
+
+    def move_layer(self, layer, index):
+        """Move a layer to a stack position."""
+        previous_index = self.document.index_of(layer)
+        top = len(self.document) - 1
+        if not self.model.move_row(top - previous_index, top - index):
             return
+        self._update_canvas()
 
-        moving_layer = self.layers.pop(from_pos)
-        self.layer_layout.removeWidget(moving_layer)
-        
-        self.layers.insert(to_pos, moving_layer)
-        self.layer_layout.insertWidget(to_pos, moving_layer)
-        
-        self._update_layer_indices()
+    def set_layer_visible(self, layer, visible):
+        """Show or hide a layer."""
+        layer.visible = visible
+        self.model.layer_changed(layer)
         self._update_canvas()
 
-    def _handle_visibility_changed(self, index, is_visible):
-        """Handle layer visibility toggle."""
+    def set_layer_blend_mode(self, layer, mode):
+        """Set how a layer blends with the layers below it."""
+        layer.blend_mode = mode
+        self.model.layer_changed(layer)
         self._update_canvas()
 
-    def _handle_layer_deleted(self, index):
-        """Handle layer deletion with dynamic renaming."""
-        layer_to_delete = None
-        deleted_layer_number = None
-        
-        # Find the layer to delete and its number
-        for layer in self.layers:
-            if layer.index == index:
-                layer_to_delete = layer
-                deleted_layer_number = int(layer.name_label.text().split()[1])
-                break
-                
-        if layer_to_delete:
-            self.layers.remove(layer_to_delete)
-            self.layer_layout.removeWidget(layer_to_delete)
-            layer_to_delete.deleteLater()
-            
-            # Rename layers with numbers greater than the deleted layer
-            for layer in self.layers:
-                current_number = int(layer.name_label.text().split()[1])
-                if current_number > deleted_layer_number:
-                    layer.name_label.setText(f"Layer {current_number - 1}")
-            
-            self._update_layer_indices()
-            self._update_canvas()
-            self.start_index -= 1  # Decrease the start_index for next layer addition
+    def set_adjustment_params(self, layer, params):
+        """Change an adjustment layer's parameters and repaint what it covers."""
+        layer.set_params(params)
+        self.model.layer_changed(layer)
+        self._update_canvas()
 
+    def set_layer_pixels(self, layer, pixels):
+        """Swap in a new pixel buffer and repaint the layer."""
+        layer.set_pixels(pixels)
+        self.model.layer_changed(layer)
+        self._update_canvas()
+
+    def write_layer_tiles(self, layer, tiles):
+        """Overwrite some full-resolution tiles of a layer and repaint it."""
+        layer.write_tiles(tiles)
+        self.model.layer_changed(layer)
+        self._update_canvas()
+
+    def _handle_layer_moved(self, from_row, to_row):
+        """Handle layer reordering."""
+        if from_row == to_row:
+            return
+        layer = self.model.layer_at(from_row)
+        self.history.execute(MoveLayerCommand(self, layer, len(self.document) - 1 - to_row))
+
+    def _handle_visibility_toggled(self, row):
+        """Handle layer visibility toggle."""
+        layer = self.model.layer_at(row)
+        self.history.execute(SetVisibilityCommand(self, layer, not layer.visible))
+
+    def _handle_blend_mode_selected(self, row, mode):
+        """Handle a blend mode chosen from a layer's context menu."""
+        layer = self.model.layer_at(row)
+        if layer.blend_mode != mode:
+            self.history.execute(SetBlendModeCommand(self, layer, mode))
+
+    def _handle_current_changed(self, current, previous):
+        """Make the layer of the current row the active layer."""
+        self.active_layer = self.model.layer_at(current.row()) if current.isValid() else None
+        canvas = self._canvas()
+        if canvas is not None:
+            canvas.set_active_layer(self.active_layer)
+        self.activeLayerChanged.emit(self.active_layer)
+
+    def _handle_layer_deleted(self, row):
+        """Handle layer deletion.
+
+        Names are stable, so no other row is renamed or repainted. The
+        layer itself is kept by the history for undo.
+        """
+        self.history.execute(RemoveLayerCommand(self, self.model.layer_at(row)))
+
+    def _canvas(self):
+        """Return the main window canvas, if it has been created."""
+        return getattr(self.main_window, 'canvas', None)
+
+    @traced("_update_canvas")
     def _update_canvas(self):
-        """Update the canvas with current layer stack."""
-        if hasattr(self.main_window, 'canvas'):
-            canvas = self.main_window.canvas
-            canvas.clear_scene()
-            
-            for layer in reversed(self.layers):
-                if layer.is_visible and hasattr(layer, 'pixmap'):
-                    canvas.add_image_layer(layer.pixmap)
\ No newline at end of file
+        """Show the document on the canvas and repaint the composite."""
+        canvas = self._canvas()
+        if canvas is None:
+            return
+        if canvas.document is not self.document:
+            canvas.set_document(self.document)
+        canvas.refresh()
@@ -0,0 +1,140 @@
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex
+from PyQt5.QtGui import QPixmap, QColor, QPainter
+
+class LayerListModel(QAbstractListModel):
+    """Qt list model over a core.document.Document.
+
+    Row 0 is the top of the stack, so row r shows document layer
+    len - 1 - r. All structural changes go through this model so that
+    attached views are notified with the matching begin/end calls.
+    """
+
+    LayerRole = Qt.UserRole + 1
+    VisibleRole = Qt.UserRole + 2
+    BlendModeRole = Qt.UserRole + 3
+
+    THUMBNAIL_SIZE = 40
+
+    def __init__(self, document, thumbnailer=None, parent=None):
+        super().__init__(parent)
+        self.document = document
+        self.thumbnailer = thumbnailer
+        self._thumbnails = {}  # Layer id -> (pixel version, QPixmap)
+        self._placeholder = QPixmap(self.THUMBNAIL_SIZE, self.THUMBNAIL_SIZE)
+        self._placeholder.fill(QColor(80, 80, 80))
+        self._adjustment_icon = self._paint_adjustment_icon()
+        if thumbnailer is not None:
+            thumbnailer.thumbnailReady.connect(self._handle_thumbnail_ready)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.document)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        layer = self.layer_at(index.row())
+        if role == Qt.DisplayRole:
+            return layer.name
+        if role == Qt.DecorationRole:
+            return self.thumbnail(layer)
+        if role == self.LayerRole:
+            return layer
+        if role == self.VisibleRole:
+            return layer.visible
+        if role == self.BlendModeRole:
+            return layer.blend_mode
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemIsDropEnabled
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsDragEnabled | Qt.ItemIsDropEnabled
+
+    def layer_at(self, row):
+        """Return the layer shown in a row."""
+        return self.document.layers[len(self.document) - 1 - row]
+
+    def row_of(self, layer):
+        """Return the row showing a layer."""
+        return len(self.document) - 1 - self.document.index_of(layer)
+
+    def insert_layers(self, layers, index=None):
+        """Insert layers at a stack position, on top by default.
+
+        The layers keep their order, the last one ending up highest.
+        """
+        if not layers:
+            return
+        if index is None:
+            index = len(self.document)
+        first_row = len(self.document) - index
+        self.beginInsertRows(QModelIndex(), first_row, first_row + len(layers) - 1)
+        for offset, layer in enumerate(layers):
+            self.document.add_layer(layer, index + offset)
+        self.endInsertRows()
+
+    def remove_row(self, row):
+        """Remove the layer in a row and return it."""
+        layer = self.layer_at(row)
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self.document.remove_layer(layer)
+        self._thumbnails.pop(layer.id, None)
+        self.endRemoveRows()
+        return layer
+
+    def move_row(self, from_row, to_row):
+        """Move the layer in from_row so that it ends up in to_row."""
+        if from_row == to_row:
+            return False
+        # Qt expects the destination as the row to insert before, pre-removal
+        destination = to_row + 1 if to_row > from_row else to_row
+        if not self.beginMoveRows(QModelIndex(), from_row, from_row, QModelIndex(), destination):
+            return False
+        layer = self.layer_at(from_row)
+        self.document.move_layer(layer, len(self.document) - 1 - to_row)
+        self.endMoveRows()
+        return True
+
+    def layer_changed(self, layer):
+        """Notify views that a layer's name, visibility or pixels changed."""
+        index = self.index(self.row_of(layer))
+        self.dataChanged.emit(index, index)
+
+    def thumbnail(self, layer):
+        """Return the layer's thumbnail, queueing a new one if it is stale.
+
+        Only rows that are painted ask for thumbnails, so off-screen layers
+        are never thumbnailed until they are scrolled into view.
+        """
+        if layer.is_adjustment:
+            return self._adjustment_icon
+        version, pixmap = self._thumbnails.get(layer.id, (None, self._placeholder))
+        if version != layer.version and self.thumbnailer is not None:
+            self.thumbnailer.request(layer)
+        return pixmap
+
+    def set_thumbnail(self, layer, image):
+        """Use a QImage as the thumbnail of the layer's current pixels."""
+        pixmap = QPixmap.fromImage(image.scaled(
+            self.THUMBNAIL_SIZE, self.THUMBNAIL_SIZE, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+        self._thumbnails[layer.id] = (layer.version, pixmap)
+        self.layer_changed(layer)
+
+    def _paint_adjustment_icon(self):
+        """Half dark, half light disc shown in place of adjustment layer thumbnails."""
+        pixmap = QPixmap(self._placeholder)
+        size = self.THUMBNAIL_SIZE
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(30, 30, 30))
+        painter.drawPie(size // 4, size // 4, size // 2, size // 2, 90 * 16, 180 * 16)
+        painter.setBrush(QColor(230, 230, 230))
+        painter.drawPie(size // 4, size // 4, size // 2, size // 2, -90 * 16, 180 * 16)
+        painter.end()
+        return pixmap
+
+    def _handle_thumbnail_ready(self, layer, version, image):
+        if version != layer.version or layer not in self.document:
+            return
+        self.set_thumbnail(layer, image)
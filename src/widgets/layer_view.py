@@ -0,0 +1,156 @@
+from PyQt5.QtWidgets import QListView, QAbstractItemView, QApplication, QMenu
+from PyQt5.QtCore import Qt, pyqtSignal, QMimeData
+from PyQt5.QtGui import QPainter, QColor, QDrag
+from core.blending import BLEND_MODES
+from .layer_model import LayerListModel
+
+class LayerListView(QListView):
+    """Virtualized layer list that supports drag-and-drop reordering.
+
+    Only rows inside the viewport are painted, so memory and construction
+    time do not grow with the number of layers. Drags carry the source row
+    as text and a drop emits layerMoved instead of letting the item view
+    remove and re-insert rows itself.
+
+    While a drag is over the list the dragActive property is set, so the
+    panel style sheet can highlight it with a [dragActive="true"] selector.
+    The property flips once per drag, never per hover move.
+
+    Right-clicking a row offers its blend modes (not for adjustment
+    layers); a choice emits blendModeSelected.
+    """
+
+    layerMoved = pyqtSignal(int, int)  # from_row, to_row
+    blendModeSelected = pyqtSignal(int, str)  # row, core.blending mode id
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.drop_row = -1  # Row highlighted as the drop target
+        self.drag_start_position = None
+        self._hover_row = -1
+        self.setProperty("dragActive", False)
+        self.setUniformItemSizes(True)
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        self.setMouseTracking(True)
+        self.setAcceptDrops(True)
+        self.setDropIndicatorShown(False)
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self.drag_start_position = event.pos()
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        self._update_hover(self.indexAt(event.pos()).row())
+        if not (event.buttons() & Qt.LeftButton) or self.drag_start_position is None:
+            return super().mouseMoveEvent(event)
+            
+        if (event.pos() - self.drag_start_position).manhattanLength() < QApplication.startDragDistance():
+            return
+
+        index = self.indexAt(self.drag_start_position)
+        if not index.isValid():
+            return
+        self.drag_start_position = None
+        self._start_drag(index, event.pos())
+
+    def leaveEvent(self, event):
+        self._update_hover(-1)
+        super().leaveEvent(event)
+
+    def dragEnterEvent(self, event):
+        if event.source() is self and event.mimeData().hasText():
+            self._set_drag_active(True)
+            event.acceptProposedAction()
+
+    def dragMoveEvent(self, event):
+        if event.source() is not self or not event.mimeData().hasText():
+            return
+        super().dragMoveEvent(event)  # Auto-scrolls near the edges
+        self._set_drop_row(self._row_at(event.pos()))
+        event.acceptProposedAction()
+
+    def dragLeaveEvent(self, event):
+        self._set_drag_active(False)
+        self._set_drop_row(-1)
+        super().dragLeaveEvent(event)
+
+    def dropEvent(self, event):
+        from_row = int(event.mimeData().text())
+        to_row = self._row_at(event.pos())
+        self._set_drag_active(False)
+        self._set_drop_row(-1)
+        event.acceptProposedAction()
+        if from_row != to_row:
+            self.layerMoved.emit(from_row, to_row)
+
+    def contextMenuEvent(self, event):
+        index = self.indexAt(event.pos())
+        if not index.isValid():
+            return
+        menu = QMenu(self)
+        blend_menu = menu.addMenu("Blend Mode")
+        blend_menu.setEnabled(not index.data(LayerListModel.LayerRole).is_adjustment)
+        current = index.data(LayerListModel.BlendModeRole)
+        for mode, label in BLEND_MODES.items():
+            action = blend_menu.addAction(label)
+            action.setCheckable(True)
+            action.setChecked(mode == current)
+            action.setData(mode)
+        chosen = menu.exec_(event.globalPos())
+        if chosen is not None and chosen.data() is not None:
+            self.blendModeSelected.emit(index.row(), chosen.data())
+
+    def _start_drag(self, index, pos):
+        """Start dragging a row with a semi-transparent preview of it."""
+        rect = self.visualRect(index)
+        pixmap = self.viewport().grab(rect)
+
+        # Make semi-transparent
+        painter = QPainter(pixmap)
+        painter.setCompositionMode(QPainter.CompositionMode_DestinationIn)
+        painter.fillRect(pixmap.rect(), QColor(0, 0, 0, 180))
+        painter.end()
+
+        drag = QDrag(self)
+        mime_data = QMimeData()
+        mime_data.setText(str(index.row()))
+        drag.setMimeData(mime_data)
+        drag.setPixmap(pixmap)
+        drag.setHotSpot(pos - rect.topLeft())
+        drag.exec_(Qt.MoveAction)
+        self._set_drag_active(False)
+        self._set_drop_row(-1)
+
+    def _row_at(self, pos):
+        """Row under a viewport position, the last row when below the list."""
+        row = self.indexAt(pos).row()
+        return row if row >= 0 else self.model().rowCount() - 1
+
+    def _set_drag_active(self, active):
+        """Flip the dragActive property and re-polish only this widget."""
+        if self.property("dragActive") == active:
+            return
+        self.setProperty("dragActive", active)
+        self.style().unpolish(self)
+        self.style().polish(self)
+        self.update()
+
+    def _set_drop_row(self, row):
+        if row != self.drop_row:
+            self._update_row(self.drop_row)
+            self.drop_row = row
+            self._update_row(row)
+
+    def _update_hover(self, row):
+        if row != self._hover_row:
+            self._update_row(self._hover_row)
+            self._hover_row = row
+            self._update_row(row)
+
+    def _update_row(self, row):
+        if row >= 0:
+            self.update(self.model().index(row, 0))
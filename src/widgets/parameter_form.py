@@ -0,0 +1,81 @@
+from PyQt5.QtWidgets import QFrame, QGridLayout, QLabel, QSlider
+from PyQt5.QtCore import Qt, pyqtSignal
+
+class ParameterForm(QFrame):
+    """A labelled slider per core.adjustments.Parameter.
+
+    A drag emits paramsChanged at every step, so views can follow live,
+    and paramsCommitted once on release with the values from before the
+    drag, so the whole drag can be a single undo step. Keyboard and page
+    steps are complete edits and emit paramsCommitted straight away.
+    """
+
+    paramsChanged = pyqtSignal(dict)  # values during a drag
+    paramsCommitted = pyqtSignal(dict, dict)  # values, values before the edit
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.params = {}
+        self._sliders = {}  # Parameter name -> (Parameter, QSlider, value QLabel)
+        self._drag_start = None  # Values when the current drag began
+        self.grid = QGridLayout(self)
+        self.grid.setContentsMargins(0, 0, 0, 0)
+
+    def set_parameters(self, parameters, values):
+        """Show sliders for a sequence of Parameters, set to a dict of values."""
+        self._drag_start = None
+        while self.grid.count():
+            self.grid.takeAt(0).widget().deleteLater()
+        self._sliders = {}
+        for row, parameter in enumerate(parameters):
+            slider = QSlider(Qt.Horizontal)
+            slider.setRange(0, round((parameter.maximum - parameter.minimum) / parameter.step))
+            value_label = QLabel()
+            value_label.setMinimumWidth(36)
+            slider.valueChanged.connect(lambda position, name=parameter.name: self._handle_moved(name))
+            slider.sliderPressed.connect(self._handle_pressed)
+            slider.sliderReleased.connect(self._handle_released)
+            self.grid.addWidget(QLabel(parameter.label), row, 0)
+            self.grid.addWidget(slider, row, 1)
+            self.grid.addWidget(value_label, row, 2)
+            self._sliders[parameter.name] = (parameter, slider, value_label)
+        self.set_values(values)
+
+    def set_values(self, values):
+        """Move the sliders to a dict of values without emitting anything."""
+        self.params = dict(values)
+        for name, (parameter, slider, value_label) in self._sliders.items():
+            slider.blockSignals(True)
+            slider.setValue(round((values[name] - parameter.minimum) / parameter.step))
+            slider.blockSignals(False)
+            value_label.setText(self._format(parameter, values[name]))
+
+    def is_dragging(self):
+        return self._drag_start is not None
+
+    def _value(self, name):
+        parameter, slider, _ = self._sliders[name]
+        value = parameter.minimum + slider.value() * parameter.step
+        return round(value, 6) if parameter.step < 1 else int(round(value))
+
+    @staticmethod
+    def _format(parameter, value):
+        return f"{value:.2f}" if parameter.step < 1 else str(value)
+
+    def _handle_moved(self, name):
+        parameter, _, value_label = self._sliders[name]
+        value = self._value(name)
+        value_label.setText(self._format(parameter, value))
+        previous, self.params = self.params, dict(self.params, **{name: value})
+        if self._drag_start is not None:
+            self.paramsChanged.emit(dict(self.params))
+        else:
+            self.paramsCommitted.emit(dict(self.params), previous)
+
+    def _handle_pressed(self):
+        self._drag_start = dict(self.params)
+
+    def _handle_released(self):
+        previous, self._drag_start = self._drag_start, None
+        if previous is not None and previous != self.params:
+            self.paramsCommitted.emit(dict(self.params), previous)
@@ -0,0 +1,38 @@
+from PyQt5.QtWidgets import QLabel
+from PyQt5.QtCore import Qt, QTimer
+from core.profiler import profiler
+
+class ProfilerOverlay(QLabel):
+    """Live frame time and paint counts drawn in the corner of the canvas.
+
+    The label is opaque and sits on the canvas itself, not its viewport,
+    so refreshing it never repaints (and never adds to the counts of) the
+    viewport underneath. It refreshes on a timer instead of on every frame.
+    """
+
+    def __init__(self, canvas, interval_ms=250):
+        super().__init__(canvas)
+        self.canvas = canvas
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setAutoFillBackground(True)
+        self.setStyleSheet("background-color: #101010; color: #7fff7f;"
+                           "font-family: monospace; font-size: 11px; padding: 4px;")
+        self._last_frames = 0
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(interval_ms)
+        self.refresh()
+
+    def refresh(self):
+        paint = profiler.stats("paint")
+        background = profiler.stats("drawBackground")
+        stats = self.canvas.paint_stats()
+        frames = stats['frames'] - self._last_frames
+        self._last_frames = stats['frames']
+        self.setText(
+            f"frame {paint['last_ms']:6.2f} ms  mean {paint['mean_ms']:6.2f}  max {paint['max_ms']:6.2f}\n"
+            f"frames {stats['frames']} (+{frames})  background {background['last_ms']:5.2f} ms\n"
+            f"painted {stats['last_painted_pixels']} px of {stats['viewport_pixels']}")
+        self.adjustSize()
+        self.move(8, 8)
+        self.raise_()
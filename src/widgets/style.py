@@ -0,0 +1,71 @@
+# Style sheet of the layer panel, parsed once when the panel is created.
+#
+# Per-state styling goes through dynamic property selectors, so a state
+# change only re-polishes the one widget whose property changed instead of
+# rebuilding and re-parsing the style sheet text.
+LAYER_PANEL_STYLESHEET = """
+    LayerManager {
+        background-color: #1e1e1e;
+        border: none;
+    }
+    LayerListView {
+        border: none;
+        background-color: transparent;
+        outline: none;
+    }
+    LayerListView[dragActive="true"] {
+        background-color: #252525;
+    }
+    QScrollBar:vertical {
+        border: none;
+        background: #2d2d2d;
+        width: 10px;
+        margin: 0px;
+    }
+    QScrollBar::handle:vertical {
+        background: #4d4d4d;
+        min-height: 20px;
+        border-radius: 5px;
+    }
+    QScrollBar::handle:vertical:hover {
+        background: #5d5d5d;
+    }
+    QScrollBar::add-line:vertical,
+    QScrollBar::sub-line:vertical {
+        height: 0px;
+    }
+    QScrollBar::add-page:vertical,
+    QScrollBar::sub-page:vertical {
+        background: none;
+    }
+"""
+
+# Style sheet of the controls added to the Adjust and Effects panels,
+# whose labels already take their colour from the panel frames.
+PANEL_CONTROLS_STYLESHEET = """
+    QPushButton {
+        color: rgb(255, 255, 255);
+        text-align: left;
+        padding: 4px 8px;
+    }
+    QListWidget {
+        color: rgb(255, 255, 255);
+        background-color: #252525;
+        border: none;
+        outline: none;
+    }
+    QListWidget::item:selected {
+        background-color: #3a3a3a;
+    }
+    QSlider::groove:horizontal {
+        height: 4px;
+        background: #3a3a3a;
+        border-radius: 2px;
+    }
+    QSlider::handle:horizontal {
+        width: 12px;
+        margin: -4px 0px;
+        background: #c0bfbc;
+        border-radius: 6px;
+    }
+"""